@@ -2,17 +2,16 @@ import os
 from dotenv import load_dotenv
 import logging
 
-# === Logging elegante ===
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 # === Carga del archivo .env (solo si existe, útil en local) ===
 load_dotenv()
-logging.info(".env cargado si existía en entorno local.")
+logger.info(".env cargado si existía en entorno local.")
 
 def get_env_variable(var_name: str, default_value: str = "") -> str:
     value = os.getenv(var_name, default_value)
     if not value and not default_value:
-        logging.warning(f"⚠️ Variable de entorno '{var_name}' no definida. Usando valor por defecto vacío.")
+        logger.warning("⚠️ Variable de entorno '%s' no definida. Usando valor por defecto vacío.", var_name)
     return value
 
 # === Configuraciones extraídas del entorno ===
@@ -40,13 +39,93 @@ SQL_DRIVER_DB2 = get_env_variable("SQL_DRIVER_DB2", "ODBC Driver 17 for SQL Serv
 DB_URI1 = f"mssql+pyodbc://{SQL_USER_DB1}:{SQL_PASSWORD_DB1}@{SQL_SERVER_DB1}/{SQL_DATABASE_DB1}?driver={SQL_DRIVER_DB1}"
 DB_URI2 = f"mssql+pyodbc://{SQL_USER_DB2}:{SQL_PASSWORD_DB2}@{SQL_SERVER_DB2}/{SQL_DATABASE_DB2}?driver={SQL_DRIVER_DB2}"
 
+# Réplica de solo lectura de PR_CAU (opcional): mismas credenciales y base que DB1.
+# ApplicationIntent=ReadOnly hace que un listener de Always On la derive a un secundario legible.
+SQL_SERVER_DB1_REPLICA = get_env_variable("SQL_SERVER_DB1_REPLICA", "")
+DB_URI1_REPLICA = (
+    f"mssql+pyodbc://{SQL_USER_DB1}:{SQL_PASSWORD_DB1}@{SQL_SERVER_DB1_REPLICA}/{SQL_DATABASE_DB1}"
+    f"?driver={SQL_DRIVER_DB1}&ApplicationIntent=ReadOnly"
+) if SQL_SERVER_DB1_REPLICA else ""
+DB1_REPLICA_LAG_MAX_S = float(get_env_variable("DB1_REPLICA_LAG_MAX_S", "30"))
+DB1_REPLICA_LAG_INTERVALO_S = float(get_env_variable("DB1_REPLICA_LAG_INTERVALO_S", "10"))
+DB1_REPLICA_REINTENTO_S = float(get_env_variable("DB1_REPLICA_REINTENTO_S", "60"))
+# Vacío = la consulta por defecto de app/database/replica.py (Always On)
+DB1_REPLICA_LAG_SQL = get_env_variable("DB1_REPLICA_LAG_SQL", "")
+
+# Pool de conexiones de DB1 y DB2
+DB_POOL_SIZE = int(get_env_variable("DB_POOL_SIZE", "10"))
+DB_POOL_MAX_OVERFLOW = int(get_env_variable("DB_POOL_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(get_env_variable("DB_POOL_TIMEOUT", "30"))
+# Menor que el corte por inactividad de firewalls/balanceadores entre la app y SQL Server
+DB_POOL_RECYCLE = int(get_env_variable("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = get_env_variable("DB_POOL_PRE_PING", "true").lower() == "true"
+# Conexiones que se abren por motor al arrancar (0 = ninguna)
+DB_POOL_WARMUP = int(get_env_variable("DB_POOL_WARMUP", "4"))
+
 # Redis
 REDIS_URL = get_env_variable("REDIS_URL", "")
 REDIS_HOST = get_env_variable("REDIS_HOST", "localhost")
 REDIS_PORT = int(get_env_variable("REDIS_PORT", "6379"))
 
+# Conversaciones: lease por usuario para serializar mensajes entre workers
+CONVERSACION_LOCK_TTL_MS = int(get_env_variable("CONVERSACION_LOCK_TTL_MS", "30000"))
+CONVERSACION_LOCK_ESPERA_MS = int(get_env_variable("CONVERSACION_LOCK_ESPERA_MS", "10000"))
+# Vigencia de los datos precargados mientras el usuario confirma su DNI
+CONVERSACION_PREFETCH_TTL = int(get_env_variable("CONVERSACION_PREFETCH_TTL", "120"))
+
 # Telegram
 TELEGRAM_TOKEN = get_env_variable("TELEGRAM_BOT_TOKEN")
+# "webhook" para producción con varios workers; "polling" solo con una instancia.
+TELEGRAM_MODE = get_env_variable("TELEGRAM_MODE", "polling").lower()
+TELEGRAM_WEBHOOK_URL = get_env_variable("TELEGRAM_WEBHOOK_URL", "")
+TELEGRAM_WEBHOOK_SECRET = get_env_variable("TELEGRAM_WEBHOOK_SECRET", "")
+
+# Cola de webhooks (respuesta inmediata y procesamiento en segundo plano)
+COLA_MENSAJES_WORKERS = int(get_env_variable("COLA_MENSAJES_WORKERS", "4"))
+COLA_MENSAJES_MAX = int(get_env_variable("COLA_MENSAJES_MAX", "1000"))
+
+# Imágenes de facturas: cantidad de PNG renderizados que se guardan en memoria
+FACTURA_IMAGEN_CACHE_MAX = int(get_env_variable("FACTURA_IMAGEN_CACHE_MAX", "256"))
+# Día del mes en que cierra el ciclo de facturación; el caché de facturas en Redis vence ese día
+FACTURAS_DIA_CIERRE = min(int(get_env_variable("FACTURAS_DIA_CIERRE", "1")), 28)
+
+# Estadísticas de reclamos para tableros: vigencia del snapshot en Redis y días del histograma diario
+RECLAMOS_STATS_TTL = int(get_env_variable("RECLAMOS_STATS_TTL", "60"))
+RECLAMOS_STATS_DIAS = int(get_env_variable("RECLAMOS_STATS_DIAS", "30"))
+
+# Reclamos casi duplicados (app/services/duplicados_reclamo.py); umbral 0 desactiva la detección
+RECLAMOS_DUPLICADO_UMBRAL = float(get_env_variable("RECLAMOS_DUPLICADO_UMBRAL", "0.6"))
+RECLAMOS_DUPLICADO_DIAS = int(get_env_variable("RECLAMOS_DUPLICADO_DIAS", "7"))
+RECLAMOS_DUPLICADO_SHINGLE = int(get_env_variable("RECLAMOS_DUPLICADO_SHINGLE", "4"))
+
+# Modo corte: reportes de "sin luz" de un mismo barrio agrupados en un incidente
+CORTES_VENTANA_S = int(get_env_variable("CORTES_VENTANA_S", "900"))
+CORTES_UMBRAL = int(get_env_variable("CORTES_UMBRAL", "15"))
+# Sin reportes nuevos durante este tiempo, el incidente deja de absorber reclamos
+CORTES_TTL_S = int(get_env_variable("CORTES_TTL_S", "7200"))
+CORTES_VOLCADO_S = float(get_env_variable("CORTES_VOLCADO_S", "5"))
+CORTES_VOLCADO_LOTE = int(get_env_variable("CORTES_VOLCADO_LOTE", "500"))
+# Volcados fallidos de un mismo reclamo antes de pasarlo a cortes:reclamos:fallidos
+CORTES_VOLCADO_INTENTOS = int(get_env_variable("CORTES_VOLCADO_INTENTOS", "10"))
+
+# DNIs desconocidos: vencimiento del caché negativo, tasa de falsos positivos del
+# filtro de Bloom y antigüedad máxima del filtro para seguir usándolo
+DNI_NEGATIVO_TTL = int(get_env_variable("DNI_NEGATIVO_TTL", "300"))
+DNI_BLOOM_FP = float(get_env_variable("DNI_BLOOM_FP", "0.01"))
+DNI_BLOOM_VIGENCIA_S = int(get_env_variable("DNI_BLOOM_VIGENCIA_S", "172800"))
+
+# Logging (ver app/config/logging_config.py)
+LOG_FORMATO = get_env_variable("LOG_FORMATO", "json").lower()
+LOG_NIVEL = get_env_variable("LOG_NIVEL", "INFO").upper()
+LOG_NIVELES = get_env_variable("LOG_NIVELES", "httpx=WARNING,telegram=WARNING")
+LOG_MUESTREO_DEBUG = float(get_env_variable("LOG_MUESTREO_DEBUG", "0.1"))
+LOG_REDACTAR = get_env_variable("LOG_REDACTAR", "true").lower() == "true"
+
+# Trazas (ver app/utils/tracing.py). TRACING_EXPORTADOR: "" (desactivado), "archivo" u "otlp"
+TRACING_EXPORTADOR = get_env_variable("TRACING_EXPORTADOR", "").lower()
+TRACING_MUESTREO = float(get_env_variable("TRACING_MUESTREO", "0.1"))
+TRACING_ARCHIVO = get_env_variable("TRACING_ARCHIVO", "trazas.jsonl")
+TRACING_OTLP_ENDPOINT = get_env_variable("TRACING_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
 
 # LLaMA
 LLAMA_API_URL = get_env_variable("LLAMA_API_URL", "http://localhost:11434/api/generate")
@@ -67,6 +146,17 @@ WHATSAPP_PHONE_NUMBER_ID = get_env_variable("WHATSAPP_PHONE_NUMBER_ID")
 WHATSAPP_ACCESS_TOKEN = get_env_variable("WHATSAPP_ACCESS_TOKEN")
 WHATSAPP_VERIFY_TOKEN = get_env_variable("WHATSAPP_VERIFY_TOKEN")
 
+# Backends falsos para pruebas de carga (OpenAI, SQL Server y Redis simulados)
+USAR_BACKENDS_FAKE = get_env_variable("USAR_BACKENDS_FAKE", "false").lower() == "true"
+FAKE_SEMILLA = int(get_env_variable("FAKE_SEMILLA", "42"))
+FAKE_CLIENTES = int(get_env_variable("FAKE_CLIENTES", "200"))
+FAKE_FACTURAS_POR_CLIENTE = int(get_env_variable("FAKE_FACTURAS_POR_CLIENTE", "3"))
+FAKE_SQLITE_DIR = get_env_variable("FAKE_SQLITE_DIR", "")
+FAKE_REDIS_BACKEND = get_env_variable("FAKE_REDIS_BACKEND", "memoria").lower()
+FAKE_LLM_DISTRIBUCION = get_env_variable("FAKE_LLM_DISTRIBUCION", "lognormal")
+FAKE_LLM_MEDIANA_MS = float(get_env_variable("FAKE_LLM_MEDIANA_MS", "800"))
+FAKE_LLM_DISPERSION = float(get_env_variable("FAKE_LLM_DISPERSION", "0.35"))
+
 # CORS
 CORS_ALLOWED_ORIGINS = get_env_variable("CORS_ALLOWED_ORIGINS", "").split(",")
 
@@ -79,6 +169,20 @@ class Config:
         "db1": DB_URI1,
         "db2": DB_URI2
     }
+    # Réplicas de solo lectura por bind ("" = sin réplica)
+    SQLALCHEMY_REPLICAS = {
+        "db1": DB_URI1_REPLICA,
+    }
+    DB1_REPLICA_LAG_MAX_S = DB1_REPLICA_LAG_MAX_S
+    DB1_REPLICA_LAG_INTERVALO_S = DB1_REPLICA_LAG_INTERVALO_S
+    DB1_REPLICA_REINTENTO_S = DB1_REPLICA_REINTENTO_S
+    DB1_REPLICA_LAG_SQL = DB1_REPLICA_LAG_SQL
+    DB_POOL_SIZE = DB_POOL_SIZE
+    DB_POOL_MAX_OVERFLOW = DB_POOL_MAX_OVERFLOW
+    DB_POOL_TIMEOUT = DB_POOL_TIMEOUT
+    DB_POOL_RECYCLE = DB_POOL_RECYCLE
+    DB_POOL_PRE_PING = DB_POOL_PRE_PING
+    DB_POOL_WARMUP = DB_POOL_WARMUP
 
     CORS_ALLOWED_ORIGINS = CORS_ALLOWED_ORIGINS
 
@@ -91,11 +195,50 @@ class Config:
     REDIS_HOST = REDIS_HOST
     REDIS_PORT = REDIS_PORT
 
+    CONVERSACION_LOCK_TTL_MS = CONVERSACION_LOCK_TTL_MS
+    CONVERSACION_LOCK_ESPERA_MS = CONVERSACION_LOCK_ESPERA_MS
+    CONVERSACION_PREFETCH_TTL = CONVERSACION_PREFETCH_TTL
+
     JWT_SECRET_KEY = CLAVE_SECRETA
     JWT_ALGORITHM = ALGORITMO_JWT
     ACCESS_TOKEN_EXPIRE_MINUTES = TIEMPO_EXPIRACION_TOKEN
 
     TELEGRAM_TOKEN = TELEGRAM_TOKEN
+    TELEGRAM_MODE = TELEGRAM_MODE
+    TELEGRAM_WEBHOOK_URL = TELEGRAM_WEBHOOK_URL
+    TELEGRAM_WEBHOOK_SECRET = TELEGRAM_WEBHOOK_SECRET
+
+    COLA_MENSAJES_WORKERS = COLA_MENSAJES_WORKERS
+    COLA_MENSAJES_MAX = COLA_MENSAJES_MAX
+
+    FACTURA_IMAGEN_CACHE_MAX = FACTURA_IMAGEN_CACHE_MAX
+    FACTURAS_DIA_CIERRE = FACTURAS_DIA_CIERRE
+
+    RECLAMOS_STATS_TTL = RECLAMOS_STATS_TTL
+    RECLAMOS_STATS_DIAS = RECLAMOS_STATS_DIAS
+    RECLAMOS_DUPLICADO_UMBRAL = RECLAMOS_DUPLICADO_UMBRAL
+    RECLAMOS_DUPLICADO_DIAS = RECLAMOS_DUPLICADO_DIAS
+    RECLAMOS_DUPLICADO_SHINGLE = RECLAMOS_DUPLICADO_SHINGLE
+    CORTES_VENTANA_S = CORTES_VENTANA_S
+    CORTES_UMBRAL = CORTES_UMBRAL
+    CORTES_TTL_S = CORTES_TTL_S
+    CORTES_VOLCADO_S = CORTES_VOLCADO_S
+    CORTES_VOLCADO_LOTE = CORTES_VOLCADO_LOTE
+    CORTES_VOLCADO_INTENTOS = CORTES_VOLCADO_INTENTOS
+    DNI_NEGATIVO_TTL = DNI_NEGATIVO_TTL
+    DNI_BLOOM_FP = DNI_BLOOM_FP
+    DNI_BLOOM_VIGENCIA_S = DNI_BLOOM_VIGENCIA_S
+
+    LOG_FORMATO = LOG_FORMATO
+    LOG_NIVEL = LOG_NIVEL
+    LOG_NIVELES = LOG_NIVELES
+    LOG_MUESTREO_DEBUG = LOG_MUESTREO_DEBUG
+    LOG_REDACTAR = LOG_REDACTAR
+
+    TRACING_EXPORTADOR = TRACING_EXPORTADOR
+    TRACING_MUESTREO = TRACING_MUESTREO
+    TRACING_ARCHIVO = TRACING_ARCHIVO
+    TRACING_OTLP_ENDPOINT = TRACING_OTLP_ENDPOINT
 
     CHATTIGO_USERNAME = CHATTIGO_USERNAME
     CHATTIGO_PASSWORD = CHATTIGO_PASSWORD
@@ -106,6 +249,16 @@ class Config:
     WHATSAPP_ACCESS_TOKEN = WHATSAPP_ACCESS_TOKEN
     WHATSAPP_VERIFY_TOKEN = WHATSAPP_VERIFY_TOKEN
 
+    USAR_BACKENDS_FAKE = USAR_BACKENDS_FAKE
+    FAKE_SEMILLA = FAKE_SEMILLA
+    FAKE_CLIENTES = FAKE_CLIENTES
+    FAKE_FACTURAS_POR_CLIENTE = FAKE_FACTURAS_POR_CLIENTE
+    FAKE_SQLITE_DIR = FAKE_SQLITE_DIR
+    FAKE_REDIS_BACKEND = FAKE_REDIS_BACKEND
+    FAKE_LLM_DISTRIBUCION = FAKE_LLM_DISTRIBUCION
+    FAKE_LLM_MEDIANA_MS = FAKE_LLM_MEDIANA_MS
+    FAKE_LLM_DISPERSION = FAKE_LLM_DISPERSION
+
     @classmethod
     def validate(cls):
         required = [
@@ -115,4 +268,4 @@ class Config:
         for var_name, val in required:
             if not val:
                 raise ValueError(f"❌ Variable de entorno obligatoria faltante: {var_name}")
-        logging.info("✅ Variables esenciales de configuración presentes.")
+        logger.info("✅ Variables esenciales de configuración presentes.")
@@ -0,0 +1,104 @@
+# app/config/logging_config.py
+"""
+Configuración central de logging. Se llama una sola vez desde el punto de entrada
+(main.py o los scripts de bots); los módulos solo hacen `logging.getLogger(__name__)`.
+
+- LOG_FORMATO: "json" (una línea JSON por evento, con trace_id si hay traza activa) o "texto".
+- LOG_NIVEL: nivel raíz. LOG_NIVELES: niveles por módulo, p. ej. "app.adapters=WARNING,httpx=WARNING".
+- LOG_MUESTREO_DEBUG: fracción de eventos DEBUG que se emiten (0.1 = uno de cada diez).
+  Un evento puede fijar su propia tasa con extra={"muestreo": 0.01}.
+- LOG_REDACTAR: enmascara DNI, teléfonos y correos en el mensaje antes de escribirlo.
+"""
+import json
+import logging
+import random
+import re
+import sys
+from datetime import datetime, timezone
+
+from app.config.config import Config
+from app.utils.tracing import trace_id_actual
+
+# Los teléfonos van antes que el DNI: un celular contiene una secuencia de 8 dígitos.
+_PATRONES_PII = (
+    (re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+"), lambda m: "[email]"),
+    (re.compile(r"(?<![\w.])\+?\d{10,13}\b"), lambda m: f"[tel:***{m.group()[-3:]}]"),
+    (re.compile(r"(?<![\w.])\d{1,2}\.?\d{3}\.?\d{3}\b"), lambda m: f"[dni:***{m.group()[-3:]}]"),
+)
+
+# Atributos propios de LogRecord; el resto proviene de `extra` y se incluye en el JSON.
+_ATRIBUTOS_ESTANDAR = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "muestreo"}
+
+
+def redactar(texto: str) -> str:
+    for patron, reemplazo in _PATRONES_PII:
+        texto = patron.sub(reemplazo, texto)
+    return texto
+
+
+class FiltroRedaccion(logging.Filter):
+    """Formatea el mensaje (solo si el evento se va a emitir) y le quita los datos personales."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.msg = redactar(record.getMessage())
+        record.args = None
+        return True
+
+
+class FiltroMuestreo(logging.Filter):
+    def __init__(self, tasa_debug: float):
+        super().__init__()
+        self.tasa_debug = tasa_debug
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        tasa = getattr(record, "muestreo", None)
+        if tasa is None and record.levelno <= logging.DEBUG:
+            tasa = self.tasa_debug
+        return tasa is None or tasa >= 1 or random.random() < tasa
+
+
+class FormatoJSON(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        evento = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "mensaje": record.getMessage(),
+        }
+        trace_id = trace_id_actual()
+        if trace_id:
+            evento["trace_id"] = trace_id
+        for clave, valor in vars(record).items():
+            if clave not in _ATRIBUTOS_ESTANDAR:
+                evento[clave] = valor
+        if record.exc_info:
+            evento["exc"] = self.formatException(record.exc_info)
+        return json.dumps(evento, ensure_ascii=False, default=str)
+
+
+def _niveles_por_modulo(valor: str) -> dict:
+    niveles = {}
+    for par in filter(None, (p.strip() for p in valor.split(","))):
+        modulo, _, nivel = par.partition("=")
+        niveles[modulo.strip()] = nivel.strip().upper()
+    return niveles
+
+
+def configurar_logging():
+    handler = logging.StreamHandler(sys.stdout)
+    handler.addFilter(FiltroMuestreo(Config.LOG_MUESTREO_DEBUG))
+    if Config.LOG_REDACTAR:
+        handler.addFilter(FiltroRedaccion())
+    if Config.LOG_FORMATO == "json":
+        handler.setFormatter(FormatoJSON())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(message)s"))
+
+    raiz = logging.getLogger()
+    for previo in list(raiz.handlers):
+        raiz.removeHandler(previo)
+    raiz.addHandler(handler)
+    raiz.setLevel(Config.LOG_NIVEL)
+
+    for modulo, nivel in _niveles_por_modulo(Config.LOG_NIVELES).items():
+        logging.getLogger(modulo).setLevel(nivel)
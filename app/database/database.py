@@ -1,18 +1,85 @@
 # app/config/database.py
-from sqlalchemy import create_engine
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine, exc, text
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from app.config.config import Config
+from app.database.replica import LAG_SQL_DEFECTO, RuteadorReplica, SesionRuteada
+from app.utils.metrics import DB_POOL_ESPERA, DB_POOL_EVENTOS, instrumentar_engine
 import logging
 
 # Configuración de logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+
+class QueuePoolMedido(QueuePool):
+    """QueuePool que mide la espera de cada checkout y cuenta los que caen en overflow o en timeout."""
+    etiqueta_db = ""
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conexion = super()._do_get()
+        except exc.TimeoutError:
+            DB_POOL_EVENTOS.inc(db=self.etiqueta_db, evento="timeout")
+            raise
+        DB_POOL_ESPERA.observar(time.perf_counter() - inicio, db=self.etiqueta_db)
+        if self.overflow() > 0:
+            DB_POOL_EVENTOS.inc(db=self.etiqueta_db, evento="overflow")
+        return conexion
+
+    def recreate(self):
+        # engine.dispose() crea un pool nuevo: conserva la etiqueta de las métricas
+        pool = super().recreate()
+        pool.etiqueta_db = self.etiqueta_db
+        return pool
+
+
+def _crear_engine(url: str):
+    return create_engine(
+        url,
+        poolclass=QueuePoolMedido,
+        pool_size=Config.DB_POOL_SIZE,
+        max_overflow=Config.DB_POOL_MAX_OVERFLOW,
+        pool_timeout=Config.DB_POOL_TIMEOUT,
+        pool_recycle=Config.DB_POOL_RECYCLE,
+        # Descarta en el checkout las conexiones que SQL Server o la red cerraron durante la inactividad
+        pool_pre_ping=Config.DB_POOL_PRE_PING,
+    )
+
 
 # Crear motores para las bases de datos
-engine_db1 = create_engine(Config.SQLALCHEMY_BINDS["db1"], pool_size=10, max_overflow=20)
-engine_db2 = create_engine(Config.SQLALCHEMY_BINDS["db2"], pool_size=10, max_overflow=20)
+if Config.USAR_BACKENDS_FAKE:
+    # SQLite sembrado con las formas de PR_CAU y DECSA_EXC (pruebas de carga locales)
+    from app.fakes.base_datos import crear_engines_fake
+    engine_db1, engine_db2 = crear_engines_fake()
+else:
+    engine_db1 = _crear_engine(Config.SQLALCHEMY_BINDS["db1"])
+    engine_db2 = _crear_engine(Config.SQLALCHEMY_BINDS["db2"])
+
+# Latencia de sentencias y uso del pool en /metrics
+instrumentar_engine(engine_db1, "db1")
+instrumentar_engine(engine_db2, "db2")
+
+# Réplica de PR_CAU para los métodos @leer_de_replica (app/database/replica.py)
+engine_db1_replica = None
+ruteador_db1 = None
+if Config.SQLALCHEMY_REPLICAS.get("db1") and not Config.USAR_BACKENDS_FAKE:
+    engine_db1_replica = _crear_engine(Config.SQLALCHEMY_REPLICAS["db1"])
+    instrumentar_engine(engine_db1_replica, "db1_replica")
+    ruteador_db1 = RuteadorReplica(
+        "db1", engine_db1, engine_db1_replica,
+        lag_maximo_s=Config.DB1_REPLICA_LAG_MAX_S,
+        reintento_s=Config.DB1_REPLICA_REINTENTO_S,
+        intervalo_lag_s=Config.DB1_REPLICA_LAG_INTERVALO_S,
+        consulta_lag=Config.DB1_REPLICA_LAG_SQL or LAG_SQL_DEFECTO,
+    )
 
 # Crear fábricas de sesiones
-SessionLocal_db1 = sessionmaker(autocommit=False, autoflush=False, bind=engine_db1)
+SessionLocal_db1 = sessionmaker(autocommit=False, autoflush=False, bind=engine_db1,
+                                class_=SesionRuteada, ruteador=ruteador_db1)
 SessionLocal_db2 = sessionmaker(autocommit=False, autoflush=False, bind=engine_db2)
 
 # Dependencias para FastAPI
@@ -30,7 +97,48 @@ def get_db2():
     finally:
         db.close()
 
-# Función para inicializar las bases de datos (opcional, para logging o verificaciones)
+
+def _abrir_conexion(engine):
+    conexion = engine.connect()
+    try:
+        conexion.execute(text("SELECT 1"))
+    except Exception:
+        conexion.close()
+        raise
+    return conexion
+
+
+def calentar_pool(engine, nombre: str, cantidad: int) -> int:
+    """
+    Abre `cantidad` conexiones a la vez (el connect de pyodbc es lo caro) y las devuelve
+    al pool, para que los primeros requests no paguen esa latencia. Devuelve cuántas abrió.
+    """
+    cantidad = min(cantidad, Config.DB_POOL_SIZE)
+    if cantidad <= 0:
+        return 0
+    inicio = time.perf_counter()
+    conexiones = []
+    with ThreadPoolExecutor(max_workers=cantidad, thread_name_prefix=f"warmup-{nombre}") as ejecutor:
+        futuros = [ejecutor.submit(_abrir_conexion, engine) for _ in range(cantidad)]
+        for futuro in futuros:
+            try:
+                conexiones.append(futuro.result())
+            except Exception as e:
+                logger.warning("⚠️ No se pudo abrir una conexión de warmup en %s: %s", nombre, e)
+    for conexion in conexiones:
+        conexion.close()
+    logger.info("Pool %s: %s/%s conexiones abiertas en %.2fs",
+                nombre, len(conexiones), cantidad, time.perf_counter() - inicio)
+    return len(conexiones)
+
+
 def init_db():
-    logging.info("Bases de datos inicializadas con FastAPI")
-    # Aquí podrías agregar verificaciones de conexión si lo deseas
\ No newline at end of file
+    """Calienta los pools de DB1 y DB2. Una base caída no impide arrancar: se avisa y se sigue."""
+    if Config.USAR_BACKENDS_FAKE:
+        logger.info("Bases de datos inicializadas con FastAPI (SQLite fake, sin warmup)")
+        return
+    calentar_pool(engine_db1, "db1", Config.DB_POOL_WARMUP)
+    calentar_pool(engine_db2, "db2", Config.DB_POOL_WARMUP)
+    if engine_db1_replica is not None:
+        calentar_pool(engine_db1_replica, "db1_replica", Config.DB_POOL_WARMUP)
+    logger.info("Bases de datos inicializadas con FastAPI")
@@ -0,0 +1,172 @@
+# app/database/replica.py
+"""
+Lecturas de una base contra su réplica de solo lectura, con vuelta al primario.
+
+Los métodos de repositorio marcados con `@leer_de_replica` ejecutan sus sentencias
+en la réplica mientras esté sana y con un retraso tolerable; todo lo demás va al
+primario. El retraso se mide cada DB1_REPLICA_LAG_INTERVALO_S segundos con
+DB1_REPLICA_LAG_SQL (por defecto, la antigüedad del último commit aplicado en un
+secundario legible de Always On). Si la réplica falla, queda descartada
+DB1_REPLICA_REINTENTO_S segundos y la llamada en curso se repite en el primario.
+
+Con la consulta por defecto, un primario sin escrituras por un rato también se ve
+como "retraso": en ese caso las lecturas van al primario, que está ocioso.
+"""
+import functools
+import inspect
+import logging
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import event, exc, text
+from sqlalchemy.orm import Session
+
+from app.utils.metrics import DB_REPLICA_LECTURAS
+
+logger = logging.getLogger(__name__)
+
+LAG_SQL_DEFECTO = (
+    "SELECT DATEDIFF(SECOND, MAX(last_commit_time), GETDATE()) "
+    "FROM sys.dm_hadr_database_replica_states WHERE is_local = 1 AND database_id = DB_ID()"
+)
+
+
+class RuteadorReplica:
+    """Elige entre la réplica y el primario de una base."""
+
+    def __init__(self, nombre: str, primario, replica, lag_maximo_s: float = 30, reintento_s: float = 60,
+                 intervalo_lag_s: float = 10, consulta_lag: str = LAG_SQL_DEFECTO):
+        self.nombre = nombre
+        self.primario = primario
+        self.replica = replica
+        self.lag_maximo_s = lag_maximo_s
+        self.reintento_s = reintento_s
+        self.intervalo_lag_s = intervalo_lag_s
+        self.consulta_lag = consulta_lag
+        self._caida_hasta = 0.0
+        self._lag: Optional[float] = None
+        self._lag_medido = None
+        self._lock = threading.Lock()
+        event.listen(replica, "handle_error", self._al_fallar)
+
+    def engine_lectura(self):
+        ahora = time.monotonic()
+        if ahora < self._caida_hasta:
+            DB_REPLICA_LECTURAS.inc(db=self.nombre, destino="primario", motivo="caida")
+            return self.primario
+        lag = self._lag_actual(ahora)
+        if lag is None:
+            DB_REPLICA_LECTURAS.inc(db=self.nombre, destino="primario", motivo="caida")
+            return self.primario
+        if lag > self.lag_maximo_s:
+            DB_REPLICA_LECTURAS.inc(db=self.nombre, destino="primario", motivo="retraso")
+            return self.primario
+        DB_REPLICA_LECTURAS.inc(db=self.nombre, destino="replica", motivo="sana")
+        return self.replica
+
+    def marcar_caida(self, error):
+        if time.monotonic() >= self._caida_hasta:
+            logger.warning("⚠️ Réplica de %s descartada por %ss: %s", self.nombre, self.reintento_s, error)
+        self._caida_hasta = time.monotonic() + self.reintento_s
+        self._lag_medido = None
+
+    def _al_fallar(self, contexto):
+        # Errores de conexión o de la sesión con la réplica; los de sintaxis o datos no la descartan
+        if contexto.is_disconnect or isinstance(contexto.original_exception, exc.OperationalError) \
+                or isinstance(contexto.sqlalchemy_exception, exc.OperationalError):
+            self.marcar_caida(contexto.original_exception)
+
+    def _lag_actual(self, ahora: float) -> Optional[float]:
+        """Último retraso medido; lo vuelve a medir si venció el intervalo (un solo hilo a la vez)."""
+        if self._lag_medido is not None and ahora - self._lag_medido < self.intervalo_lag_s:
+            return self._lag
+        if not self._lock.acquire(blocking=False):
+            # Otro hilo está midiendo: se usa el valor anterior (o el primario si nunca se midió)
+            return self._lag if self._lag_medido is not None else None
+        try:
+            with self.replica.connect() as conexion:
+                lag = conexion.execute(text(self.consulta_lag)).scalar()
+            # Sin dato (no es un secundario de Always On): se toma como al día
+            self._lag = float(lag or 0)
+            self._lag_medido = time.monotonic()
+            if self._lag > self.lag_maximo_s:
+                logger.warning("⚠️ Réplica de %s con %ss de retraso: lecturas al primario", self.nombre, self._lag)
+            return self._lag
+        except Exception as e:
+            self.marcar_caida(e)
+            return None
+        finally:
+            self._lock.release()
+
+
+class SesionRuteada(Session):
+    """
+    Sesión que manda a la réplica las sentencias de los métodos `@leer_de_replica`.
+    Sin ruteador (réplica no configurada) se comporta como una Session común.
+    """
+
+    def __init__(self, *args, ruteador: RuteadorReplica = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ruteador = ruteador
+        self.leyendo_de_replica = 0
+        self.ultimo_bind = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.ruteador is None or not self.leyendo_de_replica:
+            return super().get_bind(mapper, clause, **kwargs)
+        self.ultimo_bind = self.ruteador.engine_lectura()
+        return self.ultimo_bind
+
+
+def leer_de_replica(funcion):
+    """
+    Decorador de método de repositorio de solo lectura sobre `self.session_db1`.
+    Si la réplica falla durante la llamada, se repite una vez en el primario. En
+    los generadores (lecturas masivas de los jobs) no hay reintento: las filas ya
+    entregadas no se pueden deshacer, y el job se reanuda desde su checkpoint.
+    """
+    if inspect.isgeneratorfunction(funcion):
+        @functools.wraps(funcion)
+        def envoltura_generador(self, *args, **kwargs):
+            sesion = self.session_db1
+            generador = funcion(self, *args, **kwargs)
+            while True:
+                _entrar(sesion)
+                try:
+                    elemento = next(generador)
+                except StopIteration:
+                    return
+                finally:
+                    _salir(sesion)
+                yield elemento
+        return envoltura_generador
+
+    @functools.wraps(funcion)
+    def envoltura(self, *args, **kwargs):
+        sesion = self.session_db1
+        _entrar(sesion)
+        try:
+            return funcion(self, *args, **kwargs)
+        except exc.DBAPIError as e:
+            ruteador = getattr(sesion, "ruteador", None)
+            if ruteador is None or sesion.ultimo_bind is not ruteador.replica:
+                raise
+            # Con la réplica descartada, el reintento ya resuelve al primario
+            ruteador.marcar_caida(e)
+            sesion.rollback()
+            logger.info("Reintentando %s en el primario de %s", funcion.__qualname__, ruteador.nombre)
+            return funcion(self, *args, **kwargs)
+        finally:
+            _salir(sesion)
+    return envoltura
+
+
+def _entrar(sesion):
+    if isinstance(sesion, SesionRuteada):
+        sesion.leyendo_de_replica += 1
+
+
+def _salir(sesion):
+    if isinstance(sesion, SesionRuteada):
+        sesion.leyendo_de_replica -= 1
@@ -0,0 +1,11 @@
+# app/fakes/__init__.py
+# Backends falsos para pruebas de carga sin OpenAI, SQL Server ni Redis.
+# Se activan con USAR_BACKENDS_FAKE=true (ver app/config/config.py).
+from app.fakes.llm import (
+    LatenciaSimulada,
+    FakeChatGPTService,
+    FakeChatGPTValidarReclamoService,
+    FakeChatGPTFrontendService,
+)
+from app.fakes.redis_fake import RedisEnMemoria, crear_redis_fake
+from app.fakes.base_datos import crear_engines_fake, dni_sembrado
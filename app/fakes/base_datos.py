@@ -0,0 +1,149 @@
+# app/fakes/base_datos.py
+import logging
+import os
+import random
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+
+from app.config.config import Config
+from app.models.entities import Base, Cliente, Reclamo
+
+logger = logging.getLogger(__name__)
+
+# Esquema mínimo de PR_CAU: solo las tablas y columnas que consulta SQLAlchemyUsuarioRepository.
+# Las fechas se declaran TIMESTAMP para que sqlite3 las devuelva como datetime, igual que pyodbc.
+_ESQUEMA_PR_CAU = (
+    """CREATE TABLE PERSONAS (
+        COD_PER INTEGER PRIMARY KEY, APELLIDOS VARCHAR(60), NOMBRES VARCHAR(60), NUM_DNI VARCHAR(20),
+        SEXO CHAR(1), TELEFONO VARCHAR(30), EMAIL VARCHAR(100), COD_POS VARCHAR(10),
+        FEC_ALTA TIMESTAMP, OBSERVAC VARCHAR(200))""",
+    "CREATE TABLE BARRIOS (COD_BAR INTEGER PRIMARY KEY, DES_BAR VARCHAR(100))",
+    "CREATE TABLE CALLES (COD_CAL INTEGER PRIMARY KEY, DES_CAL VARCHAR(100))",
+    "CREATE TABLE SUMSOC (COD_SUM VARCHAR(20) PRIMARY KEY, OBS_POS VARCHAR(100), COD_BAR INTEGER, COD_CAL INTEGER)",
+    "CREATE TABLE SERSOC (COD_SUM VARCHAR(20), NUM_MED VARCHAR(30))",
+    """CREATE TABLE FACTURAS (
+        ID_FAC INTEGER PRIMARY KEY, COD_PER INTEGER, COD_SUM VARCHAR(20), NUM_COM VARCHAR(30),
+        FECHA TIMESTAMP, PAGA CHAR(1), TOTAL1 NUMERIC(12, 2), VTO1 TIMESTAMP)""",
+    "CREATE TABLE CONS_SER (ID_FAC INTEGER, PERIODO VARCHAR(10), CONSUMO NUMERIC(10, 2))",
+    "CREATE INDEX IX_PERSONAS_DNI ON PERSONAS (NUM_DNI)",
+    "CREATE INDEX IX_FACTURAS_PER ON FACTURAS (COD_PER)",
+)
+
+_APELLIDOS = ("GOMEZ", "PEREZ", "RODRIGUEZ", "FERNANDEZ", "LOPEZ", "DIAZ", "MARTINEZ", "SANCHEZ", "ROMERO", "SOSA")
+_NOMBRES = ("JUAN", "MARIA", "CARLOS", "ANA", "JORGE", "LUCIA", "PEDRO", "SOFIA", "MIGUEL", "LAURA")
+_BARRIOS = ("CENTRO", "VILLA INDEPENDENCIA", "BARRIO ESTE", "LAS CHACRAS", "EL BAJO")
+_CALLES = ("SARMIENTO", "BELGRANO", "SAN MARTIN", "LAPRIDA", "MITRE", "RIVADAVIA")
+_DESCRIPCIONES = (
+    "Se cortó la luz en todo el barrio",
+    "Baja tensión desde anoche",
+    "Se quemó la heladera por un pico de tensión",
+    "Poste con cables caídos en la esquina",
+    "Me llegó la factura con un consumo muy alto",
+)
+
+DNI_BASE = 20000000
+
+
+def dni_sembrado(indice: int) -> str:
+    """DNI del cliente número `indice` de los datos sembrados (8 dígitos, válido para todos los bots)."""
+    return str(DNI_BASE + indice)
+
+
+def _ruta_sqlite(nombre: str) -> str:
+    directorio = Config.FAKE_SQLITE_DIR or tempfile.gettempdir()
+    ruta = os.path.join(directorio, f"decsa_fake_{nombre}_{os.getpid()}.sqlite")
+    if os.path.exists(ruta):
+        os.remove(ruta)
+    return ruta
+
+
+def _sembrar_pr_cau(conexion, rnd: random.Random, clientes: int):
+    conexion.execute(text("INSERT INTO BARRIOS VALUES (:cod, :des)"),
+                     [{"cod": i + 1, "des": b} for i, b in enumerate(_BARRIOS)])
+    conexion.execute(text("INSERT INTO CALLES VALUES (:cod, :des)"),
+                     [{"cod": i + 1, "des": c} for i, c in enumerate(_CALLES)])
+
+    personas, suministros, medidores, facturas, consumos = [], [], [], [], []
+    hoy = datetime(2025, 1, 1)
+    id_fac = 0
+    for i in range(clientes):
+        cod_per = i + 1
+        cod_sum = f"S{cod_per:06d}"
+        personas.append({
+            "cod": cod_per, "ape": rnd.choice(_APELLIDOS), "nom": rnd.choice(_NOMBRES), "dni": dni_sembrado(i),
+            "sexo": rnd.choice("MF"), "tel": f"264{rnd.randint(4000000, 4999999)}",
+            "email": f"cliente{cod_per}@example.com", "cp": "5442",
+            "alta": hoy - timedelta(days=rnd.randint(30, 3000)), "obs": None,
+        })
+        suministros.append({"cod": cod_sum, "obs": "", "bar": rnd.randint(1, len(_BARRIOS)), "cal": rnd.randint(1, len(_CALLES))})
+        medidores.append({"cod": cod_sum, "med": f"M{rnd.randint(100000, 999999)}"})
+        for mes in range(Config.FAKE_FACTURAS_POR_CLIENTE):
+            id_fac += 1
+            emision = hoy - timedelta(days=30 * mes)
+            facturas.append({
+                "id": id_fac, "per": cod_per, "sum": cod_sum, "com": f"B-0001-{id_fac:08d}", "fecha": emision,
+                "paga": "P" if mes else rnd.choice("PN"), "total": round(rnd.uniform(5000, 60000), 2),
+                "vto": emision + timedelta(days=15),
+            })
+            consumos.append({"id": id_fac, "per": emision.strftime("%Y%m"), "cons": rnd.randint(80, 900)})
+
+    conexion.execute(text(
+        "INSERT INTO PERSONAS VALUES (:cod, :ape, :nom, :dni, :sexo, :tel, :email, :cp, :alta, :obs)"), personas)
+    conexion.execute(text("INSERT INTO SUMSOC VALUES (:cod, :obs, :bar, :cal)"), suministros)
+    conexion.execute(text("INSERT INTO SERSOC VALUES (:cod, :med)"), medidores)
+    if facturas:
+        conexion.execute(text(
+            "INSERT INTO FACTURAS VALUES (:id, :per, :sum, :com, :fecha, :paga, :total, :vto)"), facturas)
+        conexion.execute(text("INSERT INTO CONS_SER VALUES (:id, :per, :cons)"), consumos)
+
+
+def _sembrar_decsa_exc(engine, rnd: random.Random, clientes: int):
+    # Solo la mitad de los clientes ya fue copiada a DECSA_EXC; el resto se copia al reclamar.
+    from sqlalchemy.orm import Session
+    with Session(engine) as session:
+        for i in range(0, clientes, 2):
+            cliente = Cliente(
+                DNI=dni_sembrado(i), NOMBRE_COMPLETO=f"{rnd.choice(_APELLIDOS)} {rnd.choice(_NOMBRES)}",
+                SEXO=rnd.choice("MF"), CELULAR=f"264{rnd.randint(4000000, 4999999)}",
+                EMAIL=f"cliente{i + 1}@example.com", CODIGO_POSTAL="5442", FECHA_ALTA=datetime(2024, 1, 1),
+                CODIGO_SUMINISTRO=f"S{i + 1:06d}", NUMERO_MEDIDOR=f"M{rnd.randint(100000, 999999)}",
+                CALLE=rnd.choice(_CALLES), BARRIO=rnd.choice(_BARRIOS),
+            )
+            for _ in range(rnd.randint(0, 3)):
+                cliente.reclamos.append(Reclamo(
+                    DESCRIPCION=rnd.choice(_DESCRIPCIONES),
+                    ESTADO=rnd.choice(("Pendiente", "En proceso", "Resuelto")),
+                    FECHA_RECLAMO=datetime(2024, 12, 1) + timedelta(hours=rnd.randint(0, 700)),
+                ))
+            session.add(cliente)
+        session.commit()
+
+
+def crear_engines_fake(clientes: int = None, semilla: int = None):
+    """
+    Crea motores SQLite para DB1 (PR_CAU) y DB2 (DECSA_EXC) con datos deterministas.
+    Devuelve (engine_db1, engine_db2).
+    """
+    clientes = clientes if clientes is not None else Config.FAKE_CLIENTES
+    semilla = semilla if semilla is not None else Config.FAKE_SEMILLA
+    rnd = random.Random(semilla)
+
+    engine_db1 = create_engine(
+        f"sqlite:///{_ruta_sqlite('pr_cau')}",
+        connect_args={"check_same_thread": False, "detect_types": sqlite3.PARSE_DECLTYPES},
+    )
+    engine_db2 = create_engine(f"sqlite:///{_ruta_sqlite('decsa_exc')}", connect_args={"check_same_thread": False})
+
+    with engine_db1.begin() as conexion:
+        for sentencia in _ESQUEMA_PR_CAU:
+            conexion.execute(text(sentencia))
+        _sembrar_pr_cau(conexion, rnd, clientes)
+
+    Base.metadata.create_all(engine_db2)
+    _sembrar_decsa_exc(engine_db2, rnd, clientes)
+
+    logger.info("✅ Bases fake creadas: %s clientes sembrados (semilla %s).", clientes, semilla)
+    return engine_db1, engine_db2
@@ -0,0 +1,132 @@
+# app/fakes/llm.py
+import json
+import logging
+import math
+import random
+import threading
+import time
+
+from app.config.config import Config
+from app.utils.metrics import medir_openai
+
+logger = logging.getLogger(__name__)
+
+
+class LatenciaSimulada:
+    """
+    Demora reproducible para imitar la latencia de la API de OpenAI.
+
+    distribucion: "cero", "fija", "normal" o "lognormal". La mediana y la dispersión
+    se expresan en milisegundos; con la misma semilla se obtiene la misma secuencia.
+    """
+
+    def __init__(self, distribucion: str = None, mediana_ms: float = None, dispersion: float = None, semilla: int = None):
+        self.distribucion = (distribucion or Config.FAKE_LLM_DISTRIBUCION).lower()
+        self.mediana_ms = mediana_ms if mediana_ms is not None else Config.FAKE_LLM_MEDIANA_MS
+        self.dispersion = dispersion if dispersion is not None else Config.FAKE_LLM_DISPERSION
+        self._random = random.Random(semilla if semilla is not None else Config.FAKE_SEMILLA)
+        self._lock = threading.Lock()
+
+    def muestra(self) -> float:
+        """Devuelve una demora en segundos."""
+        with self._lock:
+            if self.distribucion == "cero":
+                ms = 0.0
+            elif self.distribucion == "fija":
+                ms = self.mediana_ms
+            elif self.distribucion == "normal":
+                ms = self._random.gauss(self.mediana_ms, self.dispersion)
+            elif self.distribucion == "lognormal":
+                # dispersion es el sigma del logaritmo; la mediana de la lognormal es exp(mu).
+                ms = self._random.lognormvariate(math.log(max(self.mediana_ms, 1e-3)), self.dispersion)
+            else:
+                raise ValueError(f"Distribución de latencia desconocida: {self.distribucion}")
+        return max(ms, 0.0) / 1000
+
+    def esperar(self):
+        demora = self.muestra()
+        if demora:
+            time.sleep(demora)
+
+
+# Reglas simples, en el mismo orden de prioridad que usaría el modelo.
+_REGLAS_INTENCION = (
+    ("ConsultarFacturas", ("factura", "boleta", "pagar", "vencimiento")),
+    ("Actualizar", ("actualizar", "cambiar mi", "modificar")),
+    ("Consultar", ("estado", "consultar", "seguimiento")),
+    ("Reclamo", ("reclamo", "reclamar", "sin luz", "corte", "apagón", "apagon")),
+)
+_RESPUESTAS_INTENCION = {
+    "Reclamo": "¡Hola! Soy DECSA. Lamento el inconveniente. Para registrar tu reclamo, indícame tu DNI.",
+    "Actualizar": "¡Claro! ¿Qué dato quieres actualizar: calle, barrio, celular o correo?",
+    "Consultar": "Para consultar el estado de tus reclamos, indícame tu DNI.",
+    "ConsultarFacturas": "Para consultar tu factura, indícame tu DNI.",
+    "Conversar": "¡Hola! Soy DECSA. Puedo ayudarte con reclamos, actualizar datos, consultas o facturas.",
+}
+_PALABRAS_RECLAMO_VALIDO = (
+    "luz", "corte", "apagón", "apagon", "tensión", "tension", "energía", "energia",
+    "factura", "medidor", "cable", "poste", "quem", "suministro",
+)
+
+
+class _FakeBase:
+    def __init__(self, redis_client=None, latencia: LatenciaSimulada = None):
+        # redis_client se acepta por compatibilidad de firma; el stub no usa caché.
+        self.redis_client = redis_client
+        self.latencia = latencia or LatenciaSimulada()
+        self.llamadas = 0
+
+    def _llamar(self):
+        self.llamadas += 1
+        # Se mide como una llamada a OpenAI para que /metrics refleje la latencia simulada
+        with medir_openai(type(self).__name__):
+            self.latencia.esperar()
+
+
+class FakeChatGPTService(_FakeBase):
+    """Reemplazo determinista de ChatGPTService (detección de intención)."""
+
+    def generar_respuesta(self, prompt, historial=""):
+        self._llamar()
+        texto = prompt.lower()
+        intencion = "Conversar"
+        for nombre, palabras in _REGLAS_INTENCION:
+            if any(p in texto for p in palabras):
+                intencion = nombre
+                break
+        return json.dumps({"intencion": intencion, "respuesta": _RESPUESTAS_INTENCION[intencion]}, ensure_ascii=False)
+
+    def detectar_intencion(self, mensaje, historial=""):
+        return self.generar_respuesta(mensaje, historial)
+
+
+class FakeChatGPTValidarReclamoService(_FakeBase):
+    """Reemplazo determinista de ChatGPTValidarReclamoService."""
+
+    def validar_reclamo(self, descripcion, historial=""):
+        self._llamar()
+        texto = descripcion.lower()
+        if texto.startswith("qué pasa si") or texto.startswith("que pasa si"):
+            es_valido = False
+        else:
+            es_valido = any(p in texto for p in _PALABRAS_RECLAMO_VALIDO)
+        mensaje = "Reclamo válido." if es_valido else "Eso no parece un problema del servicio eléctrico."
+        return json.dumps({"es_valido": es_valido, "mensaje": mensaje}, ensure_ascii=False)
+
+
+class FakeChatGPTFrontendService(_FakeBase):
+    """Reemplazo determinista de ChatGPTFrontendService."""
+
+    def generar_respuesta(self, prompt, historial=""):
+        self._llamar()
+        texto = prompt.lower()
+        if "horario" in texto:
+            respuesta = "Nuestros horarios de atención son de lunes a viernes de 7:00 a 14:00."
+        elif "teléfono" in texto or "telefono" in texto:
+            respuesta = "Nuestros teléfonos de atención las 24 hs son: 425-5832 y 0800-666-8456."
+        else:
+            respuesta = "¿Podés especificar mejor tu consulta? Puedo ayudarte con ubicación, teléfonos, horarios, reclamos o facturas."
+        return {"respuesta": respuesta}
+
+    def responder(self, mensaje, historial=""):
+        return self.generar_respuesta(mensaje, historial)
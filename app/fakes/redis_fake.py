@@ -0,0 +1,324 @@
+# app/fakes/redis_fake.py
+import fnmatch
+import logging
+import threading
+import time
+
+from app.config.config import Config
+from app.services.conversacion_lock import LIBERAR_LEASE_LUA, RENOVAR_LEASE_LUA
+
+logger = logging.getLogger(__name__)
+
+
+class RedisEnMemoria:
+    """
+    Subconjunto de la API de redis-py (decode_responses=True) guardado en memoria.
+
+    Cubre los comandos que usa la aplicación; sirve para pruebas de carga sin servidor.
+    Los vencimientos se evalúan de forma perezosa al acceder a cada clave.
+    """
+
+    def __init__(self):
+        self._datos = {}
+        self._vencimientos = {}
+        self._lock = threading.RLock()
+        self.comandos = 0
+
+    # === Infraestructura ===
+
+    def _vigente(self, clave):
+        vence = self._vencimientos.get(clave)
+        if vence is not None and vence <= time.monotonic():
+            self._datos.pop(clave, None)
+            self._vencimientos.pop(clave, None)
+        return self._datos.get(clave)
+
+    def _contar(self):
+        self.comandos += 1
+
+    def ping(self):
+        return True
+
+    def flushdb(self):
+        with self._lock:
+            self._datos.clear()
+            self._vencimientos.clear()
+        return True
+
+    def pipeline(self, transaction=True):
+        return _PipelineEnMemoria(self)
+
+    def register_script(self, script):
+        funcion = _SCRIPTS_CONOCIDOS.get(script)
+        if funcion is None:
+            raise NotImplementedError("RedisEnMemoria solo ejecuta los scripts Lua registrados en _SCRIPTS_CONOCIDOS")
+        return lambda keys=(), args=(), client=None: funcion(self, list(keys), list(args))
+
+    # === Claves ===
+
+    def delete(self, *claves):
+        with self._lock:
+            self._contar()
+            borradas = 0
+            for clave in claves:
+                if self._vigente(clave) is not None:
+                    borradas += 1
+                self._datos.pop(clave, None)
+                self._vencimientos.pop(clave, None)
+            return borradas
+
+    def exists(self, *claves):
+        with self._lock:
+            self._contar()
+            return sum(1 for clave in claves if self._vigente(clave) is not None)
+
+    def expire(self, clave, segundos):
+        with self._lock:
+            self._contar()
+            if self._vigente(clave) is None:
+                return False
+            self._vencimientos[clave] = time.monotonic() + segundos
+            return True
+
+    def keys(self, patron="*"):
+        with self._lock:
+            self._contar()
+            return [c for c in list(self._datos) if self._vigente(c) is not None and fnmatch.fnmatchcase(c, patron)]
+
+    # === Strings ===
+
+    def get(self, clave):
+        with self._lock:
+            self._contar()
+            return self._vigente(clave)
+
+    def set(self, clave, valor, ex=None, px=None, nx=False):
+        with self._lock:
+            self._contar()
+            if nx and self._vigente(clave) is not None:
+                return None
+            self._datos[clave] = bytearray(valor) if isinstance(valor, (bytes, bytearray)) else str(valor)
+            self._vencimientos.pop(clave, None)
+            if ex is not None:
+                self._vencimientos[clave] = time.monotonic() + ex
+            elif px is not None:
+                self._vencimientos[clave] = time.monotonic() + px / 1000
+            return True
+
+    def setex(self, clave, segundos, valor):
+        return self.set(clave, valor, ex=segundos)
+
+    def incr(self, clave, cantidad=1):
+        with self._lock:
+            self._contar()
+            valor = int(self._vigente(clave) or 0) + cantidad
+            self._datos[clave] = str(valor)
+            return valor
+
+    def setbit(self, clave, posicion, valor):
+        with self._lock:
+            self._contar()
+            datos = self._vigente(clave)
+            if not isinstance(datos, bytearray):
+                datos = self._datos[clave] = bytearray((datos or "").encode())
+            if len(datos) <= posicion >> 3:
+                datos.extend(bytes((posicion >> 3) + 1 - len(datos)))
+            mascara = 0x80 >> (posicion & 7)
+            anterior = 1 if datos[posicion >> 3] & mascara else 0
+            if valor:
+                datos[posicion >> 3] |= mascara
+            else:
+                datos[posicion >> 3] &= ~mascara & 0xFF
+            return anterior
+
+    def getbit(self, clave, posicion):
+        with self._lock:
+            self._contar()
+            datos = self._vigente(clave)
+            if datos is None:
+                return 0
+            if not isinstance(datos, bytearray):
+                datos = datos.encode()
+            if len(datos) <= posicion >> 3:
+                return 0
+            return 1 if datos[posicion >> 3] & (0x80 >> (posicion & 7)) else 0
+
+    # === Listas ===
+
+    def rpush(self, clave, *valores):
+        with self._lock:
+            self._contar()
+            lista = self._vigente(clave)
+            if lista is None:
+                lista = self._datos[clave] = []
+            lista.extend(str(v) for v in valores)
+            return len(lista)
+
+    def lrange(self, clave, inicio, fin):
+        with self._lock:
+            self._contar()
+            lista = self._vigente(clave) or []
+            return lista[inicio:None if fin == -1 else fin + 1]
+
+    def ltrim(self, clave, inicio, fin):
+        with self._lock:
+            self._contar()
+            lista = self._vigente(clave)
+            if lista is not None:
+                self._datos[clave] = lista[inicio:None if fin == -1 else fin + 1]
+            return True
+
+    def lmove(self, origen, destino, desde="LEFT", hacia="RIGHT"):
+        with self._lock:
+            self._contar()
+            lista = self._vigente(origen)
+            if not lista:
+                return None
+            valor = lista.pop(0 if desde == "LEFT" else -1)
+            otra = self._vigente(destino)
+            if otra is None:
+                otra = self._datos[destino] = []
+            otra.insert(0 if hacia == "LEFT" else len(otra), valor)
+            return valor
+
+    def lrem(self, clave, cantidad, valor):
+        with self._lock:
+            self._contar()
+            lista = self._vigente(clave) or []
+            indices = [i for i, v in enumerate(lista) if v == str(valor)]
+            if cantidad < 0:
+                indices = indices[::-1]
+            if cantidad:
+                indices = indices[:abs(cantidad)]
+            for i in sorted(indices, reverse=True):
+                del lista[i]
+            return len(indices)
+
+    # === Conjuntos ordenados ===
+
+    def zadd(self, clave, mapping):
+        with self._lock:
+            self._contar()
+            zset = self._vigente(clave)
+            if zset is None:
+                zset = self._datos[clave] = {}
+            agregados = sum(1 for miembro in mapping if str(miembro) not in zset)
+            zset.update({str(miembro): float(puntaje) for miembro, puntaje in mapping.items()})
+            return agregados
+
+    def zremrangebyscore(self, clave, minimo, maximo):
+        with self._lock:
+            self._contar()
+            zset = self._vigente(clave) or {}
+            fuera = [m for m, puntaje in zset.items() if float(minimo) <= puntaje <= float(maximo)]
+            for miembro in fuera:
+                del zset[miembro]
+            return len(fuera)
+
+    def zcard(self, clave):
+        with self._lock:
+            self._contar()
+            return len(self._vigente(clave) or {})
+
+    # === Hashes ===
+
+    def hgetall(self, clave):
+        with self._lock:
+            self._contar()
+            return dict(self._vigente(clave) or {})
+
+    def hget(self, clave, campo):
+        with self._lock:
+            self._contar()
+            return (self._vigente(clave) or {}).get(campo)
+
+    def hset(self, clave, campo=None, valor=None, mapping=None):
+        with self._lock:
+            self._contar()
+            hash_ = self._vigente(clave)
+            if hash_ is None:
+                hash_ = self._datos[clave] = {}
+            nuevos = dict(mapping or {})
+            if campo is not None:
+                nuevos[campo] = valor
+            agregados = sum(1 for c in nuevos if c not in hash_)
+            hash_.update({c: str(v) for c, v in nuevos.items()})
+            return agregados
+
+    def hdel(self, clave, *campos):
+        with self._lock:
+            self._contar()
+            hash_ = self._vigente(clave) or {}
+            return sum(1 for c in campos if hash_.pop(c, None) is not None)
+
+    def hincrby(self, clave, campo, cantidad=1):
+        with self._lock:
+            self._contar()
+            hash_ = self._vigente(clave)
+            if hash_ is None:
+                hash_ = self._datos[clave] = {}
+            valor = int(hash_.get(campo, 0)) + cantidad
+            hash_[campo] = str(valor)
+            return valor
+
+
+class _PipelineEnMemoria:
+    """Acumula comandos y los ejecuta juntos, como un pipeline de redis-py."""
+
+    def __init__(self, cliente: RedisEnMemoria):
+        self._cliente = cliente
+        self._comandos = []
+
+    def __getattr__(self, nombre):
+        metodo = getattr(self._cliente, nombre)
+
+        def encolar(*args, **kwargs):
+            self._comandos.append((metodo, args, kwargs))
+            return self
+        return encolar
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._comandos = []
+
+    def execute(self):
+        with self._cliente._lock:
+            resultados = [metodo(*args, **kwargs) for metodo, args, kwargs in self._comandos]
+        self._comandos = []
+        return resultados
+
+
+def _liberar_lease(cliente: RedisEnMemoria, keys, args):
+    with cliente._lock:
+        if cliente._vigente(keys[0]) == args[0]:
+            return cliente.delete(keys[0])
+        return 0
+
+
+def _renovar_lease(cliente: RedisEnMemoria, keys, args):
+    with cliente._lock:
+        if cliente._vigente(keys[0]) == args[0]:
+            cliente._vencimientos[keys[0]] = time.monotonic() + int(args[1]) / 1000
+            return 1
+        return 0
+
+
+# Equivalentes en Python de los scripts Lua que registra la aplicación.
+_SCRIPTS_CONOCIDOS = {
+    LIBERAR_LEASE_LUA: _liberar_lease,
+    RENOVAR_LEASE_LUA: _renovar_lease,
+}
+
+
+def crear_redis_fake():
+    """Devuelve fakeredis si se pidió y está instalado; si no, RedisEnMemoria."""
+    if Config.FAKE_REDIS_BACKEND == "fakeredis":
+        try:
+            import fakeredis
+            logger.info("Usando fakeredis como backend de Redis.")
+            return fakeredis.FakeStrictRedis(decode_responses=True)
+        except ImportError:
+            logger.warning("⚠️ fakeredis no está instalado, se usa RedisEnMemoria.")
+    return RedisEnMemoria()
@@ -0,0 +1,2 @@
+# app/jobs/__init__.py
+# Procesos batch que se ejecutan fuera de la API (python -m app.jobs.<nombre>).
@@ -0,0 +1,211 @@
+# app/jobs/diagnostico_consultas.py
+"""
+Diagnóstico de las consultas de los repositorios contra una base configurada.
+
+Ejecuta cada método de lectura de los repositorios (CONSULTAS) con argumentos
+tomados de la misma base, registra las sentencias SQL que dispara, su plan de
+ejecución y la mediana de tiempo en --repeticiones corridas. El informe se guarda
+en JSON; con --comparar se muestra la diferencia de tiempos contra un informe
+anterior (por ejemplo, antes y después de `alembic upgrade head`).
+
+Planes según el motor:
+- SQL Server: SET SHOWPLAN_TEXT ON (no ejecuta la sentencia; se piden en una conexión aparte).
+- SQLite: EXPLAIN QUERY PLAN.
+- PostgreSQL / MySQL: EXPLAIN.
+
+Uso:
+    python -m app.jobs.diagnostico_consultas [--url-db1 ...] [--url-db2 ...] [--repeticiones 5]
+        [--solo Reclamo] [--salida informe.json] [--comparar informe_anterior.json]
+"""
+import argparse
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import Session
+
+from app.config.config import Config
+from app.config.logging_config import configurar_logging
+from app.models.entities import Cliente, Reclamo, Usuario
+
+logger = logging.getLogger(__name__)
+
+# (nombre, base, función(repos, muestra)). Solo lecturas: nada de esto modifica datos.
+CONSULTAS = (
+    ("SQLAlchemyUsuarioRepository.obtener_por_dni", "db2", lambda r, m: r["usuarios"].obtener_por_dni(m["dni"])),
+    ("SQLAlchemyUsuarioRepository.existe_en_db2", "db2", lambda r, m: r["usuarios"].existe_en_db2(m["dni"])),
+    ("SQLAlchemyUsuarioRepository.obtener_de_db1", "db1", lambda r, m: r["usuarios"].obtener_de_db1(m["dni"])),
+    ("SQLAlchemyUsuarioRepository.pendientes_db1", "db1", lambda r, m: r["usuarios"].pendientes_db1(0)),
+    ("SQLAlchemyReclamoRepository.obtener_por_id", "db2", lambda r, m: r["reclamos"].obtener_por_id(m["id_reclamo"])),
+    ("SQLAlchemyReclamoRepository.obtener_por_usuario", "db2", lambda r, m: r["reclamos"].obtener_por_usuario(m["id_usuario"])),
+    ("SQLAlchemyReclamoRepository.listar_pendientes", "db2", lambda r, m: r["reclamos"].listar_pendientes()),
+    ("SQLAlchemyReclamoRepository.listar_todos", "db2", lambda r, m: r["reclamos"].listar_todos()),
+    ("SQLAlchemyReclamoRepository.listar_dicts", "db2", lambda r, m: r["reclamos"].listar_dicts()),
+    ("SQLAlchemyReclamoRepository.listar_dicts[dni]", "db2", lambda r, m: r["reclamos"].listar_dicts(dni=m["dni"])),
+    ("SQLAlchemyReclamoRepository.contar_por_estado_barrio_calle", "db2",
+     lambda r, m: r["reclamos"].contar_por_estado_barrio_calle()),
+    ("SQLAlchemyReclamoRepository.contar_por_dia", "db2", lambda r, m: r["reclamos"].contar_por_dia(m["desde"])),
+    ("SQLAlchemyReclamoRepository.fechas_abiertos", "db2", lambda r, m: r["reclamos"].fechas_abiertos()),
+    ("SQLAlchemyUSERS.get_usuario_by_username", "db2", lambda r, m: r["users"].get_usuario_by_username(m["usuario"])),
+    ("SQLAlchemyUSERS.get_all_usuarios", "db2", lambda r, m: r["users"].get_all_usuarios()),
+    ("SQLAlchemyROLES.get_all_roles", "db2", lambda r, m: r["roles"].get_all_roles()),
+)
+
+
+def _muestra(session_db2: Session) -> dict:
+    """Argumentos reales para las consultas: el cliente con más reclamos y uno de sus reclamos."""
+    fila = session_db2.execute(
+        select(Reclamo.ID_USUARIO, func.max(Reclamo.ID_RECLAMO), func.count())
+        .group_by(Reclamo.ID_USUARIO).order_by(func.count().desc()).limit(1)
+    ).first()
+    id_usuario, id_reclamo = (fila[0], fila[1]) if fila else (0, 0)
+    dni = session_db2.execute(select(Cliente.DNI).where(Cliente.ID_USUARIO == id_usuario)).scalar() \
+        or session_db2.execute(select(Cliente.DNI).limit(1)).scalar() or "0"
+    usuario = session_db2.execute(select(Usuario.Usuario).limit(1)).scalar() or ""
+    return {
+        "dni": dni, "id_usuario": id_usuario, "id_reclamo": id_reclamo, "usuario": usuario,
+        "desde": datetime.now() - timedelta(days=Config.RECLAMOS_STATS_DIAS),
+    }
+
+
+def _plan(engine, sentencia: str, parametros):
+    dialecto = engine.dialect.name
+    conexion = engine.raw_connection()
+    try:
+        cursor = conexion.cursor()
+        if dialecto == "mssql":
+            cursor.execute("SET SHOWPLAN_TEXT ON")
+            try:
+                cursor.execute(sentencia, parametros)
+                plan = []
+                while True:
+                    plan += [fila[0] for fila in cursor.fetchall()]
+                    if not cursor.nextset():
+                        break
+            finally:
+                cursor.execute("SET SHOWPLAN_TEXT OFF")
+            return plan
+        prefijo = "EXPLAIN QUERY PLAN " if dialecto == "sqlite" else "EXPLAIN "
+        cursor.execute(prefijo + sentencia, parametros)
+        return [" ".join(str(c) for c in fila) for fila in cursor.fetchall()]
+    except Exception as e:
+        return [f"(sin plan: {e})"]
+    finally:
+        conexion.close()
+
+
+class DiagnosticoConsultas:
+    def __init__(self, engine_db1, engine_db2, repeticiones: int = 5):
+        self.engines = {"db1": engine_db1, "db2": engine_db2}
+        self.repeticiones = repeticiones
+
+    def _repos(self, session_db1: Session, session_db2: Session) -> dict:
+        from app.repositories.rol_repository import SQLAlchemyROLES
+        from app.repositories.sqlalchemy_reclamo_repository import SQLAlchemyReclamoRepository
+        from app.repositories.sqlalchemy_usuario_repository import SQLAlchemyUsuarioRepository
+        from app.repositories.users_repository import SQLAlchemyUSERS
+        return {
+            "usuarios": SQLAlchemyUsuarioRepository(session_db1, session_db2),
+            "reclamos": SQLAlchemyReclamoRepository(session_db2),
+            "users": SQLAlchemyUSERS(session_db2),
+            "roles": SQLAlchemyROLES(session_db2),
+        }
+
+    def _medir(self, base: str, funcion, muestra: dict) -> dict:
+        engine = self.engines[base]
+        sentencias = []
+
+        def registrar(conexion, cursor, sentencia, parametros, contexto, multiple):
+            sentencias.append((sentencia, parametros))
+        event.listen(engine, "before_cursor_execute", registrar)
+        tiempos = []
+        try:
+            for _ in range(self.repeticiones):
+                with Session(self.engines["db1"]) as session_db1, Session(self.engines["db2"]) as session_db2:
+                    repos = self._repos(session_db1, session_db2)
+                    inicio = time.perf_counter()
+                    funcion(repos, muestra)
+                    tiempos.append(time.perf_counter() - inicio)
+        finally:
+            event.remove(engine, "before_cursor_execute", registrar)
+        tiempos.sort()
+        # Las sentencias se repiten igual en cada corrida: el plan se pide una vez por sentencia distinta
+        por_corrida = sentencias[:len(sentencias) // self.repeticiones] if self.repeticiones else sentencias
+        return {
+            "base": base,
+            "mediana_ms": round(tiempos[len(tiempos) // 2] * 1000, 2),
+            "max_ms": round(tiempos[-1] * 1000, 2),
+            "sentencias": [
+                {"sql": " ".join(sentencia.split()), "plan": _plan(engine, sentencia, parametros)}
+                for sentencia, parametros in por_corrida
+            ],
+        }
+
+    def ejecutar(self, solo: str = None) -> dict:
+        with Session(self.engines["db2"]) as session_db2:
+            muestra = _muestra(session_db2)
+        informe = {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "motores": {base: engine.dialect.name for base, engine in self.engines.items()},
+            "muestra": {k: str(v) for k, v in muestra.items()},
+            "consultas": {},
+        }
+        for nombre, base, funcion in CONSULTAS:
+            if solo and solo not in nombre:
+                continue
+            try:
+                informe["consultas"][nombre] = self._medir(base, funcion, muestra)
+            except Exception as e:
+                logger.error("Error al diagnosticar %s: %s", nombre, e)
+                informe["consultas"][nombre] = {"base": base, "error": str(e)}
+        return informe
+
+
+def comparar(anterior: dict, actual: dict) -> list:
+    """Líneas con la mediana de cada consulta antes y después."""
+    lineas = []
+    for nombre, medida in actual["consultas"].items():
+        previa = anterior.get("consultas", {}).get(nombre, {})
+        if "mediana_ms" not in medida or "mediana_ms" not in previa:
+            continue
+        antes, despues = previa["mediana_ms"], medida["mediana_ms"]
+        mejora = f"x{antes / despues:.2f}" if despues else "-"
+        lineas.append(f"{nombre:60} {antes:>10.2f} ms → {despues:>10.2f} ms  {mejora}")
+    return lineas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url-db1", default=None, help="Por defecto la de Config (PR_CAU)")
+    parser.add_argument("--url-db2", default=None, help="Por defecto la de Config (DECSA_EXC)")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--solo", default=None, help="Solo las consultas cuyo nombre contiene este texto")
+    parser.add_argument("--salida", default=None, help="Archivo JSON donde guardar el informe")
+    parser.add_argument("--comparar", default=None, help="Informe JSON anterior contra el cual comparar tiempos")
+    args = parser.parse_args()
+
+    configurar_logging()
+    if args.url_db1 or args.url_db2 or not Config.USAR_BACKENDS_FAKE:
+        engine_db1 = create_engine(args.url_db1 or Config.SQLALCHEMY_BINDS["db1"])
+        engine_db2 = create_engine(args.url_db2 or Config.SQLALCHEMY_BINDS["db2"])
+    else:
+        from app.database.database import engine_db1, engine_db2
+
+    informe = DiagnosticoConsultas(engine_db1, engine_db2, args.repeticiones).ejecutar(args.solo)
+    for nombre, medida in informe["consultas"].items():
+        if "error" in medida:
+            print(f"{nombre:60} ERROR {medida['error']}")
+        else:
+            print(f"{nombre:60} {medida['mediana_ms']:>10.2f} ms  {len(medida['sentencias'])} SQL")
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            print("\n".join(comparar(json.load(archivo), informe)))
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(informe, archivo, indent=2, ensure_ascii=False, default=str)
+
+
+if __name__ == "__main__":
+    main()
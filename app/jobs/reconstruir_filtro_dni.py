@@ -0,0 +1,123 @@
+# app/jobs/reconstruir_filtro_dni.py
+"""
+Reconstruye el filtro de Bloom de DNIs conocidos (PERSONAS.NUM_DNI de PR_CAU más
+Clientes.DNI de DECSA_EXC) y lo publica en Redis (ver app/services/filtro_dni.py).
+
+El filtro se dimensiona para la cantidad actual más un margen de crecimiento, ya
+que la sincronización de clientes le va agregando los DNIs nuevos hasta la próxima
+reconstrucción. Al terminar se informa tamaño en memoria, tasa de falsos positivos
+teórica y la medida con DNIs al azar que no están en las bases.
+
+Uso:
+    python -m app.jobs.reconstruir_filtro_dni [--fp 0.01] [--margen 0.1] [--muestras 100000] [--intervalo 86400]
+"""
+import argparse
+import json
+import logging
+import random
+import time
+from datetime import datetime
+
+from app.config.config import Config
+from app.config.logging_config import configurar_logging
+from app.services.filtro_dni import BitmapBloom, dimensionar, normalizar_dni, tasa_fp_teorica
+
+logger = logging.getLogger(__name__)
+
+
+class ReconstruccionFiltroDNI:
+    def __init__(self, usuario_repository, filtro_dni, tasa_fp: float = None, margen: float = 0.1,
+                 muestras: int = 100000, tamano_lote: int = 10000):
+        self.usuario_repository = usuario_repository
+        self.filtro_dni = filtro_dni
+        self.tasa_fp = tasa_fp or Config.DNI_BLOOM_FP
+        self.margen = margen
+        self.muestras = muestras
+        self.tamano_lote = tamano_lote
+
+    def _leer_dnis(self):
+        dnis, hasta_cod_per = set(), 0
+        for lote in self.usuario_repository.iterar_dnis_db1(0, self.tamano_lote):
+            for cod_per, dni in lote:
+                dnis.add(normalizar_dni(dni))
+                hasta_cod_per = max(hasta_cod_per, cod_per)
+        for lote in self.usuario_repository.iterar_dnis_db2(self.tamano_lote):
+            dnis.update(normalizar_dni(dni) for dni in lote)
+        dnis.discard("")
+        return dnis, hasta_cod_per
+
+    def _medir_fp(self, bitmap: BitmapBloom, dnis: set) -> float:
+        """Falsos positivos sobre DNIs de 8 dígitos al azar que no están en las bases."""
+        azar = random.Random(0)
+        probados = falsos = 0
+        while probados < self.muestras:
+            dni = str(azar.randint(10000000, 99999999))
+            if dni in dnis:
+                continue
+            probados += 1
+            falsos += bitmap.contiene(dni)
+        return falsos / probados if probados else 0.0
+
+    def ejecutar(self) -> dict:
+        inicio = time.perf_counter()
+        dnis, hasta_cod_per = self._leer_dnis()
+        bits, hashes = dimensionar(int(len(dnis) * (1 + self.margen)), self.tasa_fp)
+        bitmap = BitmapBloom(bits, hashes)
+        for dni in dnis:
+            bitmap.agregar(dni)
+
+        informe = {
+            "cantidad": len(dnis),
+            "bits": bits,
+            "hashes": hashes,
+            "bytes": len(bitmap.datos),
+            "fp_objetivo": self.tasa_fp,
+            "fp_teorica": round(tasa_fp_teorica(len(dnis), bits, hashes), 6),
+            "fp_medida": round(self._medir_fp(bitmap, dnis), 6),
+            "hasta_cod_per": hasta_cod_per,
+            "agregados": 0,
+            "generado": datetime.now().isoformat(timespec="seconds"),
+        }
+        self.filtro_dni.publicar(bitmap, informe)
+
+        # Personas dadas de alta mientras se leía: se suman al filtro ya publicado
+        for lote in self.usuario_repository.iterar_dnis_db1(hasta_cod_per, self.tamano_lote):
+            self.filtro_dni.agregar(dni for _, dni in lote)
+
+        informe["segundos"] = round(time.perf_counter() - inicio, 2)
+        logger.info("Filtro de DNIs publicado: %s DNIs, %s KiB, %s hashes, fp medida %s",
+                    informe["cantidad"], informe["bytes"] // 1024, hashes, informe["fp_medida"])
+        return informe
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fp", type=float, default=Config.DNI_BLOOM_FP, help="Tasa de falsos positivos buscada")
+    parser.add_argument("--margen", type=float, default=0.1,
+                        help="Fracción extra de capacidad para los DNIs que se agreguen hasta la próxima corrida")
+    parser.add_argument("--muestras", type=int, default=100000,
+                        help="DNIs al azar para medir la tasa de falsos positivos")
+    parser.add_argument("--intervalo", type=int, default=0,
+                        help="Segundos entre corridas; 0 corre una sola vez")
+    args = parser.parse_args()
+
+    configurar_logging()
+    from app.database.database import SessionLocal_db1, SessionLocal_db2
+    from app.repositories.sqlalchemy_usuario_repository import SQLAlchemyUsuarioRepository
+    from app.services.filtro_dni import FiltroDNI
+    from app.services.redis_client import RedisClient
+
+    filtro_dni = FiltroDNI(RedisClient().get_client())
+    while True:
+        with SessionLocal_db1() as session_db1, SessionLocal_db2() as session_db2:
+            reconstruccion = ReconstruccionFiltroDNI(
+                SQLAlchemyUsuarioRepository(session_db1, session_db2), filtro_dni, args.fp, args.margen, args.muestras
+            )
+            print(json.dumps(reconstruccion.ejecutar(), indent=2, ensure_ascii=False))
+        if not args.intervalo:
+            break
+        time.sleep(args.intervalo)
+
+
+if __name__ == "__main__":
+    main()
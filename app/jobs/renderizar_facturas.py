@@ -0,0 +1,177 @@
+# app/jobs/renderizar_facturas.py
+"""
+Genera en lote las imágenes PNG y/o PDF de las facturas de PR_CAU para campañas
+de cierre de ciclo.
+
+Las facturas se leen de DB1 en lotes con un cursor de servidor, se dibujan en un
+pool de procesos (cada proceso arma una sola vez fuentes y plantilla) y se guardan
+en un almacén direccionado por contenido. En el directorio de salida quedan:
+- objetos/     PNG/PDF por sha256
+- indice.jsonl una línea por factura y formato (ID_FAC, comprobante, DNI, sha256)
+- estado.json  último ID_FAC procesado sin huecos, para reanudar
+
+Uso:
+    python -m app.jobs.renderizar_facturas --salida facturas_render [--formatos png,pdf]
+        [--desde-fecha 2025-01-01] [--workers 4] [--lote 200] [--reiniciar]
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from app.config.logging_config import configurar_logging
+from app.services.consultar_facturas_service import formatear_factura
+from app.utils.almacen_contenido import AlmacenContenido
+from app.utils.factura_generator import RenderizadorFacturas
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONES = {"png": "PNG", "pdf": "PDF"}
+
+# Estado por proceso del pool (se crea en _iniciar_worker)
+_renderizador = None
+_almacen = None
+
+
+def _iniciar_worker(directorio_objetos: str):
+    global _renderizador, _almacen
+    _renderizador = RenderizadorFacturas(max_cache=0)
+    _almacen = AlmacenContenido(directorio_objetos)
+
+
+def _renderizar_lote(filas: list, formatos: tuple) -> list:
+    entradas = []
+    for fila in filas:
+        factura = formatear_factura(fila)
+        dni = fila["Dni"]
+        for extension in formatos:
+            datos = _renderizador.dibujar(factura, dni, EXTENSIONES[extension])
+            entradas.append({
+                "id_factura": fila["IdFactura"],
+                "numero_comprobante": factura["NumeroComprobante"],
+                "dni": dni,
+                "formato": extension,
+                "sha256": _almacen.guardar(datos, extension),
+                "bytes": len(datos),
+            })
+    return entradas
+
+
+class TrabajoRenderizado:
+    def __init__(self, salida: str, formatos: tuple, workers: int, tamano_lote: int):
+        self.salida = salida
+        self.formatos = formatos
+        self.workers = workers
+        self.tamano_lote = tamano_lote
+        self.ruta_estado = os.path.join(salida, "estado.json")
+        self.ruta_indice = os.path.join(salida, "indice.jsonl")
+        os.makedirs(salida, exist_ok=True)
+
+    def leer_estado(self) -> int:
+        if not os.path.exists(self.ruta_estado):
+            return 0
+        with open(self.ruta_estado, encoding="utf-8") as archivo:
+            return json.load(archivo)["ultimo_id_factura"]
+
+    def _guardar_estado(self, ultimo_id: int):
+        temporal = self.ruta_estado + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            json.dump({"ultimo_id_factura": ultimo_id, "actualizado": datetime.now().isoformat()}, archivo)
+        os.replace(temporal, self.ruta_estado)
+
+    def reiniciar(self):
+        for ruta in (self.ruta_estado, self.ruta_indice):
+            if os.path.exists(ruta):
+                os.remove(ruta)
+
+    def ejecutar(self, lotes_de_filas) -> dict:
+        """
+        `lotes_de_filas` es un iterable de listas de filas ordenadas por IdFactura, una
+        fila por factura (estado.json guarda el último IdFactura de cada lote).
+        Los lotes se confirman en el orden en que se enviaron, así estado.json nunca
+        saltea un lote que falló aunque otro posterior haya terminado antes.
+        """
+        inicio = time.perf_counter()
+        facturas = paginas = 0
+        pendientes = deque()
+        contexto = multiprocessing.get_context("spawn")
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=contexto,
+            initializer=_iniciar_worker, initargs=(os.path.join(self.salida, "objetos"),),
+        ) as pool, open(self.ruta_indice, "a", encoding="utf-8") as indice:
+
+            def confirmar_mas_antiguo():
+                nonlocal facturas, paginas
+                futuro, ultimo_id, cantidad = pendientes.popleft()
+                entradas = futuro.result()
+                indice.writelines(json.dumps(e, ensure_ascii=False) + "\n" for e in entradas)
+                indice.flush()
+                self._guardar_estado(ultimo_id)
+                facturas += cantidad
+                paginas += len(entradas)
+                transcurrido = time.perf_counter() - inicio
+                logger.info("Facturas %s (ID_FAC ≤ %s), %.1f páginas/s", facturas, ultimo_id, paginas / transcurrido)
+
+            for filas in lotes_de_filas:
+                if not filas:
+                    continue
+                futuro = pool.submit(_renderizar_lote, filas, self.formatos)
+                pendientes.append((futuro, filas[-1]["IdFactura"], len(filas)))
+                # Tope de lotes en vuelo: la lectura de DB1 no se adelanta sin límite al render
+                while len(pendientes) >= self.workers * 2:
+                    confirmar_mas_antiguo()
+            while pendientes:
+                confirmar_mas_antiguo()
+
+        duracion = time.perf_counter() - inicio
+        return {
+            "facturas": facturas,
+            "paginas": paginas,
+            "formatos": list(self.formatos),
+            "segundos": round(duracion, 2),
+            "paginas_por_segundo": round(paginas / duracion, 1) if duracion else 0.0,
+            "ultimo_id_factura": self.leer_estado(),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--salida", default="facturas_render")
+    parser.add_argument("--formatos", default="png", help="png, pdf o png,pdf")
+    parser.add_argument("--desde-fecha", type=datetime.fromisoformat, default=None,
+                        help="Solo facturas emitidas desde esta fecha (AAAA-MM-DD)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--lote", type=int, default=200)
+    parser.add_argument("--reiniciar", action="store_true", help="Ignora estado.json y empieza desde el principio")
+    args = parser.parse_args()
+
+    formatos = tuple(f.strip().lower() for f in args.formatos.split(",") if f.strip())
+    desconocidos = [f for f in formatos if f not in EXTENSIONES]
+    if desconocidos or not formatos:
+        parser.error(f"Formatos no soportados: {', '.join(desconocidos) or '(vacío)'}")
+
+    configurar_logging()
+    from app.database.database import SessionLocal_db1
+    from app.repositories.sqlalchemy_factura_repository import SQLAlchemyFacturaRepository
+
+    trabajo = TrabajoRenderizado(args.salida, formatos, args.workers, args.lote)
+    if args.reiniciar:
+        trabajo.reiniciar()
+    desde_id = trabajo.leer_estado()
+    if desde_id:
+        logger.info("Reanudando desde ID_FAC %s", desde_id)
+
+    with SessionLocal_db1() as session:
+        repositorio = SQLAlchemyFacturaRepository(session)
+        resumen = trabajo.ejecutar(repositorio.iterar_facturas(desde_id, args.desde_fecha, args.lote))
+    print(json.dumps(resumen, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# app/jobs/sincronizar_clientes.py
+"""
+Sincroniza en lote los clientes de PR_CAU (PERSONAS/SUMSOC/SERSOC) hacia Clientes
+de DECSA_EXC, para que copiar_cliente_a_db2 quede como respaldo y el primer reclamo
+de un cliente no pague el join de DB1 dentro del request.
+
+La marca de agua es el último COD_PER sincronizado y se guarda en Redis
+(hash `sincronizacion:clientes`) junto con las filas/s y el retraso de la última
+corrida. Cada lote se confirma en su propia transacción y recién después avanza la
+marca, así una corrida interrumpida retoma desde el último lote completo.
+
+Los DNIs de cada lote se suman al filtro de DNIs conocidos (app/services/filtro_dni.py).
+
+El retraso es la antigüedad (según FEC_ALTA) de la persona más vieja que todavía
+no estaba sincronizada al empezar la corrida.
+
+Uso:
+    python -m app.jobs.sincronizar_clientes [--lote 1000] [--completo] [--intervalo 900]
+"""
+import argparse
+import json
+import logging
+import time
+from datetime import datetime
+
+from app.config.logging_config import configurar_logging
+
+logger = logging.getLogger(__name__)
+
+CLAVE_ESTADO = "sincronizacion:clientes"
+
+
+class SincronizacionClientes:
+    def __init__(self, usuario_repository, redis_client, tamano_lote: int = 1000, filtro_dni=None):
+        self.usuario_repository = usuario_repository
+        self.redis_client = redis_client
+        self.tamano_lote = tamano_lote
+        self.filtro_dni = filtro_dni
+
+    def marca_de_agua(self) -> int:
+        return int(self.redis_client.hget(CLAVE_ESTADO, "cod_per") or 0)
+
+    def _guardar_estado(self, **campos):
+        campos["actualizado"] = datetime.now().isoformat(timespec="seconds")
+        self.redis_client.hset(CLAVE_ESTADO, mapping={k: str(v) for k, v in campos.items()})
+
+    def _retraso_s(self, desde_cod_per: int):
+        pendientes, fecha_alta_minima = self.usuario_repository.pendientes_db1(desde_cod_per)
+        if not pendientes or fecha_alta_minima is None:
+            return pendientes, 0
+        return pendientes, max(int((datetime.now() - fecha_alta_minima).total_seconds()), 0)
+
+    def ejecutar(self, desde_cod_per: int = None) -> dict:
+        desde = self.marca_de_agua() if desde_cod_per is None else desde_cod_per
+        pendientes, retraso_s = self._retraso_s(desde)
+        logger.info("Sincronizando clientes desde COD_PER %s: %s pendientes, retraso %s s", desde, pendientes, retraso_s)
+
+        inicio = time.perf_counter()
+        insertados = actualizados = 0
+        marca = desde
+        for lote in self.usuario_repository.iterar_personas_db1(desde, self.tamano_lote):
+            nuevos, cambiados = self.usuario_repository.upsert_clientes_db2(lote)
+            insertados += nuevos
+            actualizados += cambiados
+            if self.filtro_dni is not None:
+                self.filtro_dni.agregar(fila["Dni"] for fila in lote)
+            marca = lote[-1]["IdPersona"]
+            self._guardar_estado(cod_per=marca)
+            logger.info("Clientes hasta COD_PER %s: %s insertados, %s actualizados, %.0f filas/s",
+                        marca, insertados, actualizados, (insertados + actualizados) / (time.perf_counter() - inicio))
+
+        duracion = time.perf_counter() - inicio
+        filas_por_segundo = round((insertados + actualizados) / duracion, 1) if duracion else 0.0
+        self._guardar_estado(cod_per=marca, filas_por_segundo=filas_por_segundo, retraso_s=retraso_s)
+        return {
+            "desde_cod_per": desde,
+            "hasta_cod_per": marca,
+            "insertados": insertados,
+            "actualizados": actualizados,
+            "segundos": round(duracion, 2),
+            "filas_por_segundo": filas_por_segundo,
+            "retraso_s": retraso_s,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lote", type=int, default=1000)
+    parser.add_argument("--completo", action="store_true",
+                        help="Recorre PERSONAS desde el principio (actualiza también los ya sincronizados)")
+    parser.add_argument("--intervalo", type=int, default=0,
+                        help="Segundos entre corridas; 0 corre una sola vez")
+    args = parser.parse_args()
+
+    configurar_logging()
+    from app.database.database import SessionLocal_db1, SessionLocal_db2
+    from app.repositories.sqlalchemy_usuario_repository import SQLAlchemyUsuarioRepository
+    from app.services.filtro_dni import FiltroDNI
+    from app.services.redis_client import RedisClient
+
+    redis_client = RedisClient().get_client()
+    desde = 0 if args.completo else None
+    while True:
+        with SessionLocal_db1() as session_db1, SessionLocal_db2() as session_db2:
+            sincronizacion = SincronizacionClientes(
+                SQLAlchemyUsuarioRepository(session_db1, session_db2), redis_client, args.lote, FiltroDNI(redis_client)
+            )
+            print(json.dumps(sincronizacion.ejecutar(desde), indent=2, ensure_ascii=False))
+        if not args.intervalo:
+            break
+        desde = None
+        time.sleep(args.intervalo)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 # app/models/entities.py
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index, Table
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
@@ -65,12 +65,28 @@ class Reclamo(Base):
     __tablename__ = 'Reclamos'
     __bind_key__ = 'db2'
 
+    # Índices de las lecturas frecuentes (ver migrations/versions). En SQL Server el
+    # índice no agrupado ya lleva ID_RECLAMO (clave agrupada); el INCLUDE evita ir a
+    # la tabla para las columnas que filtran o agrupan los tableros.
+    __table_args__ = (
+        # Reclamos de un cliente (bots y /api/reclamos/todos/{dni})
+        Index("IX_Reclamos_ID_USUARIO", "ID_USUARIO", mssql_include=["ESTADO", "FECHA_RECLAMO"]),
+        # Pendientes, cambios de estado por filtro y conteos por estado
+        Index("IX_Reclamos_ESTADO_FECHA", "ESTADO", "FECHA_RECLAMO", mssql_include=["ID_USUARIO"]),
+        # Histograma diario de /api/reclamos/stats
+        Index("IX_Reclamos_FECHA_RECLAMO", "FECHA_RECLAMO", mssql_include=["ESTADO"]),
+        # Reclamos de un corte (cierre del incidente)
+        Index("IX_Reclamos_ID_INCIDENTE", "ID_INCIDENTE"),
+    )
+
     ID_RECLAMO = Column(Integer, primary_key=True)
     ID_USUARIO = Column(Integer, ForeignKey('Clientes.ID_USUARIO'), nullable=False)
     DESCRIPCION = Column(String(500), nullable=False)
     ESTADO = Column(String(20), default="Pendiente")
     FECHA_RECLAMO = Column(DateTime, default=datetime.now)
     FECHA_CIERRE = Column(DateTime, nullable=True)
+    # Corte masivo al que se sumó el reclamo (app/services/detector_cortes.py)
+    ID_INCIDENTE = Column(Integer, ForeignKey('Incidentes.ID_INCIDENTE'), nullable=True)
 
     cliente = relationship("Cliente", back_populates="reclamos")
 
@@ -82,6 +98,7 @@ class Reclamo(Base):
             'ESTADO': self.ESTADO,
             'FECHA_RECLAMO': self.FECHA_RECLAMO.isoformat() if self.FECHA_RECLAMO else None,
             'FECHA_CIERRE': self.FECHA_CIERRE.isoformat() if self.FECHA_CIERRE else None,
+            'ID_INCIDENTE': self.ID_INCIDENTE,
             'cliente': {
                 'nombre': self.cliente.NOMBRE_COMPLETO if self.cliente else "Desconocido",
                 'dni': self.cliente.DNI if self.cliente else "Desconocido",
@@ -95,6 +112,28 @@ class Reclamo(Base):
             'medidor': self.cliente.NUMERO_MEDIDOR if self.cliente else "N/A",
         }
 
+class Incidente(Base):
+    """Corte que afecta a un barrio: agrupa los reclamos de los clientes afectados."""
+    __tablename__ = 'Incidentes'
+    __bind_key__ = 'db2'
+
+    ID_INCIDENTE = Column(Integer, primary_key=True)
+    BARRIO = Column(String(200), nullable=False)
+    ESTADO = Column(String(20), default="Abierto")
+    FECHA_INICIO = Column(DateTime, default=datetime.now)
+    FECHA_CIERRE = Column(DateTime, nullable=True)
+    CANTIDAD_RECLAMOS = Column(Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            'ID_INCIDENTE': self.ID_INCIDENTE,
+            'BARRIO': self.BARRIO,
+            'ESTADO': self.ESTADO,
+            'FECHA_INICIO': self.FECHA_INICIO.isoformat() if self.FECHA_INICIO else None,
+            'FECHA_CIERRE': self.FECHA_CIERRE.isoformat() if self.FECHA_CIERRE else None,
+            'CANTIDAD_RECLAMOS': self.CANTIDAD_RECLAMOS,
+        }
+
 class Rol(Base):
     __tablename__ = 'Rol'
     IdRol = Column(Integer, primary_key=True)
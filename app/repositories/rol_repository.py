@@ -4,15 +4,17 @@ from sqlalchemy.exc import IntegrityError
 from app.models.entities import Rol  # Ajustamos la importación
 from datetime import datetime
 import logging
+from app.utils.metrics import instrumentar_repositorio
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
+@instrumentar_repositorio
 class SQLAlchemyROLES:
     def __init__(self, session: Session):
         self.session = session
 
     def create_rol(self, nombre: str, descripcion: str | None, operador_crea: str):
-        logging.info(f"Creando nuevo rol: {nombre}")
+        logger.info("Creando nuevo rol: %s", nombre)
         db_rol = Rol(
             Nombre=nombre,
             Descripcion=descripcion,
@@ -24,28 +26,28 @@ class SQLAlchemyROLES:
             self.session.add(db_rol)
             self.session.commit()
             self.session.refresh(db_rol)
-            logging.info(f"Rol {nombre} creado exitosamente.")
+            logger.info("Rol %s creado exitosamente.", nombre)
             return db_rol
         except IntegrityError:
             self.session.rollback()
-            logging.error(f"Error: El rol {nombre} ya existe.")
+            logger.error("Error: El rol %s ya existe.", nombre)
             raise ValueError("El rol ya existe.")
 
     def get_rol_by_id(self, id_rol: int):
-        logging.info(f"Buscando rol por ID: {id_rol}")
+        logger.info("Buscando rol por ID: %s", id_rol)
         rol = self.session.query(Rol).filter(Rol.IdRol == id_rol).first()
         return rol
 
     def get_all_roles(self):
-        logging.info("Obteniendo todos los roles")
+        logger.info("Obteniendo todos los roles")
         roles = self.session.query(Rol).all()
         return roles
 
     def update_rol(self, id_rol: int, nombre: str | None, descripcion: str | None, operador_modifica: str | None):
-        logging.info(f"Actualizando rol con ID: {id_rol}")
+        logger.info("Actualizando rol con ID: %s", id_rol)
         db_rol = self.get_rol_by_id(id_rol)
         if not db_rol:
-            logging.warning(f"Rol con ID {id_rol} no encontrado.")
+            logger.warning("Rol con ID %s no encontrado.", id_rol)
             return None
         if nombre:
             db_rol.Nombre = nombre
@@ -57,18 +59,18 @@ class SQLAlchemyROLES:
         try:
             self.session.commit()
             self.session.refresh(db_rol)
-            logging.info(f"Rol con ID {id_rol} actualizado exitosamente.")
+            logger.info("Rol con ID %s actualizado exitosamente.", id_rol)
             return db_rol
         except IntegrityError:
             self.session.rollback()
-            logging.error(f"Error: El nombre {nombre} ya existe.")
+            logger.error("Error: El nombre %s ya existe.", nombre)
             raise ValueError("El nombre del rol ya existe.")
 
     def delete_rol(self, id_rol: int, operador_anula: str):
-        logging.info(f"Anulando rol con ID: {id_rol}")
+        logger.info("Anulando rol con ID: %s", id_rol)
         db_rol = self.get_rol_by_id(id_rol)
         if not db_rol:
-            logging.warning(f"Rol con ID {id_rol} no encontrado.")
+            logger.warning("Rol con ID %s no encontrado.", id_rol)
             return None
         db_rol.Anulado = True
         db_rol.FechaAnula = datetime.utcnow()
@@ -76,9 +78,9 @@ class SQLAlchemyROLES:
         try:
             self.session.commit()
             self.session.refresh(db_rol)
-            logging.info(f"Rol con ID {id_rol} anulado exitosamente.")
+            logger.info("Rol con ID %s anulado exitosamente.", id_rol)
             return db_rol
         except Exception as e:
             self.session.rollback()
-            logging.error(f"Error al anular rol {id_rol}: {str(e)}")
+            logger.error("Error al anular rol %s: %s", id_rol, e)
             raise ValueError("Error al anular rol.")
\ No newline at end of file
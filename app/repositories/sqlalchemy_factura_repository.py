@@ -0,0 +1,83 @@
+# app/repositories/sqlalchemy_factura_repository.py
+from datetime import datetime
+from typing import Iterator, List, Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+import logging
+from app.database.replica import leer_de_replica
+from app.utils.metrics import instrumentar_repositorio
+
+logger = logging.getLogger(__name__)
+
+# Mismas columnas que SQLAlchemyUsuarioRepository.obtener_de_db1, más ID_FAC para paginar y reanudar.
+_CONSULTA_FACTURAS = """
+    SELECT
+        factu.ID_FAC AS IdFactura,
+        persona.COD_PER AS IdPersona,
+        persona.APELLIDOS AS Apellido,
+        persona.NOMBRES AS Nombre,
+        persona.NUM_DNI AS Dni,
+        factu.COD_SUM AS CodigoSuministro,
+        factu.NUM_COM AS NumeroComprobante,
+        factu.FECHA AS FechaEmision,
+        factu.PAGA AS EstadoFactura,
+        factu.TOTAL1 AS TotalFactura,
+        factu.VTO1 AS VencimientoFactura,
+        sumi.OBS_POS AS ObservacionPostal,
+        barrio.DES_BAR AS Barrio,
+        calle.DES_CAL AS Calle,
+        ser.NUM_MED AS NumeroMedidor,
+        conser.PERIODO AS Periodo,
+        conser.CONSUMO AS Consumo
+    FROM FACTURAS AS factu
+    INNER JOIN PERSONAS AS persona ON persona.COD_PER = factu.COD_PER
+    LEFT JOIN SUMSOC AS sumi ON factu.COD_SUM = sumi.COD_SUM
+    LEFT JOIN CONS_SER AS conser ON conser.ID_FAC = factu.ID_FAC
+    LEFT JOIN BARRIOS AS barrio ON sumi.COD_BAR = barrio.COD_BAR
+    LEFT JOIN CALLES AS calle ON sumi.COD_CAL = calle.COD_CAL
+    LEFT JOIN SERSOC AS ser ON sumi.COD_SUM = ser.COD_SUM
+    WHERE factu.ID_FAC > :desde_id {filtro_fecha}
+    ORDER BY factu.ID_FAC, ser.NUM_MED, conser.PERIODO DESC
+"""
+
+
+@instrumentar_repositorio
+class SQLAlchemyFacturaRepository:
+    """Lecturas masivas de FACTURAS en PR_CAU (DB1, solo lectura)."""
+
+    def __init__(self, session_db1: Session):
+        self.session_db1 = session_db1
+
+    @leer_de_replica
+    def iterar_facturas(self, desde_id: int = 0, desde_fecha: Optional[datetime] = None,
+                        tamano_lote: int = 500) -> Iterator[List[dict]]:
+        """
+        Recorre las facturas con ID_FAC > desde_id en orden, de a `tamano_lote` facturas,
+        con un cursor del lado del servidor (no se carga el resultado completo en memoria).
+        Los joins con CONS_SER y SERSOC pueden repetir una factura (varios medidores o
+        períodos): se deja una fila por ID_FAC, la primera, como iterar_personas_db1, así
+        un lote nunca corta una factura y su último ID_FAC sirve para reanudar.
+        """
+        filtro_fecha = "AND factu.FECHA >= :desde_fecha" if desde_fecha else ""
+        consulta = text(_CONSULTA_FACTURAS.format(filtro_fecha=filtro_fecha))
+        parametros = {"desde_id": desde_id}
+        if desde_fecha:
+            parametros["desde_fecha"] = desde_fecha
+        try:
+            resultado = self.session_db1.execute(
+                consulta, parametros, execution_options={"stream_results": True, "yield_per": tamano_lote}
+            ).mappings()
+            lote, ultimo = [], None
+            for fila in resultado:
+                if fila["IdFactura"] == ultimo:
+                    continue
+                ultimo = fila["IdFactura"]
+                lote.append(dict(fila))
+                if len(lote) >= tamano_lote:
+                    yield lote
+                    lote = []
+            if lote:
+                yield lote
+        except Exception as e:
+            logger.error("Error al recorrer facturas desde ID_FAC %s: %s", desde_id, e)
+            raise
@@ -0,0 +1,121 @@
+# app/repositories/sqlalchemy_incidente_repository.py
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from app.models.entities import Cliente, Incidente, Reclamo
+from app.repositories.sqlalchemy_reclamo_repository import ESTADOS_CERRADOS
+import logging
+from app.utils.metrics import instrumentar_repositorio
+from app.utils.memo_turno import invalidar_memo
+
+logger = logging.getLogger(__name__)
+
+
+@instrumentar_repositorio
+class SQLAlchemyIncidenteRepository:
+    """Incidentes (cortes por barrio) de DECSA_EXC y los reclamos que agrupan."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def crear(self, barrio: str, desde: datetime, es_reporte_de_corte: Callable[[str], bool]) -> Incidente:
+        """
+        Abre un incidente para el barrio y le asocia los reclamos pendientes del barrio
+        registrados desde `desde` (los que llegaron antes de detectar el corte) cuya
+        descripción es un reporte de corte; los demás reclamos del barrio no se tocan.
+        """
+        try:
+            incidente = Incidente(BARRIO=barrio, ESTADO="Abierto", FECHA_INICIO=desde, CANTIDAD_RECLAMOS=0)
+            self.session.add(incidente)
+            self.session.flush()
+            candidatos = self.session.execute(
+                select(Reclamo.ID_RECLAMO, Reclamo.DESCRIPCION)
+                .join(Cliente, Cliente.ID_USUARIO == Reclamo.ID_USUARIO)
+                .where(Cliente.BARRIO == barrio, Reclamo.ESTADO == "Pendiente",
+                       Reclamo.FECHA_RECLAMO >= desde, Reclamo.ID_INCIDENTE.is_(None))
+            ).all()
+            ids = [id_reclamo for id_reclamo, descripcion in candidatos if es_reporte_de_corte(descripcion or "")]
+            if ids:
+                self.session.execute(
+                    update(Reclamo).where(Reclamo.ID_RECLAMO.in_(ids))
+                    .values(ID_INCIDENTE=incidente.ID_INCIDENTE)
+                    .execution_options(synchronize_session=False)
+                )
+            incidente.CANTIDAD_RECLAMOS = len(ids)
+            self.session.commit()
+            invalidar_memo()
+            logger.info("Incidente %s abierto en barrio %s con %s reclamos previos (de %s pendientes)",
+                        incidente.ID_INCIDENTE, barrio, len(ids), len(candidatos))
+            return incidente
+        except Exception as e:
+            self.session.rollback()
+            logger.error("Error al abrir incidente en barrio %s: %s", barrio, e)
+            raise
+
+    def clientes_por_dni(self, dnis: List[str]) -> Dict[str, int]:
+        """{DNI: ID_USUARIO} de los DNIs que ya están en Clientes, con un solo SELECT."""
+        if not dnis:
+            return {}
+        return dict(self.session.execute(
+            select(Cliente.DNI, Cliente.ID_USUARIO).where(Cliente.DNI.in_(list(set(dnis))))
+        ).all())
+
+    def sumar_reclamos(self, id_incidente: int, reclamos: List[dict]) -> int:
+        """
+        Inserta en una transacción los reclamos de un incidente ({"ID_USUARIO",
+        "DESCRIPCION", "FECHA_RECLAMO"}) y suma la cantidad al incidente.
+        """
+        if not reclamos:
+            return 0
+        try:
+            self.session.add_all(
+                Reclamo(ID_INCIDENTE=id_incidente, ESTADO="Pendiente", **datos) for datos in reclamos
+            )
+            self.session.execute(
+                update(Incidente).where(Incidente.ID_INCIDENTE == id_incidente)
+                .values(CANTIDAD_RECLAMOS=Incidente.CANTIDAD_RECLAMOS + len(reclamos))
+                .execution_options(synchronize_session=False)
+            )
+            self.session.commit()
+            invalidar_memo()
+            return len(reclamos)
+        except Exception as e:
+            self.session.rollback()
+            logger.error("Error al sumar %s reclamos al incidente %s: %s", len(reclamos), id_incidente, e)
+            raise
+
+    def obtener(self, id_incidente: int) -> Optional[Incidente]:
+        return self.session.get(Incidente, id_incidente)
+
+    def listar_abiertos(self) -> List[Incidente]:
+        return self.session.execute(
+            select(Incidente).where(Incidente.ESTADO == "Abierto").order_by(Incidente.FECHA_INICIO.desc())
+        ).scalars().all()
+
+    def cerrar(self, id_incidente: int, estado_reclamos: str = "Resuelto") -> Tuple[Optional[Incidente], int]:
+        """
+        Cierra el incidente y pasa a `estado_reclamos`, con un único UPDATE, sus reclamos
+        abiertos: solo los que el incidente asoció al abrirse o absorbió en modo corte.
+        """
+        try:
+            incidente = self.obtener(id_incidente)
+            if incidente is None:
+                return None, 0
+            ahora = datetime.now()
+            cerrados = self.session.execute(
+                update(Reclamo)
+                .where(Reclamo.ID_INCIDENTE == id_incidente, Reclamo.ESTADO.not_in(ESTADOS_CERRADOS))
+                .values(ESTADO=estado_reclamos, FECHA_CIERRE=ahora if estado_reclamos == "Resuelto" else None)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            incidente.ESTADO = "Cerrado"
+            incidente.FECHA_CIERRE = ahora
+            self.session.commit()
+            invalidar_memo()
+            logger.info("Incidente %s cerrado: %s reclamos → %s", id_incidente, cerrados, estado_reclamos)
+            return incidente, max(cerrados or 0, 0)
+        except Exception as e:
+            self.session.rollback()
+            logger.error("Error al cerrar el incidente %s: %s", id_incidente, e)
+            raise
@@ -1,11 +1,55 @@
 # app/repositories/sqlalchemy_reclamo_repository.py
+from sqlalchemy import Date, case, cast, func, select, update
 from sqlalchemy.orm import Session, joinedload
 from app.models.entities import Reclamo, Cliente  # Ajustamos la importación
 from datetime import datetime
+from typing import Dict, List
 import logging
+from app.utils.metrics import instrumentar_repositorio
+from app.utils.memo_turno import memorizar, invalidar_memo
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
+# Estados que ya no cuentan como reclamo abierto
+ESTADOS_CERRADOS = ("Resuelto", "Cancelado por el cliente")
+
+# Columnas que usa Reclamo.to_dict(); los listados las leen como tuplas, sin armar objetos ORM
+_COLUMNAS_LISTADO = (
+    Reclamo.ID_RECLAMO, Reclamo.ID_USUARIO, Reclamo.DESCRIPCION, Reclamo.ESTADO,
+    Reclamo.FECHA_RECLAMO, Reclamo.FECHA_CIERRE, Reclamo.ID_INCIDENTE,
+    Cliente.ID_USUARIO.label("CLIENTE_ID"), Cliente.NOMBRE_COMPLETO, Cliente.DNI, Cliente.CELULAR,
+    Cliente.EMAIL, Cliente.CALLE, Cliente.BARRIO, Cliente.CODIGO_POSTAL, Cliente.CODIGO_SUMINISTRO,
+    Cliente.NUMERO_MEDIDOR,
+)
+
+
+def reclamo_dict_desde_fila(fila) -> dict:
+    """Mismo diccionario que Reclamo.to_dict(), a partir de una fila de _COLUMNAS_LISTADO."""
+    (id_reclamo, id_usuario, descripcion, estado, fecha_reclamo, fecha_cierre, id_incidente, cliente_id, nombre, dni,
+     celular, email, calle, barrio, codigo_postal, suministro, medidor) = fila
+    hay_cliente = cliente_id is not None
+    return {
+        'ID_RECLAMO': id_reclamo,
+        'ID_USUARIO': id_usuario,
+        'DESCRIPCION': descripcion,
+        'ESTADO': estado,
+        'FECHA_RECLAMO': fecha_reclamo.isoformat() if fecha_reclamo else None,
+        'FECHA_CIERRE': fecha_cierre.isoformat() if fecha_cierre else None,
+        'ID_INCIDENTE': id_incidente,
+        'cliente': {
+            'nombre': nombre if hay_cliente else "Desconocido",
+            'dni': dni if hay_cliente else "Desconocido",
+            'celular': celular if hay_cliente else "N/A",
+            'email': email if hay_cliente else "N/A"
+        },
+        'calle': calle if hay_cliente else "Sin calle",
+        'barrio': barrio if hay_cliente else "Sin barrio",
+        'codigo_postal': codigo_postal if hay_cliente else "N/A",
+        'numeroSuministro': suministro if hay_cliente else "N/A",
+        'medidor': medidor if hay_cliente else "N/A",
+    }
+
+@instrumentar_repositorio
 class SQLAlchemyReclamoRepository:
     def __init__(self, session: Session):
         self.session = session
@@ -19,41 +63,58 @@ class SQLAlchemyReclamoRepository:
                 .first()
             )
             if reclamo:
-                logging.info(f"Reclamo encontrado con ID {id_reclamo}")
+                logger.debug("Reclamo encontrado con ID %s", id_reclamo)
             else:
-                logging.info(f"Reclamo con ID {id_reclamo} no encontrado")
+                logger.info("Reclamo con ID %s no encontrado", id_reclamo)
             return reclamo
         except Exception as e:
-            logging.error(f"Error al obtener reclamo con ID {id_reclamo}: {str(e)}")
+            logger.error("Error al obtener reclamo con ID %s: %s", id_reclamo, e)
             raise
 
+    @memorizar
     def obtener_por_usuario(self, id_usuario: int):
         try:
             if not isinstance(id_usuario, int):
-                logging.error(f"ID_USUARIO no es un entero válido: {id_usuario}")
+                logger.error("ID_USUARIO no es un entero válido: %s", id_usuario)
                 raise ValueError(f"ID_USUARIO debe ser un entero, pero se recibió: {id_usuario}")
 
-            logging.info(f"Buscando reclamos para ID_USUARIO {id_usuario}")
+            logger.debug("Buscando reclamos para ID_USUARIO %s", id_usuario)
             reclamos = (
                 self.session.query(Reclamo)
+                .options(joinedload(Reclamo.cliente))
                 .filter(Reclamo.ID_USUARIO == id_usuario)
                 .all()
             )
-            logging.info(f"Se encontraron {len(reclamos)} reclamos para ID_USUARIO {id_usuario}")
+            logger.debug("Se encontraron %s reclamos para ID_USUARIO %s", len(reclamos), id_usuario)
             return reclamos
         except Exception as e:
-            logging.error(f"Error al obtener reclamos para ID_USUARIO {id_usuario}: {str(e)}")
+            logger.error("Error al obtener reclamos para ID_USUARIO %s: %s", id_usuario, e)
+            raise
+
+    @memorizar
+    def abiertos_recientes(self, id_usuario: int, desde: datetime) -> List[tuple]:
+        """(ID_RECLAMO, DESCRIPCION, ESTADO, FECHA_RECLAMO) de los reclamos abiertos del cliente desde `desde`."""
+        try:
+            return self.session.execute(
+                select(Reclamo.ID_RECLAMO, Reclamo.DESCRIPCION, Reclamo.ESTADO, Reclamo.FECHA_RECLAMO)
+                .where(Reclamo.ID_USUARIO == id_usuario, Reclamo.ESTADO.not_in(ESTADOS_CERRADOS),
+                       Reclamo.FECHA_RECLAMO >= desde)
+                .order_by(Reclamo.ID_RECLAMO.desc())
+            ).all()
+        except Exception as e:
+            logger.error("Error al obtener reclamos abiertos de ID_USUARIO %s: %s", id_usuario, e)
             raise
 
     def guardar(self, reclamo: Reclamo):
         try:
             self.session.add(reclamo)
             self.session.commit()
-            logging.info(f"Reclamo guardado correctamente con ID {reclamo.ID_RECLAMO}")
+            invalidar_memo()
+            logger.info("Reclamo guardado correctamente con ID %s", reclamo.ID_RECLAMO)
             return reclamo
         except Exception as e:
             self.session.rollback()
-            logging.error(f"Error al guardar reclamo: {str(e)}")
+            logger.error("Error al guardar reclamo: %s", e)
             raise
 
     def actualizar_estado(self, id_reclamo: int, nuevo_estado: str):
@@ -68,13 +129,69 @@ class SQLAlchemyReclamoRepository:
                 elif reclamo.FECHA_CIERRE and nuevo_estado != "Resuelto":
                     reclamo.FECHA_CIERRE = None
                 self.session.commit()
-                logging.info(f"Estado del reclamo {id_reclamo} actualizado a {nuevo_estado}")
+                invalidar_memo()
+                logger.info("Estado del reclamo %s actualizado a %s", id_reclamo, nuevo_estado)
                 return reclamo
-            logging.warning(f"Reclamo con ID {id_reclamo} no encontrado para actualizar estado.")
+            logger.warning("Reclamo con ID %s no encontrado para actualizar estado.", id_reclamo)
             return None
         except Exception as e:
             self.session.rollback()
-            logging.error(f"Error al actualizar estado del reclamo {id_reclamo}: {str(e)}")
+            logger.error("Error al actualizar estado del reclamo %s: %s", id_reclamo, e)
+            raise
+
+    def actualizar_estados(self, cambios: Dict[int, str]) -> List[int]:
+        """
+        Cambia el estado de varios reclamos ({id: estado}) con un único UPDATE y un
+        solo commit. Igual que actualizar_estado, "Resuelto" fija FECHA_CIERRE y
+        cualquier otro estado la limpia. Devuelve los IDs que existían y se actualizaron.
+        """
+        ahora = datetime.now()
+        resueltos = [id_reclamo for id_reclamo, estado in cambios.items() if estado == "Resuelto"]
+        condicion = Reclamo.ID_RECLAMO.in_(list(cambios))
+        sentencia = update(Reclamo).where(condicion).values(
+            ESTADO=case(cambios, value=Reclamo.ID_RECLAMO),
+            FECHA_CIERRE=case((Reclamo.ID_RECLAMO.in_(resueltos), ahora), else_=None) if resueltos else None,
+        )
+        return self._ejecutar_actualizacion(sentencia, [condicion], f"{len(cambios)} reclamos")
+
+    def actualizar_estado_por_filtro(self, nuevo_estado: str, estado_actual: str = None, ids: List[int] = None,
+                                     desde: datetime = None, hasta: datetime = None) -> List[int]:
+        """Pasa a `nuevo_estado` todos los reclamos que cumplen el filtro, con un único UPDATE."""
+        condiciones = []
+        if estado_actual:
+            condiciones.append(Reclamo.ESTADO == estado_actual)
+        if ids:
+            condiciones.append(Reclamo.ID_RECLAMO.in_(ids))
+        if desde:
+            condiciones.append(Reclamo.FECHA_RECLAMO >= desde)
+        if hasta:
+            condiciones.append(Reclamo.FECHA_RECLAMO < hasta)
+        if not condiciones:
+            raise ValueError("El filtro de reclamos no puede estar vacío")
+        sentencia = update(Reclamo).where(*condiciones).values(
+            ESTADO=nuevo_estado,
+            FECHA_CIERRE=datetime.now() if nuevo_estado == "Resuelto" else None,
+        )
+        return self._ejecutar_actualizacion(sentencia, condiciones, f"filtro → {nuevo_estado}")
+
+    def _ejecutar_actualizacion(self, sentencia, condiciones: list, descripcion: str) -> List[int]:
+        sentencia = sentencia.execution_options(synchronize_session=False)
+        try:
+            if self.session.get_bind().dialect.update_returning:
+                # SQL Server (OUTPUT) y SQLite reciente: el UPDATE devuelve los IDs en el mismo viaje
+                actualizados = self.session.execute(sentencia.returning(Reclamo.ID_RECLAMO)).scalars().all()
+            else:
+                actualizados = self.session.execute(
+                    select(Reclamo.ID_RECLAMO).where(*condiciones).with_for_update()
+                ).scalars().all()
+                self.session.execute(sentencia)
+            self.session.commit()
+            invalidar_memo()
+            logger.info("Estados actualizados en bloque (%s): %s reclamos", descripcion, len(actualizados))
+            return list(actualizados)
+        except Exception as e:
+            self.session.rollback()
+            logger.error("Error al actualizar estados en bloque (%s): %s", descripcion, e)
             raise
 
     def listar_todos(self):
@@ -84,10 +201,10 @@ class SQLAlchemyReclamoRepository:
                 .options(joinedload(Reclamo.cliente))
                 .all()
             )
-            logging.info(f"Se listaron {len(reclamos)} reclamos desde DB2")
+            logger.info("Se listaron %s reclamos desde DB2", len(reclamos))
             return reclamos
         except Exception as e:
-            logging.error(f"Error al listar todos los reclamos: {str(e)}")
+            logger.error("Error al listar todos los reclamos: %s", e)
             raise
 
     def listar_pendientes(self):
@@ -98,8 +215,75 @@ class SQLAlchemyReclamoRepository:
                 .filter(Reclamo.ESTADO == "Pendiente")
                 .all()
             )
-            logging.info(f"Se listaron {len(reclamos)} reclamos pendientes desde DB2")
+            logger.info("Se listaron %s reclamos pendientes desde DB2", len(reclamos))
             return reclamos
         except Exception as e:
-            logging.error(f"Error al listar reclamos pendientes: {str(e)}")
-            raise
\ No newline at end of file
+            logger.error("Error al listar reclamos pendientes: %s", e)
+            raise
+
+    # === Listados de solo lectura (sin hidratar ORM) ===
+
+    def listar_dicts(self, dni: str = None) -> List[dict]:
+        """
+        Reclamos (de un DNI o de todos) ya convertidos al formato de Reclamo.to_dict(),
+        con una sola consulta Reclamos⋈Clientes que trae solo las columnas de la respuesta.
+        """
+        consulta = select(*_COLUMNAS_LISTADO).select_from(Reclamo).outerjoin(Cliente, Cliente.ID_USUARIO == Reclamo.ID_USUARIO)
+        if dni is not None:
+            consulta = consulta.where(Cliente.DNI == dni)
+        try:
+            filas = self.session.execute(consulta.order_by(Reclamo.ID_RECLAMO)).all()
+            logger.info("Se listaron %s reclamos desde DB2%s", len(filas), f" para DNI {dni}" if dni else "")
+            return [reclamo_dict_desde_fila(fila) for fila in filas]
+        except Exception as e:
+            logger.error("Error al listar reclamos (DNI %s): %s", dni, e)
+            raise
+
+    # === Agregados para tableros ===
+
+    def _dia(self, columna):
+        # SQLite no tiene tipo DATE: CAST(... AS DATE) devolvería solo el año
+        if self.session.get_bind().dialect.name == "sqlite":
+            return func.date(columna)
+        return cast(columna, Date)
+
+    def contar_por_estado_barrio_calle(self):
+        """Filas (estado, barrio, calle, abierto, cantidad) con un GROUP BY sobre Reclamos⋈Clientes."""
+        abierto = case((Reclamo.ESTADO.in_(ESTADOS_CERRADOS), 0), else_=1)
+        try:
+            return self.session.execute(
+                select(Reclamo.ESTADO, Cliente.BARRIO, Cliente.CALLE, abierto.label("abierto"), func.count())
+                .select_from(Reclamo)
+                .outerjoin(Cliente, Cliente.ID_USUARIO == Reclamo.ID_USUARIO)
+                .group_by(Reclamo.ESTADO, Cliente.BARRIO, Cliente.CALLE, abierto)
+            ).all()
+        except Exception as e:
+            logger.error("Error al contar reclamos por estado, barrio y calle: %s", e)
+            raise
+
+    def contar_por_dia(self, desde: datetime):
+        """Filas (día, abierto, cantidad) de los reclamos creados desde `desde`."""
+        dia = self._dia(Reclamo.FECHA_RECLAMO)
+        abierto = case((Reclamo.ESTADO.in_(ESTADOS_CERRADOS), 0), else_=1)
+        try:
+            return self.session.execute(
+                select(dia.label("dia"), abierto.label("abierto"), func.count())
+                .where(Reclamo.FECHA_RECLAMO >= desde)
+                .group_by(dia, abierto)
+            ).all()
+        except Exception as e:
+            logger.error("Error al contar reclamos por día: %s", e)
+            raise
+
+    def fechas_abiertos(self):
+        """(estado, barrio, calle, FECHA_RECLAMO) de los reclamos abiertos, para percentiles de antigüedad."""
+        try:
+            return self.session.execute(
+                select(Reclamo.ESTADO, Cliente.BARRIO, Cliente.CALLE, Reclamo.FECHA_RECLAMO)
+                .select_from(Reclamo)
+                .outerjoin(Cliente, Cliente.ID_USUARIO == Reclamo.ID_USUARIO)
+                .where(Reclamo.ESTADO.not_in(ESTADOS_CERRADOS))
+            ).all()
+        except Exception as e:
+            logger.error("Error al leer fechas de reclamos abiertos: %s", e)
+            raise
@@ -1,23 +1,88 @@
 # app/repositories/sqlalchemy_usuario_repository.py
+from typing import Iterator, List
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import text, select, insert, update
 from app.models.entities import Cliente
+from app.database.replica import leer_de_replica
 import logging
+from app.utils.metrics import instrumentar_repositorio, CLIENTES_COPIADOS_EN_REQUEST
+from app.utils.memo_turno import memorizar, invalidar_memo
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
+# Una fila por persona con el suministro de su última factura (el mismo que toma
+# copiar_cliente_a_db2, que ordena por ID_FAC DESC y usa la primera fila).
+_CONSULTA_PERSONAS = """
+    WITH ultima AS (
+        SELECT COD_PER, COD_SUM, ROW_NUMBER() OVER (PARTITION BY COD_PER ORDER BY ID_FAC DESC) AS orden
+        FROM FACTURAS
+        WHERE COD_PER > :desde_cod_per
+    )
+    SELECT
+        persona.COD_PER AS IdPersona,
+        persona.APELLIDOS AS Apellido,
+        persona.NOMBRES AS Nombre,
+        persona.NUM_DNI AS Dni,
+        persona.SEXO AS Sexo,
+        persona.TELEFONO AS Telefono,
+        persona.EMAIL AS Email,
+        persona.COD_POS AS CodigoPostal,
+        persona.FEC_ALTA AS FechaAlta,
+        persona.OBSERVAC AS Observaciones,
+        ultima.COD_SUM AS CodigoSuministro,
+        barrio.DES_BAR AS Barrio,
+        calle.DES_CAL AS Calle,
+        ser.NUM_MED AS NumeroMedidor
+    FROM PERSONAS AS persona
+    LEFT JOIN ultima ON ultima.COD_PER = persona.COD_PER AND ultima.orden = 1
+    LEFT JOIN SUMSOC AS sumi ON ultima.COD_SUM = sumi.COD_SUM
+    LEFT JOIN BARRIOS AS barrio ON sumi.COD_BAR = barrio.COD_BAR
+    LEFT JOIN CALLES AS calle ON sumi.COD_CAL = calle.COD_CAL
+    LEFT JOIN SERSOC AS ser ON sumi.COD_SUM = ser.COD_SUM
+    WHERE persona.COD_PER > :desde_cod_per AND persona.NUM_DNI IS NOT NULL
+    ORDER BY persona.COD_PER
+"""
+
+# Datos que el cliente puede cambiar desde los bots (ActualizarUsuarioService);
+# la sincronización no los pisa en clientes que ya existen en DECSA_EXC.
+CAMPOS_EDITABLES_DB2 = ("EMAIL", "CELULAR", "CALLE", "BARRIO")
+
+
+def datos_cliente_desde_db1(fila: dict) -> dict:
+    """Columnas de Clientes (DECSA_EXC) a partir de una fila de PERSONAS/SUMSOC/SERSOC."""
+    nombre_completo = f"{fila.get('Apellido') or ''} {fila.get('Nombre') or ''}".strip()
+    return {
+        "DNI": str(fila.get("Dni") or "").strip(),
+        "NOMBRE_COMPLETO": nombre_completo or "Usuario Desconocido",
+        "SEXO": fila.get("Sexo") or None,
+        "CELULAR": fila.get("Telefono") or None,
+        "EMAIL": fila.get("Email") or None,
+        "CODIGO_POSTAL": fila.get("CodigoPostal") or None,
+        "FECHA_ALTA": fila.get("FechaAlta") or None,
+        "OBSERVACIONES": fila.get("Observaciones") or None,
+        "CODIGO_SUMINISTRO": fila.get("CodigoSuministro") or "",
+        "NUMERO_MEDIDOR": fila.get("NumeroMedidor") or "",
+        "CALLE": fila.get("Calle") or None,
+        "BARRIO": fila.get("Barrio") or None,
+    }
+
+
+@instrumentar_repositorio
 class SQLAlchemyUsuarioRepository:
     def __init__(self, session_db1: Session, session_db2: Session):
         self.session_db1 = session_db1
         self.session_db2 = session_db2
 
+    @memorizar
     def obtener_por_dni(self, dni: str):
-        logging.info(f"Buscando cliente con DNI {dni} en DECSA_EXC")
+        logger.debug("Buscando cliente con DNI %s en DECSA_EXC", dni)
         result = self.session_db2.query(Cliente).filter(Cliente.DNI == dni).first()
         return result
 
+    @memorizar
+    @leer_de_replica
     def obtener_de_db1(self, dni: str):
-        logging.info(f"Buscando datos de persona con DNI {dni} en PR_CAU")
+        logger.debug("Buscando datos de persona con DNI %s en PR_CAU", dni)
         consulta = text("""
             SELECT 
                 persona.COD_PER AS IdPersona,
@@ -55,83 +120,181 @@ class SQLAlchemyUsuarioRepository:
 
         result = self.session_db1.execute(consulta, {'dni': dni}).mappings().fetchall()
         if result:
-            logging.info(f"Usuario con DNI {dni} encontrado en PR_CAU: {result}")
+            logger.info("Usuario con DNI %s encontrado en PR_CAU", dni)
+            logger.debug("Datos de PR_CAU para DNI %s: %s", dni, result)
             return [dict(row) for row in result]
         else:
-            logging.warning(f"Usuario con DNI {dni} no encontrado en PR_CAU")
+            logger.warning("Usuario con DNI %s no encontrado en PR_CAU", dni)
             return []
 
     def existe_en_db2(self, dni: str):
         result = self.session_db2.query(Cliente).filter_by(DNI=dni).first() is not None
-        logging.info(f"Verificando existencia en DECSA_EXC para DNI {dni}: {result}")
+        logger.debug("Verificando existencia en DECSA_EXC para DNI %s: %s", dni, result)
         return result
 
     def guardar_cliente_en_db2(self, cliente: Cliente):
         try:
             self.session_db2.add(cliente)
             self.session_db2.commit()
-            logging.info(f"Cliente guardado en DECSA_EXC con DNI {cliente.DNI}")
+            invalidar_memo()
+            logger.info("Cliente guardado en DECSA_EXC con DNI %s", cliente.DNI)
         except Exception as e:
             self.session_db2.rollback()
-            logging.error(f"Error al guardar cliente en DECSA_EXC: {str(e)}")
+            logger.error("Error al guardar cliente en DECSA_EXC: %s", e)
             raise
 
     def copiar_cliente_a_db2(self, dni: str):
         if self.existe_en_db2(dni):
-            logging.warning(f"Cliente con DNI {dni} ya existe en DECSA_EXC")
+            logger.warning("Cliente con DNI %s ya existe en DECSA_EXC", dni)
             return self.obtener_por_dni(dni)
 
         datos = self.obtener_de_db1(dni)
         if not datos:
-            logging.warning(f"No se encontraron datos en DB1 para DNI {dni}")
+            logger.warning("No se encontraron datos en DB1 para DNI %s", dni)
             return None
 
         try:
             # Asegurarse de que NOMBRE_COMPLETO tenga un valor válido
             nombre_completo = f"{datos[0].get('Apellido', '')} {datos[0].get('Nombre', '')}".strip()
             if not nombre_completo:
-                logging.warning(f"NOMBRE_COMPLETO vacío para DNI {dni}, usando valor por defecto")
+                logger.warning("NOMBRE_COMPLETO vacío para DNI %s, usando valor por defecto", dni)
                 nombre_completo = "Usuario Desconocido"
 
             # Usar el DNI pasado como parámetro si no está presente en los datos
             dni_valor = str(datos[0].get('Dni', dni)) or dni
             if not dni_valor:
-                logging.error(f"No se pudo determinar el DNI para el cliente con DNI {dni}")
+                logger.error("No se pudo determinar el DNI para el cliente con DNI %s", dni)
                 raise ValueError(f"No se pudo determinar el DNI para el cliente con DNI {dni}")
 
-            logging.info(f"Creando nuevo cliente en DB2 con DNI {dni_valor}, NOMBRE_COMPLETO: {nombre_completo}")
-
-            nuevo_cliente = Cliente(
-                DNI=dni_valor,
-                NOMBRE_COMPLETO=nombre_completo,
-                SEXO=datos[0].get('Sexo') or None,
-                CELULAR=datos[0].get('Telefono') or None,
-                EMAIL=datos[0].get('Email') or None,
-                CODIGO_POSTAL=datos[0].get('CodigoPostal') or None,
-                FECHA_ALTA=datos[0].get('FechaAlta') or None,
-                OBSERVACIONES=datos[0].get('Observaciones') or None,
-                CODIGO_SUMINISTRO=datos[0].get('CodigoSuministro', '') or '',
-                NUMERO_MEDIDOR=datos[0].get('NumeroMedidor') or None,
-                CALLE=datos[0].get('Calle') or None,
-                BARRIO=datos[0].get('Barrio') or None
-            )
+            logger.info("Creando nuevo cliente en DB2 con DNI %s, NOMBRE_COMPLETO: %s", dni_valor, nombre_completo)
+
+            nuevo_cliente = Cliente(**{
+                **datos_cliente_desde_db1(datos[0]),
+                "DNI": dni_valor,
+                "NOMBRE_COMPLETO": nombre_completo,
+            })
 
             self.guardar_cliente_en_db2(nuevo_cliente)
+            # Con la sincronización en lote (app/jobs/sincronizar_clientes.py) esto solo pasa
+            # con clientes dados de alta después de la última corrida
+            CLIENTES_COPIADOS_EN_REQUEST.inc()
             if not nuevo_cliente.ID_USUARIO:
-                logging.error(f"ID_USUARIO no generado para cliente con DNI {dni}")
+                logger.error("ID_USUARIO no generado para cliente con DNI %s", dni)
                 raise ValueError(f"ID_USUARIO no generado para cliente con DNI {dni}")
-            logging.info(f"Cliente copiado a DB2 con DNI {dni}, ID_USUARIO generado: {nuevo_cliente.ID_USUARIO}")
+            logger.info("Cliente copiado a DB2 con DNI %s, ID_USUARIO generado: %s", dni, nuevo_cliente.ID_USUARIO)
             return nuevo_cliente
         except Exception as e:
-            logging.error(f"Error al copiar cliente a DB2 para DNI {dni}: {str(e)}")
+            logger.error("Error al copiar cliente a DB2 para DNI %s: %s", dni, e)
             raise
 
     def actualizar_cliente(self, cliente: Cliente):
         try:
             self.session_db2.merge(cliente)
             self.session_db2.commit()
-            logging.info(f"Cliente actualizado correctamente en DECSA_EXC con DNI {cliente.DNI}")
+            invalidar_memo()
+            logger.info("Cliente actualizado correctamente en DECSA_EXC con DNI %s", cliente.DNI)
         except Exception as e:
             self.session_db2.rollback()
-            logging.error(f"Error al actualizar cliente en DECSA_EXC: {str(e)}")
-            raise
\ No newline at end of file
+            logger.error("Error al actualizar cliente en DECSA_EXC: %s", e)
+            raise
+    # === Sincronización en lote PR_CAU → DECSA_EXC ===
+
+    @leer_de_replica
+    def iterar_personas_db1(self, desde_cod_per: int = 0, tamano_lote: int = 1000) -> Iterator[List[dict]]:
+        """
+        Recorre PERSONAS con COD_PER > desde_cod_per en orden, de a `tamano_lote`
+        personas, con un cursor del lado del servidor. Si una persona tiene varios
+        medidores en SERSOC se queda con el primero, como copiar_cliente_a_db2.
+        """
+        try:
+            resultado = self.session_db1.execute(
+                text(_CONSULTA_PERSONAS), {"desde_cod_per": desde_cod_per},
+                execution_options={"stream_results": True, "yield_per": tamano_lote}
+            ).mappings()
+            lote, ultimo = [], None
+            for fila in resultado:
+                if fila["IdPersona"] == ultimo:
+                    continue
+                ultimo = fila["IdPersona"]
+                lote.append(dict(fila))
+                if len(lote) >= tamano_lote:
+                    yield lote
+                    lote = []
+            if lote:
+                yield lote
+        except Exception as e:
+            logger.error("Error al recorrer PERSONAS desde COD_PER %s: %s", desde_cod_per, e)
+            raise
+
+    @leer_de_replica
+    def pendientes_db1(self, desde_cod_per: int):
+        """(cantidad, FEC_ALTA más antigua) de las personas con COD_PER > desde_cod_per."""
+        fila = self.session_db1.execute(text("""
+            SELECT COUNT(*) AS Cantidad, MIN(FEC_ALTA) AS FechaAltaMinima
+            FROM PERSONAS
+            WHERE COD_PER > :desde_cod_per AND NUM_DNI IS NOT NULL
+        """), {"desde_cod_per": desde_cod_per}).mappings().one()
+        return fila["Cantidad"], fila["FechaAltaMinima"]
+
+    @leer_de_replica
+    def iterar_dnis_db1(self, desde_cod_per: int = 0, tamano_lote: int = 10000) -> Iterator[List[tuple]]:
+        """Lotes de (COD_PER, NUM_DNI) de las personas con DNI y COD_PER > desde_cod_per, sin joins (para el filtro de DNIs)."""
+        try:
+            resultado = self.session_db1.execute(
+                text("SELECT COD_PER, NUM_DNI FROM PERSONAS WHERE COD_PER > :desde_cod_per AND NUM_DNI IS NOT NULL"),
+                {"desde_cod_per": desde_cod_per},
+                execution_options={"stream_results": True, "yield_per": tamano_lote}
+            )
+            for lote in resultado.partitions(tamano_lote):
+                yield [tuple(fila) for fila in lote]
+        except Exception as e:
+            logger.error("Error al recorrer los DNI de PERSONAS: %s", e)
+            raise
+
+    def iterar_dnis_db2(self, tamano_lote: int = 10000) -> Iterator[List[str]]:
+        """Lotes de DNI de Clientes en DECSA_EXC."""
+        try:
+            resultado = self.session_db2.execute(
+                select(Cliente.DNI).where(Cliente.DNI.is_not(None)),
+                execution_options={"stream_results": True, "yield_per": tamano_lote}
+            ).scalars()
+            for lote in resultado.partitions(tamano_lote):
+                yield list(lote)
+        except Exception as e:
+            logger.error("Error al recorrer los DNI de Clientes: %s", e)
+            raise
+
+    def upsert_clientes_db2(self, filas: List[dict]):
+        """
+        Inserta o actualiza (por DNI) un lote de personas de PR_CAU en Clientes, en una
+        sola transacción: un SELECT para saber cuáles existen, un INSERT y un UPDATE
+        masivos. En los existentes no se tocan CAMPOS_EDITABLES_DB2.
+        Devuelve (insertados, actualizados).
+        """
+        datos = {}
+        for fila in filas:
+            cliente = datos_cliente_desde_db1(fila)
+            if cliente["DNI"]:
+                datos[cliente["DNI"]] = cliente
+        if not datos:
+            return 0, 0
+        try:
+            existentes = dict(self.session_db2.execute(
+                select(Cliente.DNI, Cliente.ID_USUARIO).where(Cliente.DNI.in_(list(datos)))
+            ).all())
+            nuevos = [c for dni, c in datos.items() if dni not in existentes]
+            cambios = [
+                {"ID_USUARIO": existentes[dni], **{k: v for k, v in c.items() if k not in CAMPOS_EDITABLES_DB2}}
+                for dni, c in datos.items() if dni in existentes
+            ]
+            if nuevos:
+                self.session_db2.execute(insert(Cliente), nuevos)
+            if cambios:
+                self.session_db2.execute(update(Cliente), cambios)
+            self.session_db2.commit()
+            invalidar_memo()
+            return len(nuevos), len(cambios)
+        except Exception as e:
+            self.session_db2.rollback()
+            logger.error("Error al sincronizar %s clientes en DECSA_EXC: %s", len(datos), e)
+            raise
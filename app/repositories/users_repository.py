@@ -3,9 +3,11 @@ from sqlalchemy.orm import Session
 from app.models.entities import Usuario, Rol
 import logging
 from datetime import datetime  # Necesario para FechaModifica y FechaAnula
+from app.utils.metrics import instrumentar_repositorio
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
+@instrumentar_repositorio
 class SQLAlchemyUSERS:
     def __init__(self, session: Session):
         self.session = session
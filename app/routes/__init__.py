@@ -17,7 +17,7 @@ from app.config.config import Config
 from app.utils.extensions import init_cors
 import logging
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 def initialize_routes(
     app: FastAPI,
@@ -41,7 +41,7 @@ def initialize_routes(
     app.include_router(whatsapp_router, prefix="/whatsapp", tags=["WhatsApp"])
     app.include_router(chattigo_router, prefix="/chattigo", tags=["Chattigo"])
 
-    logging.info("Creando adaptador de WhatsApp con ChatGPT...")
+    logger.info("Creando adaptador de WhatsApp con ChatGPT...")
     whatsapp_adapter = WhatsAppAdapterChatGPT(
         Config.WHATSAPP_PHONE_NUMBER_ID,
         Config.WHATSAPP_ACCESS_TOKEN,
@@ -52,9 +52,9 @@ def initialize_routes(
         app=app
     )
     set_whatsapp_adapter(whatsapp_adapter)
-    logging.info("Adaptador de WhatsApp con ChatGPT creado.")
+    logger.info("Adaptador de WhatsApp con ChatGPT creado.")
 
-    logging.info("Creando adaptador de Chattigo con ChatGPT...")
+    logger.info("Creando adaptador de Chattigo con ChatGPT...")
     chattigo_adapter = ChattigoAdapterChatGPT(
         username=Config.CHATTIGO_USERNAME,
         password=Config.CHATTIGO_PASSWORD,
@@ -63,12 +63,12 @@ def initialize_routes(
         redis_client=redis_client
     )
     set_chattigo_adapter(chattigo_adapter)
-    logging.info("Adaptador de Chattigo con ChatGPT creado.")
+    logger.info("Adaptador de Chattigo con ChatGPT creado.")
     """
 
     # Inicialización de servicios
-    init_cliente_services(app)
-    init_reclamo_services(app)
-    init_factura_services(app)
+    init_cliente_services(app, redis_client)
+    init_reclamo_services(app, redis_client)
+    init_factura_services(app, redis_client)
 
-    logging.info("Rutas principales inicializadas correctamente.")
+    logger.info("Rutas principales inicializadas correctamente.")
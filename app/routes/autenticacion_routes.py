@@ -8,7 +8,7 @@ from app.utils.security import get_current_user, require_role, create_access_tok
 from app.models.entities import Usuario  # Ajustamos la importación
 import logging
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 router = APIRouter()
 
 class UsuarioCreate(BaseModel):
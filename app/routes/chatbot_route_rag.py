@@ -3,13 +3,15 @@ from fastapi.responses import StreamingResponse
 import httpx
 import logging
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(tags=["Chatbot RAG"])
 
 @router.post("/proxy/consultar")
 async def proxy_consultar(request: Request):
     try:
         data = await request.json()
-        logging.info(f"🔁 Consulta recibida en /proxy/consultar: {data}")
+        logger.info("🔁 Consulta recibida en /proxy/consultar: %s", data)
 
         async def event_stream():
             try:
@@ -23,11 +25,11 @@ async def proxy_consultar(request: Request):
                         async for chunk in response.aiter_bytes():
                             yield chunk
             except Exception as e:
-                logging.error(f"🔻 Error en el stream desde n8n: {str(e)}")
+                logger.error("🔻 Error en el stream desde n8n: %s", e)
                 yield b"data: {\"response\": \"[Error al contactar con el motor RAG]\"}\\n\\n"
 
         return StreamingResponse(event_stream(), media_type="text/event-stream")
 
     except Exception as e:
-        logging.error(f"❌ Error interno en proxy_consultar: {str(e)}")
+        logger.error("❌ Error interno en proxy_consultar: %s", e)
         raise HTTPException(status_code=500, detail="Error inesperado en el servidor proxy.")
@@ -4,7 +4,7 @@ from app.services.detectar_intencion_service import DetectarIntencionService
 import logging
 import json
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Chatbot"])  # Categoría "Chatbot"
 
@@ -13,7 +13,7 @@ chatbot_service = None
 def set_detectar_intencion_usecase(service: DetectarIntencionService):
     global chatbot_service
     chatbot_service = service
-    logging.info("DetectarIntencionService establecido en chatbot_routes.")
+    logger.info("DetectarIntencionService establecido en chatbot_routes.")
 
 @router.post("")
 async def chat_with_bot(data: dict):
@@ -27,8 +27,8 @@ async def chat_with_bot(data: dict):
         resultado = json.loads(respuesta_cruda)
         return {"response": resultado.get("respuesta", "No entendí tu mensaje.")}
     except (json.JSONDecodeError, TypeError) as e:
-        logging.error(f"Error al procesar respuesta del chatbot: {str(e)}")
+        logger.error("Error al procesar respuesta del chatbot: %s", e)
         raise HTTPException(status_code=400, detail=f"Error al procesar respuesta: {str(e)}")
     except Exception as e:
-        logging.error(f"Error al interactuar con el chatbot: {str(e)}")
+        logger.error("Error al interactuar con el chatbot: %s", e)
         raise HTTPException(status_code=500, detail=f"Error al interactuar con el chatbot: {str(e)}")
\ No newline at end of file
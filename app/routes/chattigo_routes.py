@@ -2,10 +2,11 @@
 
 from fastapi import APIRouter, Request, HTTPException
 from app.config.config import Config
+from app.utils.cola_mensajes import get_cola
 import logging
 import json
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 # Crear un enrutador para las rutas de Chattigo
 router = APIRouter()
@@ -19,14 +20,14 @@ def set_chattigo_adapter(adapter):
     """
     global _chattigo_adapter
     _chattigo_adapter = adapter
-    logging.info("✅ Adaptador de Chattigo configurado para las rutas.")
+    logger.info("✅ Adaptador de Chattigo configurado para las rutas.")
 
 def get_chattigo_adapter():
     """
     Obtiene el adaptador de Chattigo para usarlo en las rutas.
     """
     if _chattigo_adapter is None:
-        logging.error("❌ Adaptador de Chattigo no inicializado.")
+        logger.error("❌ Adaptador de Chattigo no inicializado.")
         raise RuntimeError("Adaptador de Chattigo no inicializado.")
     return _chattigo_adapter
 
@@ -37,20 +38,18 @@ async def chattigo_root_webhook(request: Request):
     Captura y maneja el payload entrante desde la plataforma.
     """
     try:
-        raw_body = await request.body()
-        logging.info(f"📩 [CHATTIGO RAW PAYLOAD]:\n{raw_body.decode('utf-8')}")
-
         data = await request.json()
-        logging.info(f"📦 [CHATTIGO JSON DECODIFICADO]:\n{json.dumps(data, indent=2)}")
-
-        adapter = get_chattigo_adapter()
-        logging.info("🔄 Llamando a handle_message del adaptador...")
-        response = await adapter.handle_message(request)
-        logging.info(f"✅ Respuesta de handle_message: {response}")
-        return response or {"status": "Mensaje procesado"}
     except Exception as e:
-        logging.error(f"❌ Error al manejar la solicitud del webhook de Chattigo: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error al manejar la solicitud: {str(e)}")
+        logger.error("❌ Payload inválido de Chattigo: %s", e)
+        raise HTTPException(status_code=400, detail="Payload inválido")
+    # Trae teléfonos y texto del cliente: solo en DEBUG, con la redacción y el muestreo de app/config/logging_config.py
+    logger.debug("📦 Payload de Chattigo: %s", data)
+
+    adapter = get_chattigo_adapter()
+    # Se confirma la recepción de inmediato; handle_message corre en la cola de Chattigo.
+    if not get_cola("chattigo").encolar(adapter.procesar_payload, data):
+        raise HTTPException(status_code=503, detail="Cola de mensajes llena, reintentar más tarde.")
+    return {"status": "Mensaje recibido"}
 
 @router.get("/payloads", tags=["chattigo"])
 async def get_payloads():
@@ -69,5 +68,5 @@ async def get_payloads():
                 })
         return {"payloads": payloads}
     except Exception as e:
-        logging.error(f"❌ Error al obtener payloads de Redis: {str(e)}")
+        logger.error("❌ Error al obtener payloads de Redis: %s", e)
         raise HTTPException(status_code=500, detail=f"Error al obtener payloads: {str(e)}")
@@ -1,31 +1,85 @@
 # app/routes/factura_routes.py
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from sqlalchemy.orm import Session
 from app.repositories.sqlalchemy_usuario_repository import SQLAlchemyUsuarioRepository
 from app.database.database import get_db1, get_db2
+from app.models.entities import Usuario
 from app.services.consultar_facturas_service import ConsultarFacturasService
+from app.services.facturas_cache import CacheFacturas
+from app.utils.factura_generator import generate_factura_image, get_renderizador
+from app.utils.security import require_role
 import logging
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Facturas"])
 
-def init_factura_services(app):
-    pass  # Vacío porque usamos Depends
+_redis_client = None
+
+def init_factura_services(app, redis_client=None):
+    # Los servicios usan Depends; aquí se guarda el Redis del caché de facturas
+    # y se precargan fuentes y plantilla de la imagen de factura
+    global _redis_client
+    _redis_client = redis_client
+    get_renderizador()
 
 def get_cliente_repository(db1: Session = Depends(get_db1), db2: Session = Depends(get_db2)):
     return SQLAlchemyUsuarioRepository(db1, db2)
 
 def get_consultar_facturas_usecase(cliente_repository: SQLAlchemyUsuarioRepository = Depends(get_cliente_repository)):
-    return ConsultarFacturasService(cliente_repository)
+    return ConsultarFacturasService(cliente_repository, _redis_client)
+
+def get_cache_facturas():
+    if _redis_client is None:
+        raise HTTPException(status_code=503, detail="Caché de facturas no disponible")
+    return CacheFacturas(_redis_client)
+
+# Invalidación manual del caché (p. ej. al registrarse un pago a mitad de ciclo).
+# Van antes de /{dni} para que "suministro" no se tome como un DNI.
+@router.delete("/suministro/{codigo_suministro}/cache")
+async def invalidar_cache_suministro(
+    codigo_suministro: str,
+    cache: CacheFacturas = Depends(get_cache_facturas),
+    current_user: Usuario = Depends(require_role("admin"))
+):
+    dnis = cache.invalidar_suministro(codigo_suministro)
+    logger.info("Caché de facturas invalidado para el suministro %s (%s DNI)", codigo_suministro, len(dnis))
+    return {"codigo_suministro": codigo_suministro, "dnis_invalidados": dnis}
+
+@router.delete("/{dni}/cache")
+async def invalidar_cache_dni(
+    dni: str,
+    cache: CacheFacturas = Depends(get_cache_facturas),
+    current_user: Usuario = Depends(require_role("admin"))
+):
+    borradas = cache.invalidar_dni(dni)
+    logger.info("Caché de facturas invalidado para el DNI %s", dni)
+    return {"dni": dni, "claves_borradas": borradas}
 
 @router.get("/{dni}")
-async def obtener_facturas_por_dni(dni: str, consultar_facturas_usecase: ConsultarFacturasService = Depends(get_consultar_facturas_usecase)):
+async def obtener_facturas_por_dni(dni: str, latest_only: bool = False, consultar_facturas_usecase: ConsultarFacturasService = Depends(get_consultar_facturas_usecase)):
     try:
-        resultado, status = consultar_facturas_usecase.ejecutar(dni)
+        resultado, status = consultar_facturas_usecase.ejecutar(dni, latest_only=latest_only)
         if status != 200:
             raise HTTPException(status_code=status, detail=resultado.get("error", "Error desconocido"))
         return resultado
     except Exception as e:
-        logging.error(f"Error al obtener facturas por DNI: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error al obtener facturas por DNI: {str(e)}")
\ No newline at end of file
+        logger.error("Error al obtener facturas por DNI: %s", e)
+        raise HTTPException(status_code=500, detail=f"Error al obtener facturas por DNI: {str(e)}")
+
+@router.get("/{dni}/{numero_comprobante}/imagen")
+async def obtener_imagen_factura(dni: str, numero_comprobante: str, consultar_facturas_usecase: ConsultarFacturasService = Depends(get_consultar_facturas_usecase)):
+    """Devuelve la factura como PNG generado en memoria (sin archivos en disco)."""
+    resultado, status = consultar_facturas_usecase.ejecutar(dni)
+    if status != 200:
+        raise HTTPException(status_code=status, detail=resultado.get("error") or resultado.get("mensaje", "Error desconocido"))
+
+    factura = next((f for f in resultado.get("facturas", []) if str(f["NumeroComprobante"]) == numero_comprobante), None)
+    if factura is None:
+        raise HTTPException(status_code=404, detail="Factura no encontrada para ese DNI")
+
+    try:
+        png = generate_factura_image(factura, dni)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al generar la imagen de la factura: {str(e)}")
+    return Response(content=png, media_type="image/png", headers={"Cache-Control": "private, max-age=300"})
@@ -4,16 +4,16 @@ import logging
 from app.services.chatgpt_frontend_service import ChatGPTFrontendService
 from app.services.redis_client import RedisClient
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Frontend Chatbot"])
 
 frontend_chatbot_service = None
 
-def initialize_frontend_chatbot(redis_client):
+def initialize_frontend_chatbot(redis_client, service=None):
     global frontend_chatbot_service
-    frontend_chatbot_service = ChatGPTFrontendService(redis_client=redis_client)
-    logging.info("Servicio de chatbot para frontend inicializado.")
+    frontend_chatbot_service = service if service else ChatGPTFrontendService(redis_client=redis_client)
+    logger.info("Servicio de chatbot para frontend inicializado.")
 
 @router.post("/chat")
 async def frontend_chatbot(request: Request):
@@ -31,5 +31,5 @@ async def frontend_chatbot(request: Request):
         respuesta = frontend_chatbot_service.responder(mensaje, historial)
         return respuesta
     except Exception as e:
-        logging.error(f"Error al procesar mensaje del frontend chatbot: {str(e)}")
+        logger.error("Error al procesar mensaje del frontend chatbot: %s", e)
         raise HTTPException(status_code=500, detail=f"Error al procesar mensaje: {str(e)}")
\ No newline at end of file
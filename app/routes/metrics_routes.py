@@ -0,0 +1,11 @@
+# app/routes/metrics_routes.py
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.utils.metrics import REGISTRO
+
+router = APIRouter(tags=["Métricas"])
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Métricas en formato de texto de Prometheus (ver app/utils/metrics.py)."""
+    return PlainTextResponse(REGISTRO.exponer(), media_type="text/plain; version=0.0.4; charset=utf-8")
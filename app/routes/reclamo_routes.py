@@ -6,15 +6,23 @@ from app.database.database import get_db1, get_db2
 from app.services.registrar_reclamo_service import RegistrarReclamoService
 from app.services.consultar_estado_reclamo_service import ConsultarEstadoReclamoService
 from app.services.consultar_reclamo_service import ConsultarReclamoService
+from app.services.actualizar_estados_reclamos_service import ActualizarEstadosReclamosService
+from app.services.estadisticas_reclamos_service import EstadisticasReclamosService, configurar_estadisticas
+from app.services.detector_cortes import DetectorCortes
+from app.repositories.sqlalchemy_incidente_repository import SQLAlchemyIncidenteRepository
 import logging
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Reclamos"])
 
-# Inicialización de servicios (sin variables globales)
-def init_reclamo_services(app):
-    pass
+_redis_client = None
+
+# Inicialización de servicios: el Redis se usa para el snapshot de estadísticas
+def init_reclamo_services(app, redis_client=None):
+    global _redis_client
+    _redis_client = redis_client
+    configurar_estadisticas(redis_client)
 
 # Dependencias para inyectar en las rutas
 def get_reclamo_repository(db: Session = Depends(get_db2)):
@@ -40,6 +48,22 @@ def get_consultar_reclamo_usecase(
 ):
     return ConsultarReclamoService(reclamo_repository)
 
+def get_estadisticas_usecase(
+    reclamo_repository: SQLAlchemyReclamoRepository = Depends(get_reclamo_repository)
+):
+    return EstadisticasReclamosService(reclamo_repository, _redis_client)
+
+def get_incidente_repository(db: Session = Depends(get_db2)):
+    return SQLAlchemyIncidenteRepository(db)
+
+def get_detector_cortes():
+    return DetectorCortes(_redis_client)
+
+def get_actualizar_estados_usecase(
+    reclamo_repository: SQLAlchemyReclamoRepository = Depends(get_reclamo_repository)
+):
+    return ActualizarEstadosReclamosService(reclamo_repository)
+
 # 🔹 ENDPOINT PARA EL FRONTEND: obtener todos los reclamos por DNI
 @router.get("/todos/{dni}")
 async def obtener_todos_reclamos_por_dni(
@@ -48,11 +72,11 @@ async def obtener_todos_reclamos_por_dni(
     reclamo_repository: SQLAlchemyReclamoRepository = Depends(get_reclamo_repository)
 ):
     try:
-        cliente = cliente_repository.obtener_por_dni(dni)
-        if not cliente:
+        reclamos = reclamo_repository.listar_dicts(dni=dni)
+        # Sin reclamos hay que distinguir "cliente sin reclamos" de "cliente inexistente"
+        if not reclamos and not cliente_repository.existe_en_db2(dni):
             raise HTTPException(status_code=404, detail="Cliente no encontrado")
-        reclamos = reclamo_repository.obtener_por_usuario(cliente.ID_USUARIO)
-        return {"reclamos": [r.to_dict() for r in reclamos]}
+        return {"reclamos": reclamos}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al obtener todos los reclamos: {str(e)}")
 
@@ -60,11 +84,38 @@ async def obtener_todos_reclamos_por_dni(
 @router.get("/")
 async def obtener_todos_los_reclamos(reclamo_repository: SQLAlchemyReclamoRepository = Depends(get_reclamo_repository)):
     try:
-        reclamos = reclamo_repository.listar_todos()
-        return [r.to_dict() for r in reclamos]
+        return reclamo_repository.listar_dicts()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al obtener los reclamos: {str(e)}")
 
+# 🔸 ENDPOINT PARA TABLEROS: conteos y antigüedad de abiertos por estado, barrio, calle y día
+# (va antes de /{dni} para que "stats" no se tome como un DNI)
+@router.get("/stats")
+async def obtener_estadisticas_reclamos(estadisticas_usecase: EstadisticasReclamosService = Depends(get_estadisticas_usecase)):
+    respuesta, codigo = estadisticas_usecase.ejecutar()
+    if codigo != 200:
+        raise HTTPException(status_code=codigo, detail=respuesta.get("error", "Error desconocido"))
+    return respuesta
+
+# 🔸 ENDPOINTS DE INCIDENTES (cortes que agrupan reclamos por barrio; van antes de /{dni})
+@router.get("/incidentes")
+async def listar_incidentes_abiertos(incidente_repository: SQLAlchemyIncidenteRepository = Depends(get_incidente_repository)):
+    try:
+        return {"incidentes": [incidente.to_dict() for incidente in incidente_repository.listar_abiertos()]}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al listar los incidentes: {str(e)}")
+
+@router.put("/incidentes/{id_incidente}/cerrar")
+async def cerrar_incidente(id_incidente: int, data: dict = None, detector_cortes: DetectorCortes = Depends(get_detector_cortes)):
+    estado_reclamos = (data or {}).get("estado", "Resuelto")
+    try:
+        incidente, cerrados = detector_cortes.cerrar(id_incidente, estado_reclamos)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al cerrar el incidente: {str(e)}")
+    if incidente is None:
+        raise HTTPException(status_code=404, detail="Incidente no encontrado")
+    return {"mensaje": "Incidente cerrado", "incidente": incidente, "reclamos_actualizados": cerrados}
+
 # 🔸 ENDPOINT PARA BOT: devuelve últimos 5 reclamos
 @router.get("/{dni}")
 async def obtener_reclamos_por_dni(dni: str, consultar_estado_usecase: ConsultarEstadoReclamoService = Depends(get_consultar_estado_usecase)):
@@ -83,7 +134,8 @@ async def registrar_reclamo(dni: str, data: dict, registrar_reclamo_usecase: Reg
         raise HTTPException(status_code=400, detail="La descripción del reclamo es requerida")
     try:
         respuesta, codigo = registrar_reclamo_usecase.ejecutar(dni, data["descripcion"])
-        if codigo != 201:
+        # 200: el reclamo repetía uno abierto del cliente y se devuelve ese
+        if codigo not in (200, 201):
             raise HTTPException(status_code=codigo, detail=respuesta.get("error", "Error desconocido"))
         return respuesta
     except Exception as e:
@@ -100,6 +152,14 @@ async def obtener_reclamo_por_id(id_reclamo: int, consultar_reclamo_usecase: Con
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al obtener el reclamo por ID: {str(e)}")
 
+# 🔸 ENDPOINT PARA ACTUALIZAR ESTADOS EN BLOQUE (un solo UPDATE; va antes de /{id_reclamo})
+@router.put("/estados")
+async def actualizar_estados_reclamos(data: dict, actualizar_estados_usecase: ActualizarEstadosReclamosService = Depends(get_actualizar_estados_usecase)):
+    respuesta, codigo = actualizar_estados_usecase.ejecutar(data)
+    if codigo != 200:
+        raise HTTPException(status_code=codigo, detail=respuesta.get("error", "Error desconocido"))
+    return respuesta
+
 # 🔸 ENDPOINT PARA ACTUALIZAR ESTADO
 @router.put("/{id_reclamo}")
 async def actualizar_estado_reclamo(id_reclamo: int, data: dict, reclamo_repository: SQLAlchemyReclamoRepository = Depends(get_reclamo_repository)):
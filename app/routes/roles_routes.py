@@ -7,7 +7,7 @@ from app.utils.security import get_current_user, require_role
 from app.models.entities import Usuario
 import logging
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Roles"])  # Categoría "Roles"
 
@@ -30,7 +30,7 @@ async def crear_rol(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logging.error(f"Error al crear rol: {str(e)}")
+        logger.error("Error al crear rol: %s", e)
         raise HTTPException(status_code=500, detail=f"Error al crear rol: {str(e)}")
 
 @router.get("/{id_rol}")
@@ -73,7 +73,7 @@ async def actualizar_rol(
             raise HTTPException(status_code=404, detail="Rol no encontrado.")
         return rol_actualizado.to_dict()
     except Exception as e:
-        logging.error(f"Error al actualizar rol: {str(e)}")
+        logger.error("Error al actualizar rol: %s", e)
         raise HTTPException(status_code=500, detail=f"Error al actualizar rol: {str(e)}")
 
 @router.delete("/{id_rol}")
@@ -95,5 +95,5 @@ async def anular_rol(
             raise HTTPException(status_code=404, detail="Rol no encontrado.")
         return {"message": "Rol anulado exitosamente."}
     except Exception as e:
-        logging.error(f"Error al anular rol: {str(e)}")
+        logger.error("Error al anular rol: %s", e)
         raise HTTPException(status_code=500, detail=f"Error al anular rol: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,41 @@
+# app/routes/telegram_routes.py
+from fastapi import APIRouter, HTTPException, Request
+from app.config.config import Config
+from app.utils.cola_mensajes import get_cola
+import hmac
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["Telegram"])
+
+telegram_adapter = None
+
+def set_telegram_adapter(adapter):
+    global telegram_adapter
+    telegram_adapter = adapter
+    logger.info("Adaptador de Telegram configurado para las rutas.")
+
+@router.post("/webhook")
+async def telegram_webhook(request: Request):
+    """
+    Recibe los updates que Telegram envía en modo webhook.
+    Telegram reenvía el secreto configurado en set_webhook en la cabecera X-Telegram-Bot-Api-Secret-Token.
+    """
+    if telegram_adapter is None:
+        raise HTTPException(status_code=500, detail="Adaptador de Telegram no inicializado.")
+
+    secreto = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+    if not Config.TELEGRAM_WEBHOOK_SECRET or not hmac.compare_digest(secreto, Config.TELEGRAM_WEBHOOK_SECRET):
+        logger.warning("🚫 Update de Telegram rechazado: secreto inválido.")
+        raise HTTPException(status_code=403, detail="Secreto inválido.")
+
+    try:
+        data = await request.json()
+    except Exception as e:
+        logger.error("Payload inválido de Telegram: %s", e)
+        raise HTTPException(status_code=400, detail="Payload inválido")
+
+    if not get_cola("telegram").encolar(telegram_adapter.procesar_update, data):
+        raise HTTPException(status_code=503, detail="Cola de mensajes llena, reintentar más tarde.")
+    return {"status": "ok"}
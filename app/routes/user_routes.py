@@ -2,39 +2,47 @@
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
 from app.services.actualizar_usuario_service import ActualizarUsuarioService
+from app.services.buscar_cliente_service import BuscarClienteService
+from app.services.filtro_dni import FiltroDNI
 from app.repositories.sqlalchemy_usuario_repository import SQLAlchemyUsuarioRepository
-from app.database.database import get_db1, get_db2
+from app.database.database import get_db1, get_db2, SessionLocal_db1, SessionLocal_db2
 import logging
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Clientes"])  # Categoría "Clientes"
 
-# Inicialización de servicios (sin variables globales)
-def init_cliente_services(app):
-    # No necesitamos inicializar servicios aquí, ya que usaremos dependencias
-    pass
+_filtro_dni = None
+
+# Inicialización de servicios: solo el filtro de DNIs, que guarda sus parámetros entre requests
+def init_cliente_services(app, redis_client=None):
+    global _filtro_dni
+    _filtro_dni = FiltroDNI(redis_client) if redis_client is not None else None
 
 # Dependencias para inyectar en las rutas
 def get_cliente_repository(db1: Session = Depends(get_db1), db2: Session = Depends(get_db2)):
     return SQLAlchemyUsuarioRepository(db1, db2)
 
+def get_buscar_cliente_service():
+    # Cada búsqueda abre sus propias sesiones para poder consultar ambas bases a la vez
+    return BuscarClienteService(SessionLocal_db1, SessionLocal_db2, _filtro_dni)
+
 def get_actualizar_cliente_usecase(cliente_repository: SQLAlchemyUsuarioRepository = Depends(get_cliente_repository)):
     return ActualizarUsuarioService(cliente_repository)
 
 @router.get("/{dni}")
-async def validar_cliente(dni: str, cliente_repository: SQLAlchemyUsuarioRepository = Depends(get_cliente_repository)):
-    """Valida si el cliente existe, buscando primero en DECSA_EXC (DB2) y luego en PR_CAU (DB1)."""
+async def validar_cliente(dni: str, buscar_cliente_service: BuscarClienteService = Depends(get_buscar_cliente_service)):
+    """Valida si el cliente existe en DECSA_EXC (DB2) o, si no está ahí, en PR_CAU (DB1). Ambas se consultan en paralelo."""
     try:
-        logging.info(f"Validando cliente con DNI: {dni}")
-        cliente_db2 = cliente_repository.obtener_por_dni(dni)
-        if cliente_db2:
-            logging.info(f"Cliente encontrado en DECSA_EXC: {cliente_db2.NOMBRE_COMPLETO}")
-            return cliente_db2.to_dict()
+        logger.info("Validando cliente con DNI: %s", dni)
+        resultado = await buscar_cliente_service.buscar(dni, preferida="db2")
+        if resultado.fuente == "db2":
+            logger.info("Cliente encontrado en DECSA_EXC: %s", resultado.cliente_db2.NOMBRE_COMPLETO)
+            return resultado.cliente_db2.to_dict()
 
-        cliente_db1 = cliente_repository.obtener_de_db1(dni)
-        if cliente_db1:
-            logging.info(f"Cliente encontrado en PR_CAU")
+        if resultado.fuente == "db1":
+            cliente_db1 = resultado.filas_db1
+            logger.info("Cliente encontrado en PR_CAU")
             # Combinar Apellido y Nombre para formar NOMBRE_COMPLETO
             apellido = cliente_db1[0]["Apellido"] or ""
             nombre = cliente_db1[0]["Nombre"] or ""
@@ -50,10 +58,10 @@ async def validar_cliente(dni: str, cliente_repository: SQLAlchemyUsuarioReposit
                 "CODIGO_POSTAL": cliente_db1[0].get("CodigoPostal")
             }
 
-        logging.warning(f"Cliente con DNI {dni} no encontrado en ninguna base")
+        logger.warning("Cliente con DNI %s no encontrado en ninguna base", dni)
         raise HTTPException(status_code=404, detail="Cliente no encontrado")
     except Exception as e:
-        logging.error(f"Error al validar cliente: {str(e)}")
+        logger.error("Error al validar cliente: %s", e)
         raise HTTPException(status_code=500, detail=f"Error al validar cliente: {str(e)}")
 
 @router.put("/{dni}")
@@ -62,11 +70,11 @@ async def actualizar_datos_cliente(dni: str, data: dict, actualizar_cliente_usec
     if not data:
         raise HTTPException(status_code=400, detail="Datos de actualización requeridos")
     try:
-        logging.info(f"Actualizando cliente con DNI: {dni}")
+        logger.info("Actualizando cliente con DNI: %s", dni)
         respuesta, status_code = actualizar_cliente_usecase.ejecutar(dni, data)
         if status_code != 200:
             raise HTTPException(status_code=status_code, detail=respuesta.get("error", "Error desconocido"))
         return respuesta
     except Exception as e:
-        logging.error(f"Error al actualizar datos del cliente: {str(e)}")
+        logger.error("Error al actualizar datos del cliente: %s", e)
         raise HTTPException(status_code=500, detail=f"Error al actualizar datos: {str(e)}")
\ No newline at end of file
@@ -1,8 +1,9 @@
 # app/routes/whatsapp_routes.py
 from fastapi import APIRouter, HTTPException, Request
+from app.utils.cola_mensajes import get_cola
 import logging
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["WhatsApp"])  # Categoría "WhatsApp"
 
@@ -11,7 +12,7 @@ whatsapp_adapter = None
 def set_whatsapp_adapter(adapter):
     global whatsapp_adapter
     whatsapp_adapter = adapter
-    logging.info("Adaptador de WhatsApp configurado para las rutas.")
+    logger.info("Adaptador de WhatsApp configurado para las rutas.")
 
 @router.get("/webhook")
 async def whatsapp_webhook_verify(request: Request):
@@ -24,23 +25,24 @@ async def whatsapp_webhook_verify(request: Request):
         challenge = query.get("hub.challenge")
 
         if mode == "subscribe" and token == whatsapp_adapter.verify_token:
-            logging.info("Webhook de WhatsApp verificado exitosamente.")
+            logger.info("Webhook de WhatsApp verificado exitosamente.")
             return int(challenge)
         else:
             raise HTTPException(status_code=403, detail="Verificación fallida.")
     except Exception as e:
-        logging.error(f"Error al verificar webhook de WhatsApp: {str(e)}")
+        logger.error("Error al verificar webhook de WhatsApp: %s", e)
         raise HTTPException(status_code=500, detail=f"Error al verificar webhook: {str(e)}")
 
 @router.post("/webhook")
 async def whatsapp_webhook(request: Request):
+    if whatsapp_adapter is None:
+        raise HTTPException(status_code=500, detail="Adaptador de WhatsApp no inicializado.")
     try:
-        if whatsapp_adapter is None:
-            raise HTTPException(status_code=500, detail="Adaptador de WhatsApp no inicializado.")
         body = await request.json()
-        logging.info(f"Mensaje recibido de WhatsApp: {body}")
-        response = await whatsapp_adapter.handle_message(request)  # Añadimos await y pasamos request
-        return response or {"status": "Mensaje procesado"}
     except Exception as e:
-        logging.error(f"Error al procesar mensaje de WhatsApp: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error al procesar mensaje: {str(e)}")
\ No newline at end of file
+        logger.error("Payload inválido de WhatsApp: %s", e)
+        raise HTTPException(status_code=400, detail="Payload inválido")
+    # Se responde enseguida; el mensaje se procesa en la cola para no exceder el timeout de Meta.
+    if not get_cola("whatsapp").encolar(whatsapp_adapter.procesar_payload, body):
+        raise HTTPException(status_code=503, detail="Cola de mensajes llena, reintentar más tarde.")
+    return {"status": "ok"}
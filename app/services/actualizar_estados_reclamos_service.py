@@ -0,0 +1,78 @@
+# app/services/actualizar_estados_reclamos_service.py
+from datetime import datetime
+from app.repositories.sqlalchemy_reclamo_repository import SQLAlchemyReclamoRepository
+import logging
+
+logger = logging.getLogger(__name__)
+
+# SQL Server admite hasta 2100 parámetros por sentencia y cada cambio usa tres (IN, CASE y FECHA_CIERRE)
+MAX_CAMBIOS_POR_LOTE = 500
+
+
+class ActualizarEstadosReclamosService:
+    """
+    Cambio de estado en bloque (cuadrillas que cierran muchos reclamos a la vez).
+
+    Acepta una de dos formas:
+    - {"cambios": [{"id": 12, "estado": "Resuelto"}, ...]}
+    - {"filtro": {"estado": "Pendiente", "ids": [...], "desde": "2025-01-01", "hasta": "2025-02-01"},
+       "estado": "Resuelto"}
+    En ambos casos se ejecuta un solo UPDATE en una transacción y se devuelve el
+    resultado por ID.
+    """
+
+    def __init__(self, reclamo_repository: SQLAlchemyReclamoRepository):
+        self.reclamo_repository = reclamo_repository
+
+    def ejecutar(self, data: dict):
+        try:
+            if data.get("cambios") is not None:
+                return self._por_cambios(data["cambios"])
+            if data.get("filtro") is not None:
+                return self._por_filtro(data["filtro"], data.get("estado"))
+            return {"error": "Se requiere 'cambios' o 'filtro' con 'estado'"}, 400
+        except (ValueError, TypeError, KeyError) as e:
+            return {"error": f"Solicitud inválida: {e}"}, 400
+        except Exception as e:
+            logger.error("Error al actualizar estados de reclamos en bloque: %s", e)
+            return {"error": "Error al actualizar los estados", "detalle": str(e)}, 500
+
+    def _por_cambios(self, cambios: list):
+        if not cambios:
+            return {"error": "La lista de cambios está vacía"}, 400
+        if len(cambios) > MAX_CAMBIOS_POR_LOTE:
+            return {"error": f"Se admiten hasta {MAX_CAMBIOS_POR_LOTE} cambios por solicitud"}, 400
+
+        pedidos = {}
+        for cambio in cambios:
+            estado = str(cambio["estado"]).strip()
+            if not estado:
+                raise ValueError(f"estado vacío para el reclamo {cambio['id']}")
+            pedidos[int(cambio["id"])] = estado  # si un ID se repite, gana el último
+
+        actualizados = set(self.reclamo_repository.actualizar_estados(pedidos))
+        resultados = [
+            {"id": id_reclamo, "estado": estado, "resultado": "actualizado" if id_reclamo in actualizados else "no_encontrado"}
+            for id_reclamo, estado in pedidos.items()
+        ]
+        return {"actualizados": len(actualizados), "no_encontrados": len(pedidos) - len(actualizados),
+                "resultados": resultados}, 200
+
+    def _por_filtro(self, filtro: dict, estado: str):
+        if not estado or not str(estado).strip():
+            return {"error": "El campo 'estado' es requerido junto con 'filtro'"}, 400
+        ids = [int(i) for i in filtro.get("ids") or []]
+        if len(ids) > MAX_CAMBIOS_POR_LOTE:
+            return {"error": f"Se admiten hasta {MAX_CAMBIOS_POR_LOTE} IDs por solicitud"}, 400
+        actualizados = self.reclamo_repository.actualizar_estado_por_filtro(
+            str(estado).strip(),
+            estado_actual=filtro.get("estado"),
+            ids=ids,
+            desde=datetime.fromisoformat(filtro["desde"]) if filtro.get("desde") else None,
+            hasta=datetime.fromisoformat(filtro["hasta"]) if filtro.get("hasta") else None,
+        )
+        actualizados = set(actualizados)
+        resultados = [{"id": i, "estado": estado, "resultado": "actualizado"} for i in sorted(actualizados)]
+        # IDs pedidos que no existen o no cumplían el resto del filtro
+        resultados += [{"id": i, "estado": estado, "resultado": "no_coincide"} for i in ids if i not in actualizados]
+        return {"actualizados": len(actualizados), "resultados": resultados}, 200
@@ -3,7 +3,7 @@ import logging
 from app.models.entities import Cliente
 from app.repositories.sqlalchemy_usuario_repository import SQLAlchemyUsuarioRepository
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 class ActualizarUsuarioService:
     def __init__(self, usuario_repository: SQLAlchemyUsuarioRepository):
@@ -16,7 +16,7 @@ class ActualizarUsuarioService:
             if not cliente:
                 cliente = self.usuario_repository.copiar_cliente_a_db2(dni)
                 if not cliente:
-                    logging.error(f"Cliente no encontrado en ninguna base de datos para DNI {dni}")
+                    logger.error("Cliente no encontrado en ninguna base de datos para DNI %s", dni)
                     return {"error": "Cliente no encontrado en ninguna base de datos"}, 404
 
             # Campos que se pueden actualizar
@@ -24,11 +24,11 @@ class ActualizarUsuarioService:
             datos_filtrados = {k: v for k, v in nuevos_datos.items() if k in campos_permitidos}
 
             if not datos_filtrados and nuevos_datos:
-                logging.warning(f"No se enviaron datos válidos para actualizar para DNI {dni}")
+                logger.warning("No se enviaron datos válidos para actualizar para DNI %s", dni)
                 return {"error": "No se enviaron datos válidos para actualizar"}, 400
 
             if not datos_filtrados:
-                logging.info(f"No hay datos para actualizar para DNI {dni}, devolviendo datos actuales")
+                logger.info("No hay datos para actualizar para DNI %s, devolviendo datos actuales", dni)
                 return cliente.to_dict(), 200
 
             # Actualizar cada campo permitido
@@ -36,8 +36,8 @@ class ActualizarUsuarioService:
                 setattr(cliente, campo, valor)
 
             self.usuario_repository.actualizar_cliente(cliente)
-            logging.info(f"Cliente actualizado exitosamente para DNI {dni}")
+            logger.info("Cliente actualizado exitosamente para DNI %s", dni)
             return cliente.to_dict(), 200
         except Exception as e:
-            logging.error(f"Error al actualizar usuario con DNI {dni}: {str(e)}")
+            logger.error("Error al actualizar usuario con DNI %s: %s", dni, e)
             return {"error": f"Error al actualizar usuario: {str(e)}"}, 500
\ No newline at end of file
@@ -0,0 +1,141 @@
+# app/services/buscar_cliente_service.py
+import asyncio
+import logging
+import threading
+from typing import Optional
+
+from app.repositories.sqlalchemy_usuario_repository import SQLAlchemyUsuarioRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ResultadoBusquedaCliente:
+    """Lo que se obtuvo de cada base; una fuente que no llegó a responder queda en None."""
+
+    def __init__(self, dni: str):
+        self.dni = dni
+        self.cliente_db2 = None
+        self.filas_db1: Optional[list] = None
+        self.fuente: Optional[str] = None
+
+    @property
+    def encontrado(self) -> bool:
+        return self.fuente is not None
+
+    @property
+    def nombre(self) -> Optional[str]:
+        if self.fuente == "db1":
+            fila = self.filas_db1[0]
+            return f"{(fila['Apellido'] or '').strip()} {(fila['Nombre'] or '').strip()}".strip() or None
+        if self.fuente == "db2":
+            return (self.cliente_db2.NOMBRE_COMPLETO or "").strip() or None
+        return None
+
+
+class BuscarClienteService:
+    """
+    Busca un DNI en DECSA_EXC (DB2) y PR_CAU (DB1) a la vez, cada consulta en su
+    propio hilo y con su propia sesión, así el tiempo es el de la más lenta y no la suma.
+
+    - `primera_valida=True`: gana la primera base que encuentra al cliente (los bots
+      solo necesitan el nombre para confirmar).
+    - Si no, se respeta `preferida`: su resultado gana si lo encuentra; la otra base
+      solo se espera cuando la preferida no lo tiene.
+
+    La consulta que pierde se cancela: si todavía no empezó, no se ejecuta; si ya
+    está en curso, su resultado se descarta y su sesión se cierra al terminar.
+
+    Con `filtro_dni` (ver app/services/filtro_dni.py) los DNIs del caché negativo se
+    responden sin consultar ninguna base, los que el filtro de Bloom no tiene se
+    confirman solo en PR_CAU, y los que no aparecen en ninguna quedan en el caché negativo.
+    """
+
+    def __init__(self, session_factory_db1=None, session_factory_db2=None, filtro_dni=None):
+        if session_factory_db1 is None or session_factory_db2 is None:
+            from app.database.database import SessionLocal_db1, SessionLocal_db2
+            session_factory_db1 = session_factory_db1 or SessionLocal_db1
+            session_factory_db2 = session_factory_db2 or SessionLocal_db2
+        self.session_factory_db1 = session_factory_db1
+        self.session_factory_db2 = session_factory_db2
+        self.filtro_dni = filtro_dni
+
+    def _consultar(self, base: str, dni: str, cancelada: threading.Event):
+        if cancelada.is_set():
+            return None
+        session = self.session_factory_db1() if base == "db1" else self.session_factory_db2()
+        try:
+            repositorio = SQLAlchemyUsuarioRepository(session if base == "db1" else None,
+                                                      session if base == "db2" else None)
+            if base == "db1":
+                return repositorio.obtener_de_db1(dni) or None
+            cliente = repositorio.obtener_por_dni(dni)
+            if cliente is not None:
+                # Se usa fuera de la sesión: se desacopla con los atributos ya cargados
+                session.expunge(cliente)
+            return cliente
+        finally:
+            session.close()
+
+    async def buscar(self, dni: str, preferida: str = "db2", primera_valida: bool = False) -> ResultadoBusquedaCliente:
+        resultado = ResultadoBusquedaCliente(dni)
+        clase = self.filtro_dni.clasificar(dni) if self.filtro_dni is not None else "consultar"
+        if clase == "desconocido":
+            logger.debug("DNI %s descartado sin consultar las bases", dni)
+            return resultado
+        # Fuera del filtro de Bloom: PR_CAU, que tiene a todos los clientes, confirma que no existe
+        bases = ("db1",) if clase == "solo_db1" else ("db1", "db2")
+        cancelaciones = {base: threading.Event() for base in bases}
+        tareas = {
+            asyncio.create_task(asyncio.to_thread(self._consultar, base, dni, cancelaciones[base])): base
+            for base in bases
+        }
+        errores = {}
+        pendientes = set(tareas)
+        try:
+            while pendientes:
+                terminadas, pendientes = await asyncio.wait(pendientes, return_when=asyncio.FIRST_COMPLETED)
+                for tarea in terminadas:
+                    base = tareas[tarea]
+                    try:
+                        valor = tarea.result()
+                    except Exception as e:
+                        logger.error("Error al buscar DNI %s en %s: %s", dni, base, e)
+                        errores[base] = e
+                        continue
+                    if base == "db1":
+                        resultado.filas_db1 = valor or []
+                    else:
+                        resultado.cliente_db2 = valor
+                if self._elegir_fuente(resultado, preferida, primera_valida, pendientes, tareas):
+                    break
+        finally:
+            for tarea in pendientes:
+                cancelaciones[tareas[tarea]].set()
+                tarea.cancel()
+
+        if not resultado.encontrado and len(errores) == len(tareas):
+            raise next(iter(errores.values()))
+        if not resultado.encontrado and not errores and self.filtro_dni is not None:
+            self.filtro_dni.marcar_desconocido(dni)
+        logger.debug("DNI %s resuelto desde %s", dni, resultado.fuente or "ninguna base")
+        return resultado
+
+    @staticmethod
+    def _elegir_fuente(resultado: ResultadoBusquedaCliente, preferida: str, primera_valida: bool, pendientes, tareas) -> bool:
+        """Fija `resultado.fuente` cuando ya se puede decidir; devuelve True si no hace falta esperar más."""
+        encontrados = {"db1": bool(resultado.filas_db1), "db2": resultado.cliente_db2 is not None}
+        otra = "db1" if preferida == "db2" else "db2"
+        if primera_valida:
+            for base in (preferida, otra):
+                if encontrados[base]:
+                    resultado.fuente = base
+                    return True
+            return False
+        preferida_pendiente = any(tareas[t] == preferida for t in pendientes)
+        if encontrados[preferida]:
+            resultado.fuente = preferida
+            return True
+        if not preferida_pendiente and encontrados[otra]:
+            resultado.fuente = otra
+            return True
+        return False
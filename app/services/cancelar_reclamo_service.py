@@ -2,7 +2,7 @@
 import logging
 from app.repositories.sqlalchemy_reclamo_repository import SQLAlchemyReclamoRepository
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 class CancelarReclamoService:
     def __init__(self, reclamo_repository: SQLAlchemyReclamoRepository):
@@ -19,8 +19,8 @@ class CancelarReclamoService:
 
             reclamo.ESTADO = "Cancelado por el cliente"
             self.reclamo_repository.actualizar_estado(id_reclamo, "Cancelado por el cliente")
-            logging.info(f"Reclamo {id_reclamo} cancelado exitosamente")
+            logger.info("Reclamo %s cancelado exitosamente", id_reclamo)
             return {"message": "Reclamo cancelado exitosamente"}, 200
         except Exception as e:
-            logging.error(f"Error al cancelar reclamo {id_reclamo}: {str(e)}")
+            logger.error("Error al cancelar reclamo %s: %s", id_reclamo, e)
             return {"error": f"Error al cancelar reclamo: {str(e)}"}, 500
\ No newline at end of file
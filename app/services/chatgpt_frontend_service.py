@@ -5,14 +5,16 @@ import re
 from openai import OpenAI
 from app.config.config import Config
 from app.services.redis_client import RedisClient
+from app.utils.metrics import medir_openai, registrar_cache_llm
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 class ChatGPTFrontendService:
     def __init__(self, redis_client: RedisClient = None):
         self.client = OpenAI(api_key=Config.CHATGPT_API_KEY)
         self.redis_client = redis_client
-        logging.info("ChatGPTFrontendService inicializado con API Key configurada.")
+        self._crear_completion = medir_openai("ChatGPTFrontendService")(self.client.chat.completions.create)
+        logger.info("ChatGPTFrontendService inicializado con API Key configurada.")
 
     def generar_respuesta(self, prompt, historial=""):
         try:
@@ -21,9 +23,10 @@ class ChatGPTFrontendService:
             if self.redis_client:
                 cache_key = f"chatgpt_frontend:v7:{hash(prompt_lower + historial)}"
                 cached_response = self.redis_client.get(cache_key)
+                registrar_cache_llm("ChatGPTFrontendService", bool(cached_response))
                 if cached_response:
-                    logging.info("Respuesta obtenida del caché.")
-                    return json.loads(cached_response.decode('utf-8'))
+                    logger.debug("Respuesta obtenida del caché.")
+                    return json.loads(cached_response)
 
             # === UBICACIÓN ===
             if any(p in prompt_lower for p in ["ubicación", "dónde están", "donde estan", "dirección", "cómo llegar"]):
@@ -95,7 +98,7 @@ class ChatGPTFrontendService:
                 }}
                 """
 
-                response = self.client.chat.completions.create(
+                response = self._crear_completion(
                     model="gpt-4o-mini",
                     messages=[
                         {"role": "system", "content": "Sos un asistente que responde en JSON y no puede inventar datos."},
@@ -138,7 +141,7 @@ class ChatGPTFrontendService:
                 }}
                 """
 
-                response = self.client.chat.completions.create(
+                response = self._crear_completion(
                     model="gpt-4o-mini",
                     messages=[
                         {"role": "system", "content": "Sos un asistente que responde en JSON y no puede inventar información."},
@@ -164,14 +167,14 @@ class ChatGPTFrontendService:
             # === CACHÉ ===
             if self.redis_client:
                 self.redis_client.setex(cache_key, 3600, json.dumps({"respuesta": respuesta_final}))
-                logging.info("Respuesta guardada en caché.")
+                logger.debug("Respuesta guardada en caché.")
 
             return {"respuesta": respuesta_final}
 
         except Exception as e:
-            logging.error(f"Error al generar respuesta: {str(e)}")
+            logger.error("Error al generar respuesta: %s", e)
             return {"respuesta": "Hubo un error al procesar tu consulta. Por favor, intentá nuevamente."}
 
     def responder(self, mensaje, historial=""):
-        logging.info(f"Enviando a ChatGPT Frontend: '{mensaje}'")
+        logger.debug("Enviando a ChatGPT Frontend: '%s'", mensaje)
         return self.generar_respuesta(mensaje, historial)
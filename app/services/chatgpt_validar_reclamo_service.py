@@ -6,23 +6,26 @@ import re
 from openai import OpenAI
 from app.config.config import Config
 from app.services.redis_client import RedisClient
+from app.utils.metrics import medir_openai, registrar_cache_llm
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 class ChatGPTValidarReclamoService:
     def __init__(self, redis_client: RedisClient = None):
         self.client = OpenAI(api_key=Config.CHATGPT_API_KEY)
         self.redis_client = redis_client
-        logging.info("ChatGPTValidarReclamoService inicializado con API Key configurada.")
+        self._crear_completion = medir_openai("ChatGPTValidarReclamoService")(self.client.chat.completions.create)
+        logger.info("ChatGPTValidarReclamoService inicializado con API Key configurada.")
 
     def validar_reclamo(self, descripcion, historial=""):
         try:
             if self.redis_client:
                 cache_key = f"chatgpt_validar:v1:{hash(descripcion + historial)}"
                 cached_response = self.redis_client.get(cache_key)
+                registrar_cache_llm("ChatGPTValidarReclamoService", bool(cached_response))
                 if cached_response:
-                    logging.info(f"Respuesta obtenida del caché: {cached_response}")
-                    return cached_response.decode('utf-8')
+                    logger.debug("Respuesta obtenida del caché: %s", cached_response)
+                    return cached_response
 
             full_prompt = f"""
             Analiza esta descripción de un reclamo: '{descripcion}'. 
@@ -37,7 +40,7 @@ class ChatGPTValidarReclamoService:
 
             start_time = time.time()
 
-            response = self.client.chat.completions.create(
+            response = self._crear_completion(
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "Sos un asistente que responde en JSON."},
@@ -48,8 +51,8 @@ class ChatGPTValidarReclamoService:
             )
 
             texto_respuesta = response.choices[0].message.content.strip()
-            logging.info(f"Tiempo de respuesta: {time.time() - start_time:.2f} segundos")
-            logging.info(f"Respuesta de ChatGPT: {texto_respuesta}")
+            logger.debug("Tiempo de respuesta: %.2f segundos", time.time() - start_time)
+            logger.debug("Respuesta de ChatGPT: %s", texto_respuesta)
 
             # Limpieza de bloques ```json ... ``` si aparecen
             match = re.match(r"```(?:json)?\s*(\{.*\})\s*```", texto_respuesta, re.DOTALL)
@@ -60,15 +63,15 @@ class ChatGPTValidarReclamoService:
             try:
                 json.loads(texto_respuesta)
             except json.JSONDecodeError:
-                logging.warning(f"Respuesta no es JSON válido: {texto_respuesta}")
+                logger.warning("Respuesta no es JSON válido: %s", texto_respuesta)
                 texto_respuesta = '{"es_valido": false, "mensaje": "No pude validar el reclamo debido a un problema técnico."}'
 
             if self.redis_client:
                 self.redis_client.setex(cache_key, 3600, texto_respuesta)
-                logging.info(f"Respuesta guardada en caché: {cache_key}")
+                logger.debug("Respuesta guardada en caché: %s", cache_key)
 
             return texto_respuesta
 
         except Exception as e:
-            logging.error(f"Error con gpt-4o-mini: {str(e)}")
+            logger.error("Error con gpt-4o-mini: %s", e)
             return '{"es_valido": false, "mensaje": "Ups, algo falló al validar el reclamo."}'
\ No newline at end of file
@@ -2,54 +2,71 @@
 import logging
 from datetime import datetime
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+from app.services.facturas_cache import CacheFacturas
+
+logger = logging.getLogger(__name__)
+
+def formatear_factura(dato: dict) -> dict:
+    """Convierte una fila de FACTURAS de PR_CAU al formato que se devuelve a los canales."""
+    return {
+        "Nombre": f"{dato['Apellido']} {dato['Nombre']}".strip() or "Usuario Desconocido",
+        "DNI": dato["Dni"],
+        "CodigoSuministro": dato["CodigoSuministro"] if dato["CodigoSuministro"] else "No disponible",
+        "NumeroComprobante": dato["NumeroComprobante"] if dato["NumeroComprobante"] else "No disponible",
+        "FechaEmision": (dato["FechaEmision"].strftime("%d/%m/%Y")
+                         if dato["FechaEmision"] and isinstance(dato["FechaEmision"], datetime)
+                         else "No disponible"),
+        "Estado": "Pagada" if dato["EstadoFactura"] == "P" else "Pendiente",
+        "Total": float(dato["TotalFactura"]) if dato["TotalFactura"] is not None else 0.0,
+        "Vencimiento": (dato["VencimientoFactura"].strftime("%d/%m/%Y")
+                        if dato["VencimientoFactura"] and isinstance(dato["VencimientoFactura"], datetime)
+                        else "No disponible"),
+        "ObservacionPostal": dato["ObservacionPostal"] if dato["ObservacionPostal"] else "No disponible",
+        "Barrio": dato["Barrio"] if dato["Barrio"] else "No disponible",
+        "Calle": dato["Calle"] if dato["Calle"] else "No disponible",
+        "NumeroMedidor": dato["NumeroMedidor"] if dato["NumeroMedidor"] else "No disponible",
+        "Periodo": dato["Periodo"] if dato["Periodo"] else "No disponible",
+        "Consumo": float(dato["Consumo"]) if dato["Consumo"] is not None else 0.0
+    }
+
 
 class ConsultarFacturasService:
-    def __init__(self, usuario_repository):
+    def __init__(self, usuario_repository, redis_client=None):
         self.usuario_repository = usuario_repository
+        self.cache = CacheFacturas(redis_client) if redis_client is not None else None
 
-    def ejecutar(self, dni: str):
+    def ejecutar(self, dni: str, latest_only: bool = False):
+        """
+        Devuelve las facturas del DNI, la más reciente primero. Con `latest_only`
+        devuelve solo la última (es la única que muestran los bots).
+        """
         try:
+            if self.cache:
+                facturas = self.cache.leer(dni, latest_only)
+                if facturas is not None:
+                    logger.debug("Facturas del DNI %s servidas desde caché", dni)
+                    return self._respuesta(facturas)
+
             datos = self.usuario_repository.obtener_de_db1(dni)
             if not datos:
-                logging.warning(f"No se encontraron datos para el DNI {dni} en PR_CAU")
+                logger.warning("No se encontraron datos para el DNI %s en PR_CAU", dni)
                 return {"mensaje": "No se encontraron datos para ese DNI"}, 404
 
-            # Verificar si el cliente existe pero no tiene facturas
-            if not any(dato.get("NumeroComprobante") for dato in datos):
-                logging.info(f"Cliente con DNI {dni} encontrado, pero no tiene facturas")
-                return {"facturas": [], "mensaje": "No tienes facturas registradas"}, 200
-
-            # Formatear la información de las facturas
-            facturas = []
-            for dato in datos:
-                if not dato.get("NumeroComprobante"):  # Saltar filas sin factura
-                    continue
-                factura_info = {
-                    "Nombre": f"{dato['Apellido']} {dato['Nombre']}".strip() or "Usuario Desconocido",
-                    "DNI": dato["Dni"],
-                    "CodigoSuministro": dato["CodigoSuministro"] if dato["CodigoSuministro"] else "No disponible",
-                    "NumeroComprobante": dato["NumeroComprobante"] if dato["NumeroComprobante"] else "No disponible",
-                    "FechaEmision": (dato["FechaEmision"].strftime("%d/%m/%Y")
-                                     if dato["FechaEmision"] and isinstance(dato["FechaEmision"], datetime)
-                                     else "No disponible"),
-                    "Estado": "Pagada" if dato["EstadoFactura"] == "P" else "Pendiente",
-                    "Total": float(dato["TotalFactura"]) if dato["TotalFactura"] is not None else 0.0,
-                    "Vencimiento": (dato["VencimientoFactura"].strftime("%d/%m/%Y")
-                                    if dato["VencimientoFactura"] and isinstance(dato["VencimientoFactura"], datetime)
-                                    else "No disponible"),
-                    "ObservacionPostal": dato["ObservacionPostal"] if dato["ObservacionPostal"] else "No disponible",
-                    "Barrio": dato["Barrio"] if dato["Barrio"] else "No disponible",
-                    "Calle": dato["Calle"] if dato["Calle"] else "No disponible",
-                    "NumeroMedidor": dato["NumeroMedidor"] if dato["NumeroMedidor"] else "No disponible",
-                    "Periodo": dato["Periodo"] if dato["Periodo"] else "No disponible",
-                    "Consumo": float(dato["Consumo"]) if dato["Consumo"] is not None else 0.0
-                }
-                facturas.append(factura_info)
-
-            logging.info(f"Facturas encontradas para el DNI {dni}: {len(facturas)}")
-            return {"facturas": facturas}, 200
+            # Formatear la información de las facturas (se saltean las filas sin factura)
+            facturas = [formatear_factura(dato) for dato in datos if dato.get("NumeroComprobante")]
+            if self.cache:
+                self.cache.guardar(dni, facturas)
+
+            logger.info("Facturas encontradas para el DNI %s: %s", dni, len(facturas))
+            return self._respuesta(facturas[:1] if latest_only else facturas)
 
         except Exception as e:
-            logging.error(f"Error al consultar factura para el DNI {dni}: {str(e)}")
-            return {"error": "Error al consultar las facturas", "detalle": str(e)}, 500
\ No newline at end of file
+            logger.error("Error al consultar factura para el DNI %s: %s", dni, e)
+            return {"error": "Error al consultar las facturas", "detalle": str(e)}, 500
+
+    @staticmethod
+    def _respuesta(facturas: list):
+        # Cliente existente pero sin facturas
+        if not facturas:
+            return {"facturas": [], "mensaje": "No tienes facturas registradas"}, 200
+        return {"facturas": facturas}, 200
@@ -2,6 +2,8 @@
 from app.repositories.sqlalchemy_reclamo_repository import SQLAlchemyReclamoRepository
 import logging
 
+logger = logging.getLogger(__name__)
+
 class ConsultarReclamoService:
     def __init__(self, reclamo_repository: SQLAlchemyReclamoRepository):
         self.reclamo_repository = reclamo_repository
@@ -11,10 +13,10 @@ class ConsultarReclamoService:
         try:
             reclamo = self.reclamo_repository.obtener_por_id(id_reclamo)
             if not reclamo:
-                logging.warning(f"Reclamo con ID {id_reclamo} no encontrado")
+                logger.warning("Reclamo con ID %s no encontrado", id_reclamo)
                 return {"error": "Reclamo no encontrado"}, 404
 
-            logging.info(f"Reclamo con ID {id_reclamo} encontrado")
+            logger.info("Reclamo con ID %s encontrado", id_reclamo)
             return {
                 "reclamo": reclamo.to_dict(),
                 "cliente": {
@@ -28,5 +30,5 @@ class ConsultarReclamoService:
             }, 200
 
         except Exception as e:
-            logging.error(f"Error al consultar el reclamo {id_reclamo}: {str(e)}")
+            logger.error("Error al consultar el reclamo %s: %s", id_reclamo, e)
             return {"error": "Error al consultar el reclamo", "detalle": str(e)}, 500
\ No newline at end of file
@@ -0,0 +1,111 @@
+# app/services/conversacion_lock.py
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+
+from app.config.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Libera la clave solo si el token sigue siendo el nuestro (no borra un lease ajeno ya renovado).
+LIBERAR_LEASE_LUA = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# Extiende el vencimiento solo si el lease sigue siendo el nuestro.
+RENOVAR_LEASE_LUA = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class LeaseOcupado(Exception):
+    """Otro worker tiene el lease del usuario y no lo soltó dentro de la espera."""
+
+
+class BloqueoConversaciones:
+    """
+    Serializa los mensajes de un mismo usuario sin frenar a los demás.
+
+    Dentro del proceso se usa un asyncio.Lock por usuario, que se elimina del mapa
+    cuando nadie lo está esperando. Entre workers se toma además un lease en Redis
+    (SET NX PX) con vencimiento, para que un worker caído no bloquee la conversación.
+    Mientras el turno corre, un hilo renueva el lease cada tercio del TTL: desde un
+    hilo, y no como tarea de asyncio, para que siga latiendo aunque el turno bloquee
+    el loop con una llamada síncrona (consultas SQL con la sesión del adaptador). Si
+    no se obtiene dentro de la espera se lanza LeaseOcupado y el turno no se procesa.
+    """
+
+    def __init__(self, redis_client=None, ttl_ms: int = None, espera_ms: int = None):
+        self.redis_client = redis_client
+        self.ttl_ms = ttl_ms if ttl_ms is not None else Config.CONVERSACION_LOCK_TTL_MS
+        self.espera_ms = espera_ms if espera_ms is not None else Config.CONVERSACION_LOCK_ESPERA_MS
+        self._locks = {}
+        self._liberar_script = redis_client.register_script(LIBERAR_LEASE_LUA) if redis_client is not None else None
+        self._renovar_script = redis_client.register_script(RENOVAR_LEASE_LUA) if redis_client is not None else None
+
+    @asynccontextmanager
+    async def para(self, user_id: str):
+        entrada = self._locks.setdefault(user_id, [asyncio.Lock(), 0])
+        entrada[1] += 1
+        try:
+            async with entrada[0]:
+                token = await self._tomar_lease(user_id)
+                detener_latido = threading.Event()
+                if token:
+                    threading.Thread(target=self._renovar_lease, args=(user_id, token, detener_latido),
+                                     name=f"lease-{user_id}", daemon=True).start()
+                try:
+                    yield
+                finally:
+                    detener_latido.set()
+                    if token:
+                        self._soltar_lease(user_id, token)
+        finally:
+            entrada[1] -= 1
+            if entrada[1] == 0 and self._locks.get(user_id) is entrada:
+                del self._locks[user_id]
+
+    def locks_activos(self) -> int:
+        return len(self._locks)
+
+    async def _tomar_lease(self, user_id: str):
+        if self.redis_client is None:
+            return None
+        clave = f"user:{user_id}:lock"
+        token = uuid.uuid4().hex
+        limite = time.monotonic() + self.espera_ms / 1000
+        pausa = 0.01
+        while True:
+            if self.redis_client.set(clave, token, nx=True, px=self.ttl_ms):
+                return token
+            if time.monotonic() >= limite:
+                logger.warning("⚠️ No se obtuvo el lease de %s en %s ms, no se procesa el mensaje", clave, self.espera_ms)
+                raise LeaseOcupado(clave)
+            await asyncio.sleep(pausa)
+            pausa = min(pausa * 2, 0.2)
+
+    def _renovar_lease(self, user_id: str, token: str, detener: threading.Event):
+        """Latido del lease (en su propio hilo) hasta que termina el turno o se pierde el lease."""
+        clave = f"user:{user_id}:lock"
+        while not detener.wait(self.ttl_ms / 3000):
+            try:
+                if not self._renovar_script(keys=[clave], args=[token, self.ttl_ms]):
+                    logger.error("❌ Se perdió el lease de %s durante el turno", clave)
+                    return
+            except Exception as e:
+                logger.error("Error al renovar lease de %s: %s", user_id, e)
+
+    def _soltar_lease(self, user_id: str, token: str):
+        try:
+            self._liberar_script(keys=[f"user:{user_id}:lock"], args=[token])
+        except Exception as e:
+            logger.error("Error al liberar lease de %s: %s", user_id, e)
@@ -0,0 +1,180 @@
+# app/services/conversacion_mensajes.py
+"""
+Catálogos de textos usados por ConversacionService.
+
+Cada canal elige el catálogo que mejor renderiza: MENSAJES_MARKDOWN para Telegram
+y WhatsApp (formato *negrita* / _cursiva_) y MENSAJES_TEXTO_PLANO para Chattigo.
+Todas las claves deben existir en ambos catálogos.
+"""
+
+MENSAJES_MARKDOWN = {
+    "cancelado": "✅ *Proceso detenido*\n\n_¿En qué puedo ayudarte ahora?_\nPuedo asistirte con:\n- *Reclamos*\n- *Datos*\n- *Consultas*\n- *Facturas*",
+    "sin_proceso": "ℹ️ *No hay ningún proceso activo*\n\n_¿Cómo puedo ayudarte hoy?_\nPuedo asistirte con:\n- *Reclamos*\n- *Actualizar datos*\n- *Consultas*\n- *Facturas*",
+    "no_entendi": "🤔 *No entendí bien tu mensaje*\n\n_¿Cómo puedo ayudarte hoy?_\nPuedo asistirte con:\n- *Reclamos*\n- *Actualizar datos*\n- *Consultar estados*\n- *Ver tu factura*",
+    "opcion_no_reconocida": "❌ *Opción no reconocida*\n\n_Por favor, elige una de las siguientes:_\n*calle* | *barrio* | *celular* | *correo*\n\n_O di *cancelar* para salir_",
+    "dato_seleccionado": "✅ *¡Entendido!* Quieres actualizar tu _{dato}_\n\n_Por favor, indícame tu DNI_\n_O di *cancelar* para salir_",
+    "dni_invalido": "❌ *DNI no válido*\n\n_Por favor, ingresa solo números_\n_O di *cancelar* para salir_",
+    "confirmar_nombre": "👤 ¿Eres *{nombre}*?\n\n_Responde *sí* o *no* para confirmar_\n_O di *cancelar* para salir_",
+    "dni_no_encontrado": "🔍 *No encontré a nadie con ese DNI*\n\n_Por favor, verifica el número e inténtalo de nuevo_\n_O di *cancelar* para salir_",
+    "responder_si_no": "ℹ️ _Por favor, responde solo *sí* o *no* para confirmar_\n\n_O di *cancelar* para salir_",
+    "dni_incorrecto": "ℹ️ *Entendido, el DNI no es correcto*\n\n_Dime otro cuando quieras o pregunta otra cosa_",
+    "pedir_descripcion": (
+        "✅ *¡Gracias por confirmar, {nombre}!* \n\n"
+        "_Cuéntame qué problema tienes para registrar tu reclamo_\n"
+        "*(Debe estar relacionado con cortes de luz, energía eléctrica o daños por el servicio)*\n\n"
+        "_O di *cancelar* para salir_"
+    ),
+    "lista_reclamos": (
+        "✅ *Gracias, {nombre}*\n\n"
+        "_Aquí están tus últimos 5 reclamos:_\n{reclamos}\n\n"
+        "_Si quieres detalles de uno, dime su ID_\n_O di *cancelar* para salir_"
+    ),
+    "linea_reclamo": "ID: {id}, Estado: {estado}, Descripción: {descripcion}",
+    "sin_reclamos_recientes": "No tienes reclamos registrados recientemente.",
+    "reclamos_no_disponibles": "No pude obtener tus reclamos. Intenta de nuevo.",
+    "sin_reclamos_dni": "🔍 *No encontré reclamos para tu DNI*\n\n_Verifica e intenta de nuevo_\n_O di *cancelar* para salir_",
+    "valor_actual": "✅ *Tu {campo} actual es:*\n*{valor}*\n\n_Dime el nuevo valor para actualizarlo_\n_O di *cancelar* para salir_",
+    "sin_facturas": "🔍 *No encontré facturas para tu DNI*\n\n_Verifica e intenta de nuevo_\n_O di *cancelar* para salir_",
+    "factura": (
+        "✅ *Factura de {nombre}* _(DNI: {dni})_\n\n"
+        "📋 *Número de cuenta*: _{cuenta}_\n"
+        "📄 *N° Comprobante*: _{comprobante}_\n"
+        "📅 *Fecha Emisión*: _{emision}_\n"
+        "✅ *Estado*: _{estado}_\n"
+        "💰 *Total*: _{total}_\n"
+        "⏰ *Vencimiento*: _{vencimiento}_\n"
+        "🏠 *Dirección*: _{calle}, {barrio}_\n"
+        "⚡ *Medidor*: _{medidor}_\n"
+        "📆 *Período*: _{periodo}_\n"
+        "🔋 *Consumo*: _{consumo} kWh_\n\n"
+        "_Para ver todas tus facturas, visita:_ https://frontdecsa.vercel.app/\n\n"
+        "*¿En qué más puedo ayudarte?*"
+    ),
+    "error_factura": "❌ *No pude mostrar tu factura*\n\n_Error:_ _{error}_\n\n_Intenta de nuevo o di *cancelar* para salir_",
+    "factura_no_encontrada": "🔍 *No encontré tu factura*\n\n_Verifica el DNI e intenta de nuevo_\n_O di *cancelar* para salir_",
+    "descripcion_corta": (
+        "ℹ️ *Necesito más detalles*\n\n_Describe el problema con al menos 3 caracteres_\n"
+        "*(Relacionado con cortes de luz, energía eléctrica o daños por el servicio)*\n\n"
+        "_O di *cancelar* para salir_"
+    ),
+    "reclamo_invalido": (
+        "❌ *No parece un reclamo válido*\n\n_{mensaje}_\n\n"
+        "_Por favor, describe un problema relacionado con cortes de luz, energía eléctrica o daños por el servicio_\n"
+        "_O di *cancelar* para salir_"
+    ),
+    "detalle_reclamo": (
+        "✅ *Detalles del reclamo ID {id}:*\n\n"
+        "- *Descripción*: _{descripcion}_\n"
+        "- *Estado*: _{estado}_\n"
+        "- *Fecha de Reclamo*: _{fecha}_\n"
+        "- *Cliente*: _{nombre} (DNI: {dni})_\n"
+        "- *Dirección*: _{direccion}_"
+    ),
+    "reclamo_no_encontrado": "🔍 *No encontré ese reclamo*\n\n_Intenta con otro ID_\n_O di *cancelar* para salir_",
+    "pedir_id_reclamo": "ℹ️ *Por favor, dame un ID de reclamo*\n\n_(Solo números)_\n_O di *cancelar* para salir_",
+    "reclamo_registrado": (
+        "✅ *¡Listo, {nombre}!* Tu reclamo está registrado\n\n"
+        "*ID*: _{id}_\n"
+        "*Estado*: _Pendiente_\n"
+        "*Resumen*: _{descripcion}_\n\n"
+        "_¿En qué más puedo ayudarte?_"
+    ),
+    "reclamo_no_registrado": "❌ *Lo siento, no pude registrar tu reclamo*\n\n_¿Intentamos de nuevo?_",
+    "reclamo_duplicado": (
+        "📌 *Ya tenemos ese reclamo registrado, {nombre}*\n\n"
+        "*ID*: _{id}_\n"
+        "*Estado*: _{estado}_\n"
+        "*Fecha*: _{fecha}_\n\n"
+        "_No hace falta registrarlo de nuevo_"
+    ),
+    "reclamo_en_corte": (
+        "⚡ *Ya sabemos del corte en {barrio}, {nombre}*\n\n"
+        "Sumamos tu reclamo al incidente *#{id}*, con *{afectados}* vecinos afectados. "
+        "Nuestras cuadrillas ya están trabajando para reponer el servicio.\n\n"
+        "_No hace falta que vuelvas a reclamar_"
+    ),
+    "actualizacion_exitosa": (
+        "✅ *¡Actualización exitosa, {nombre}!*\n\n"
+        "✔️ *Datos actualizados:*\n"
+        "📛 *Nombre*: _{nombre_completo}_\n"
+        "📍 *Calle*: _{calle}_\n"
+        "🏘️ *Barrio*: _{barrio}_\n"
+        "📱 *Teléfono*: _{celular}_\n"
+        "✉️ *Correo*: _{email}_\n\n"
+        "_¿En qué más puedo ayudarte?_"
+    ),
+    "actualizacion_sin_datos": "✅ *Actualización exitosa*\n\n_No pude recuperar tus datos actualizados_\n\n_¿En qué más puedo ayudarte?_",
+    "actualizacion_fallida": "❌ *No pude actualizar eso ahora*\n\n_¿Probamos otra vez?_",
+    "accion_desconocida": "❓ *Algo salió mal*\n\n_¿Cómo puedo ayudarte ahora?_",
+    "menu_final": "ℹ️ *¿En qué más puedo ayudarte?*\n\n_Puedo asistirte con:_\n- *Reclamos*\n- *Datos*\n- *Consultas*\n- *Facturas*",
+    "conversacion_ocupada": "⏳ *Todavía estoy procesando tu mensaje anterior*\n\n_Enviame este de nuevo en unos segundos_",
+    "error_general": "❌ *Uy, algo falló*\n\n_Error:_ _{error}_\n\n_Intentemos de nuevo o di *cancelar* para salir_",
+}
+
+MENSAJES_TEXTO_PLANO = {
+    "cancelado": "✅ Entendido, he detenido el proceso. ¿En qué puedo ayudarte ahora? Puedo asistirte con reclamos, actualizar datos, consultar estados o facturas.",
+    "sin_proceso": "No hay ningún proceso activo para cancelar. ¿En qué puedo ayudarte hoy? Puedo asistirte con reclamos, actualizar datos, consultar estados o facturas.",
+    "no_entendi": "No entendí bien tu mensaje. ¿En qué puedo ayudarte hoy? Puedes decirme si quieres hacer un reclamo, actualizar datos, consultar algo o ver tu factura.",
+    "opcion_no_reconocida": "No reconocí eso. Por favor, dime 'calle', 'barrio', 'celular' o 'correo'. Di 'cancelar' o 'salir' para detener el proceso.",
+    "dato_seleccionado": "Entendido, quieres actualizar tu {dato}. Por favor, dame tu DNI para continuar. Di 'cancelar' o 'salir' para detener el proceso.",
+    "dni_invalido": "Eso no parece un DNI válido. Por favor, ingresa solo números. Di 'cancelar' o 'salir' para detener el proceso.",
+    "confirmar_nombre": "¿Eres {nombre}? Dime 'sí' o 'no' para confirmar. Di 'cancelar' o 'salir' para detener el proceso.",
+    "dni_no_encontrado": "No encontré a nadie con ese DNI. Verifica el número e inténtalo de nuevo. Di 'cancelar' o 'salir' para detener el proceso.",
+    "responder_si_no": "Por favor, dime 'sí' o 'no' para confirmar. Di 'cancelar' o 'salir' para detener el proceso.",
+    "dni_incorrecto": "Entendido, parece que el DNI no es correcto. Dime otro cuando quieras.",
+    "pedir_descripcion": "Gracias por confirmar, {nombre}. Cuéntame qué problema tienes para registrar tu reclamo. Debe estar relacionado con cortes de luz, energía eléctrica o daños por el servicio. Di 'cancelar' o 'salir' para detener el proceso.",
+    "lista_reclamos": "Gracias, {nombre}. Aquí están tus últimos 5 reclamos:\n{reclamos}\nSi quieres detalles de uno, dime su ID. Di 'cancelar' o 'salir' para detener el proceso.",
+    "linea_reclamo": "ID: {id}, Estado: {estado}, Descripción: {descripcion}",
+    "sin_reclamos_recientes": "No tienes reclamos registrados recientemente.",
+    "reclamos_no_disponibles": "No pude obtener tus reclamos. Intenta de nuevo.",
+    "sin_reclamos_dni": "No encontré reclamos para tu DNI. Verifica e intenta de nuevo. Di 'cancelar' o 'salir' para detener el proceso.",
+    "valor_actual": "Tu {campo} actual es: {valor}. Dime el nuevo valor para actualizarlo. Di 'cancelar' o 'salir' para detener el proceso.",
+    "sin_facturas": "No encontré facturas para tu DNI. Verifica e intenta de nuevo.",
+    "factura": (
+        "Gracias, {nombre}. Esta es tu última factura (DNI: {dni}):\n"
+        "- Número de cuenta: {cuenta}\n"
+        "- N° Comprobante: {comprobante}\n"
+        "- Fecha Emisión: {emision}\n"
+        "- Estado: {estado}\n"
+        "- Total: {total}\n"
+        "- Vencimiento: {vencimiento}\n"
+        "- Dirección: {calle}, {barrio}\n"
+        "- Medidor: {medidor}\n"
+        "- Período: {periodo}\n"
+        "- Consumo: {consumo} kWh\n\n"
+        "Para ver todas tus facturas, visita: https://frontdecsa.vercel.app/\n\n"
+        "¿En qué más puedo ayudarte?"
+    ),
+    "error_factura": "No pude mostrar tu factura ({error}). Intenta de nuevo o di 'cancelar' para salir.",
+    "factura_no_encontrada": "No encontré tu factura. Verifica el DNI e intenta de nuevo.",
+    "descripcion_corta": "Por favor, dame más detalles (al menos 3 caracteres). Debe estar relacionado con cortes de luz, energía eléctrica o daños por el servicio. Di 'cancelar' o 'salir' para detener el proceso.",
+    "reclamo_invalido": "No parece un reclamo válido: {mensaje}. Por favor, describe un problema relacionado con cortes de luz, energía eléctrica o daños por el servicio. Di 'cancelar' o 'salir' para detener el proceso.",
+    "detalle_reclamo": (
+        "Detalles del reclamo ID {id}:\n"
+        "- Descripción: {descripcion}\n"
+        "- Estado: {estado}\n"
+        "- Fecha de Reclamo: {fecha}\n"
+        "- Cliente: {nombre} (DNI: {dni})\n"
+        "- Dirección: {direccion}"
+    ),
+    "reclamo_no_encontrado": "No encontré ese reclamo. Intenta con otro ID. Di 'cancelar' o 'salir' para detener el proceso.",
+    "pedir_id_reclamo": "Por favor, dame un ID de reclamo (solo números). Di 'cancelar' o 'salir' para detener el proceso.",
+    "reclamo_registrado": "Listo, {nombre}. Tu reclamo está registrado con ID: {id}, Estado: Pendiente. Resumen: {descripcion}",
+    "reclamo_no_registrado": "Lo siento, no pude registrar tu reclamo ahora. ¿Intentamos de nuevo?",
+    "reclamo_duplicado": "{nombre}, ya tenemos ese reclamo registrado con ID: {id}, Estado: {estado}, Fecha: {fecha}. No hace falta registrarlo de nuevo.",
+    "reclamo_en_corte": "Ya sabemos del corte en {barrio}, {nombre}. Sumamos tu reclamo al incidente #{id}, con {afectados} vecinos afectados. Nuestras cuadrillas ya están trabajando para reponer el servicio; no hace falta que vuelvas a reclamar.",
+    "actualizacion_exitosa": (
+        "✅ ¡Actualización exitosa, {nombre}!\n\n✔️ Datos actualizados:\n"
+        "📛 Nombre: {nombre_completo}\n"
+        "📍 Calle: {calle}\n"
+        "🏘️ Barrio: {barrio}\n"
+        "📱 Teléfono: {celular}\n"
+        "✉️ Correo: {email}"
+    ),
+    "actualizacion_sin_datos": "Actualización exitosa, pero no pude recuperar tus datos actualizados.",
+    "actualizacion_fallida": "No pude actualizar eso ahora. ¿Probamos otra vez?",
+    "accion_desconocida": "Algo salió mal. ¿En qué más puedo ayudarte?",
+    "menu_final": "¿Necesitas algo más? Puedo ayudarte con un reclamo, actualizar datos, consultar estados o facturas.",
+    "conversacion_ocupada": "Todavía estoy procesando tu mensaje anterior. Enviame este de nuevo en unos segundos.",
+    "error_general": "Uy, algo falló: {error}. Intentemos de nuevo.",
+}
@@ -0,0 +1,575 @@
+# app/services/conversacion_service.py
+import asyncio
+import json
+import logging
+import re
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.services.conversacion_lock import BloqueoConversaciones, LeaseOcupado
+from app.services.conversacion_mensajes import MENSAJES_MARKDOWN
+from app.utils import tracing
+from app.utils.memo_turno import memo_turno
+from app.utils.text_processor import preprocess_text
+
+logger = logging.getLogger(__name__)
+
+# Firma común que cada adaptador de canal entrega para responder al usuario.
+Enviar = Callable[[str], Awaitable[Any]]
+
+PALABRAS_CANCELAR = ("cancelar", "salir")
+OPCIONES_ACTUALIZAR = {
+    "calle": "CALLE", "barrio": "BARRIO", "celular": "CELULAR",
+    "teléfono": "CELULAR", "correo": "EMAIL", "mail": "EMAIL",
+}
+TRANSICIONES_INTENCION = {
+    "Reclamo": {"fase": "pedir_dni", "accion": "reclamo"},
+    "Actualizar": {"fase": "seleccionar_dato"},
+    "Consultar": {"fase": "pedir_dni", "accion": "consultar"},
+    "ConsultarFacturas": {"fase": "pedir_dni", "accion": "consultar_facturas"},
+}
+CAMPOS_PROCESO = ("dni", "accion", "nombre", "campo_actualizar", "descripcion", "valor_actualizar")
+_SOLO_NUMEROS = re.compile(r'^\d+$')
+
+
+class EstadoConversacion:
+    """Estado de una conversación: se lee una vez por turno y los cambios se escriben juntos al final."""
+
+    def __init__(self, clave: str, datos: Optional[dict]):
+        self.clave = clave
+        self.datos = dict(datos) if datos else {"fase": "inicio"}
+        self._cambios: Dict[str, str] = {}
+        self._borrados = set()
+
+    @property
+    def fase(self) -> str:
+        return self.datos.get("fase", "inicio")
+
+    def get(self, campo: str, default=None):
+        return self.datos.get(campo, default)
+
+    def set(self, **campos):
+        for campo, valor in campos.items():
+            self.datos[campo] = valor
+            self._cambios[campo] = valor
+            self._borrados.discard(campo)
+
+    def borrar(self, *campos):
+        for campo in campos:
+            self.datos.pop(campo, None)
+            self._cambios.pop(campo, None)
+            self._borrados.add(campo)
+
+    def descartar_cambios(self):
+        self._cambios.clear()
+        self._borrados.clear()
+
+    def guardar(self, redis_client):
+        if not self._cambios and not self._borrados:
+            return
+        pipe = redis_client.pipeline(transaction=True)
+        if self._borrados:
+            pipe.hdel(self.clave, *self._borrados)
+        if self._cambios:
+            pipe.hset(self.clave, mapping=self._cambios)
+        pipe.execute()
+        self.descartar_cambios()
+
+
+class Turno:
+    """Datos de un mensaje entrante mientras recorre las fases."""
+
+    def __init__(self, user_id: str, texto: str, historial: str, estado: EstadoConversacion, enviar: Enviar):
+        self.user_id = user_id
+        self.texto = texto
+        self.historial = historial
+        self.estado = estado
+        self.enviar = enviar
+        self._texto_preprocesado = None
+
+    @property
+    def texto_preprocesado(self) -> str:
+        if self._texto_preprocesado is None:
+            self._texto_preprocesado = preprocess_text(self.texto)
+        return self._texto_preprocesado
+
+
+class ConversacionService:
+    """
+    Máquina de estados de la conversación del bot, independiente del canal.
+
+    Cada fase tiene su manejador en una tabla de despacho. Un manejador devuelve True
+    cuando la fase siguiente debe ejecutarse en el mismo turno (por ejemplo, de
+    solicitar_descripcion a validar_reclamo); el estado se persiste una sola vez al final.
+    """
+
+    def __init__(
+        self,
+        detectar_intencion_service,
+        validar_reclamo_service,
+        reclamo_service,
+        actualizar_service,
+        consulta_estado_service,
+        consulta_reclamo_service,
+        consultar_facturas_service,
+        redis_client,
+        mensajes: dict = None,
+        patron_dni: str = r'^\d+$',
+        observador_fase: Callable[[str, float], None] = None,
+        bloqueo: BloqueoConversaciones = None,
+        buscar_cliente_service=None,
+        prefetch=None,
+        detector_cortes=None
+    ):
+        self.detectar_intencion_service = detectar_intencion_service
+        self.validar_reclamo_service = validar_reclamo_service
+        self.reclamo_service = reclamo_service
+        self.actualizar_service = actualizar_service
+        self.usuario_repository = actualizar_service.usuario_repository
+        self.consulta_estado_service = consulta_estado_service
+        self.consulta_reclamo_service = consulta_reclamo_service
+        self.consultar_facturas_service = consultar_facturas_service
+        self.redis_client = redis_client
+        self.mensajes = mensajes or MENSAJES_MARKDOWN
+        self.patron_dni = re.compile(patron_dni)
+        self.observador_fase = observador_fase
+        self.bloqueo = bloqueo or BloqueoConversaciones(redis_client)
+        self.buscar_cliente_service = buscar_cliente_service
+        self.prefetch = prefetch
+        self.detector_cortes = detector_cortes
+        self.fases = {
+            "inicio": self._fase_inicio,
+            "seleccionar_dato": self._fase_seleccionar_dato,
+            "pedir_dni": self._fase_pedir_dni,
+            "confirmar_dni": self._fase_confirmar_dni,
+            "solicitar_descripcion": self._fase_solicitar_descripcion,
+            "validar_reclamo": self._fase_validar_reclamo,
+            "consultar_reclamos": self._fase_consultar_reclamos,
+            "confirmar_actualizacion": self._fase_confirmar_actualizacion,
+            "ejecutar_accion": self._fase_ejecutar_accion,
+        }
+
+    # === Punto de entrada ===
+
+    async def procesar(self, user_id: str, texto: str, enviar: Enviar):
+        """
+        Procesa un mensaje de texto del usuario y responde a través de `enviar`.
+        Los mensajes de un mismo usuario se atienden de a uno, en orden de llegada.
+        """
+        with tracing.span("conversacion.turno"):
+            try:
+                async with self.bloqueo.para(user_id):
+                    # Las lecturas de repositorio se comparten entre las fases y servicios del turno
+                    with memo_turno():
+                        await self._procesar_turno(user_id, texto, enviar)
+            except LeaseOcupado:
+                # Otro worker sigue con el turno anterior: procesar este sin el lease duplicaría validaciones o altas
+                await enviar(self._msg("conversacion_ocupada"))
+
+    async def _procesar_turno(self, user_id: str, texto: str, enviar: Enviar):
+        texto_usuario = texto.strip().lower()
+        historial_clave = f"user:{user_id}:historial"
+        estado = EstadoConversacion(f"user:{user_id}:estado", None)
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.rpush(historial_clave, f"Usuario: {texto_usuario}")
+            pipe.lrange(historial_clave, -5, -1)
+            pipe.hgetall(estado.clave)
+            _, ultimos, datos_estado = pipe.execute()
+
+            estado = EstadoConversacion(estado.clave, datos_estado)
+            turno = Turno(user_id, texto_usuario, " | ".join(ultimos or []), estado, enviar)
+            logger.debug("Estado actual de %s: %s", user_id, estado.datos)
+
+            if texto_usuario in PALABRAS_CANCELAR:
+                await self._cancelar(turno)
+            else:
+                await self._despachar(turno)
+            estado.guardar(self.redis_client)
+        except Exception as e:
+            logger.error("Error en handle_message: %s", e)
+            estado.descartar_cambios()
+            estado.set(fase="inicio")
+            await enviar(self._msg("error_general", error=str(e)))
+            estado.guardar(self.redis_client)
+
+    def reiniciar(self, user_id: str):
+        """Borra historial y estado del usuario (comandos /start y /reset)."""
+        self.redis_client.delete(f"user:{user_id}:historial", f"user:{user_id}:estado")
+        if self.prefetch:
+            self.prefetch.descartar(user_id)
+
+    async def _despachar(self, turno: Turno):
+        continuar = True
+        while continuar:
+            fase = turno.estado.fase
+            manejador = self.fases.get(fase)
+            if manejador is None:
+                logger.warning("Fase desconocida '%s', reiniciando conversación", fase)
+                turno.estado.set(fase="inicio")
+                manejador = self._fase_inicio
+            inicio = time.perf_counter()
+            with tracing.span(f"conversacion.{fase}"):
+                continuar = await manejador(turno)
+            self._observar(fase, time.perf_counter() - inicio)
+
+    def _observar(self, fase: str, duracion: float):
+        logger.debug("Fase %s resuelta en %.3f s", fase, duracion)
+        if self.observador_fase:
+            self.observador_fase(fase, duracion)
+
+    def _msg(self, clave: str, **valores) -> str:
+        plantilla = self.mensajes[clave]
+        return plantilla.format(**valores) if valores else plantilla
+
+    async def _cancelar(self, turno: Turno):
+        if turno.estado.fase != "inicio":
+            turno.estado.borrar(*CAMPOS_PROCESO)
+            turno.estado.set(fase="inicio")
+            if self.prefetch:
+                self.prefetch.descartar(turno.user_id)
+            await turno.enviar(self._msg("cancelado"))
+            logger.info("Proceso cancelado por el usuario")
+        else:
+            await turno.enviar(self._msg("sin_proceso"))
+
+    # === Fases ===
+
+    async def _fase_inicio(self, turno: Turno):
+        # OpenAI fuera del loop: mientras espera la respuesta se atienden los turnos de otros usuarios
+        respuesta_cruda = await asyncio.to_thread(
+            self.detectar_intencion_service.ejecutar_con_historial, turno.texto_preprocesado, turno.historial)
+        try:
+            resultado = json.loads(respuesta_cruda)
+            intencion = resultado.get("intencion", "Conversar")
+            respuesta = resultado.get("respuesta", self._msg("no_entendi"))
+        except (json.JSONDecodeError, TypeError) as e:
+            logger.warning("Error al parsear respuesta: %s, Error: %s", respuesta_cruda, e)
+            intencion = "Conversar"
+            respuesta = self._msg("no_entendi")
+
+        logger.info("Intención detectada: %s", intencion)
+        await turno.enviar(respuesta)
+        transicion = TRANSICIONES_INTENCION.get(intencion)
+        if transicion:
+            turno.estado.set(**transicion)
+
+    async def _fase_seleccionar_dato(self, turno: Turno):
+        campo_actualizar = OPCIONES_ACTUALIZAR.get(turno.texto)
+        if not campo_actualizar:
+            await turno.enviar(self._msg("opcion_no_reconocida"))
+            return
+        turno.estado.set(fase="pedir_dni", accion="actualizar", campo_actualizar=campo_actualizar)
+        await turno.enviar(self._msg("dato_seleccionado", dato=turno.texto))
+
+    async def _fase_pedir_dni(self, turno: Turno):
+        dni = turno.texto
+        if not self.patron_dni.match(dni):
+            await turno.enviar(self._msg("dni_invalido"))
+            return
+        nombre = None
+        if self.buscar_cliente_service is not None:
+            # PR_CAU y DECSA_EXC en paralelo: alcanza con la primera que tenga el nombre
+            resultado = await self.buscar_cliente_service.buscar(dni, preferida="db1", primera_valida=True)
+            nombre = resultado.nombre
+        else:
+            usuario_db1 = self.usuario_repository.obtener_de_db1(dni)
+            if usuario_db1:
+                primer_registro = usuario_db1[0]
+                nombre = f"{primer_registro['Apellido'].strip()} {primer_registro['Nombre'].strip()}"
+            else:
+                usuario_db2 = self.usuario_repository.obtener_por_dni(dni)
+                if usuario_db2:
+                    nombre = usuario_db2.NOMBRE_COMPLETO.strip()
+
+        if nombre:
+            turno.estado.set(fase="confirmar_dni", dni=dni, nombre=nombre)
+            if self.prefetch:
+                # Lo que se muestre tras el "sí" se va leyendo mientras el usuario contesta
+                self.prefetch.programar(turno.user_id, turno.estado.get("accion"), dni, turno.estado.get("campo_actualizar"))
+            await turno.enviar(self._msg("confirmar_nombre", nombre=nombre))
+        else:
+            await turno.enviar(self._msg("dni_no_encontrado"))
+
+    async def _fase_confirmar_dni(self, turno: Turno):
+        if turno.texto not in ("sí", "si", "no"):
+            await turno.enviar(self._msg("responder_si_no"))
+            return
+        if turno.texto == "no":
+            turno.estado.set(fase="inicio")
+            if self.prefetch:
+                self.prefetch.descartar(turno.user_id)
+            await turno.enviar(self._msg("dni_incorrecto"))
+            return
+
+        estado = turno.estado
+        dni = estado.get("dni")
+        accion = estado.get("accion")
+        precargado = None
+        if self.prefetch:
+            precargado = await self.prefetch.tomar(turno.user_id, accion, dni, estado.get("campo_actualizar"))
+        if accion == "reclamo":
+            estado.set(fase="solicitar_descripcion")
+            await turno.enviar(self._msg("pedir_descripcion", nombre=estado.get("nombre")))
+        elif accion == "consultar":
+            estado.set(fase="consultar_reclamos")
+            respuesta, codigo = precargado or self.consulta_estado_service.ejecutar(dni)
+            if codigo == 200:
+                reclamos = self.format_reclamos(respuesta=respuesta)
+                await turno.enviar(self._msg("lista_reclamos", nombre=estado.get("nombre"), reclamos=reclamos))
+            else:
+                await turno.enviar(self._msg("sin_reclamos_dni"))
+                estado.set(fase="inicio")
+        elif accion == "actualizar":
+            campo = estado.get("campo_actualizar")
+            if precargado is not None:
+                valor_actual = precargado["valor"]
+            else:
+                usuario_db2 = self.usuario_repository.obtener_por_dni(dni)
+                valor_actual = getattr(usuario_db2, campo) if usuario_db2 and hasattr(usuario_db2, campo) else None
+            valor_actual = valor_actual if valor_actual is not None else "No disponible"
+            estado.set(fase="confirmar_actualizacion")
+            await turno.enviar(self._msg("valor_actual", campo=campo.lower(), valor=valor_actual))
+        elif accion == "consultar_facturas":
+            await self._responder_facturas(turno, dni, precargado)
+
+    async def _responder_facturas(self, turno: Turno, dni: str, precargado: list = None):
+        estado = turno.estado
+        estado.set(fase="inicio")
+        resultado, status = precargado or self.consultar_facturas_service.ejecutar(dni, latest_only=True)
+        if status != 200:
+            await turno.enviar(self._msg("factura_no_encontrada"))
+            return
+        facturas = resultado.get("facturas", [])
+        if not facturas:
+            await turno.enviar(self._msg("sin_facturas"))
+            return
+        factura = facturas[0]
+        try:
+            mensaje = self._formatear_factura(factura, estado.get("nombre"), dni)
+        except Exception as e:
+            logger.error("Error al formatear la factura: %s", e)
+            await turno.enviar(self._msg("error_factura", error=str(e)))
+            return
+        await turno.enviar(mensaje)
+
+    def _formatear_factura(self, factura: dict, nombre: str, dni: str) -> str:
+        fecha_emision = factura.get('FechaEmision', datetime.now())
+        if isinstance(fecha_emision, datetime):
+            fecha_emision = fecha_emision.strftime('%d/%m/%Y')
+        vencimiento = factura.get('Vencimiento', datetime.now())
+        if isinstance(vencimiento, datetime):
+            vencimiento = vencimiento.strftime('%d/%m/%Y')
+
+        total = factura.get('Total', None)
+        try:
+            total = f"${float(total):.2f}" if total is not None else "No disponible"
+        except (TypeError, ValueError):
+            logger.error("'Total' no convertible a float: %s", total)
+            total = "No disponible"
+
+        return self._msg(
+            "factura",
+            nombre=nombre,
+            dni=dni,
+            cuenta=factura.get('CodigoSuministro', 'No disponible'),
+            comprobante=factura.get('NumeroComprobante', 'No disponible'),
+            emision=fecha_emision,
+            estado=factura.get('Estado', 'No disponible'),
+            total=total,
+            vencimiento=vencimiento,
+            calle=factura.get('Calle', 'No disponible'),
+            barrio=factura.get('Barrio', 'No disponible'),
+            medidor=factura.get('NumeroMedidor', 'No disponible'),
+            periodo=factura.get('Periodo', 'No disponible'),
+            consumo=float(factura.get('Consumo', 0)),
+        )
+
+    async def _fase_solicitar_descripcion(self, turno: Turno):
+        if len(turno.texto.strip()) < 3:
+            await turno.enviar(self._msg("descripcion_corta"))
+            return
+        # Mismo reclamo reenviado (otro canal o de nuevo): se confirma el existente, sin OpenAI ni INSERT
+        duplicado = self.reclamo_service.buscar_duplicado(turno.estado.get("dni"), turno.texto)
+        if duplicado:
+            await turno.enviar(self._msg_duplicado(turno.estado.get("nombre"), duplicado))
+            await turno.enviar(self._msg("menu_final"))
+            turno.estado.set(fase="inicio")
+            turno.estado.borrar("descripcion")
+            return
+        if self.detector_cortes is not None and self.detector_cortes.es_reporte_de_corte(turno.texto):
+            if await self._sumar_a_corte(turno):
+                return
+        siguiente = "validar_reclamo" if self.validar_reclamo_service else "ejecutar_accion"
+        turno.estado.set(fase=siguiente, descripcion=turno.texto)
+        return True
+
+    async def _sumar_a_corte(self, turno: Turno) -> bool:
+        """
+        Si el barrio del cliente está en corte, el reclamo se suma al incidente sin
+        validarlo con el LLM y se inserta en el próximo volcado. Devuelve False si no.
+        """
+        estado = turno.estado
+        dni = estado.get("dni")
+        barrio, suministro = self._ubicacion_cliente(dni)
+        incidente = self.detector_cortes.registrar(barrio, suministro)
+        if incidente is None:
+            return False
+        self.detector_cortes.encolar(incidente, dni, turno.texto)
+        await turno.enviar(self._msg(
+            "reclamo_en_corte", nombre=estado.get("nombre"), barrio=incidente["barrio"],
+            id=incidente["id"], afectados=incidente["afectados"],
+        ))
+        await turno.enviar(self._msg("menu_final"))
+        estado.set(fase="inicio")
+        estado.borrar("descripcion")
+        return True
+
+    def _ubicacion_cliente(self, dni: str):
+        """(barrio, suministro) del cliente; de PR_CAU si todavía no está en DECSA_EXC."""
+        cliente = self.usuario_repository.obtener_por_dni(dni)
+        if cliente is not None:
+            return cliente.BARRIO, cliente.CODIGO_SUMINISTRO or dni
+        filas = self.usuario_repository.obtener_de_db1(dni)
+        if filas:
+            return filas[0].get("Barrio"), filas[0].get("CodigoSuministro") or dni
+        return None, None
+
+    async def _fase_validar_reclamo(self, turno: Turno):
+        descripcion = turno.estado.get("descripcion", "")
+        respuesta_cruda = await asyncio.to_thread(self.validar_reclamo_service.ejecutar, descripcion, turno.historial)
+        try:
+            resultado = json.loads(respuesta_cruda)
+            es_valido = resultado.get("es_valido", False)
+            mensaje_validacion = resultado.get("mensaje", "No se pudo validar el reclamo.")
+        except (json.JSONDecodeError, TypeError) as e:
+            logger.warning("Error al parsear validación: %s, Error: %s", respuesta_cruda, e)
+            es_valido = False
+            mensaje_validacion = "No pude validar tu reclamo debido a un problema técnico."
+
+        if es_valido:
+            turno.estado.set(fase="ejecutar_accion")
+            return True
+        await turno.enviar(self._msg("reclamo_invalido", mensaje=mensaje_validacion))
+        turno.estado.set(fase="solicitar_descripcion")
+
+    async def _fase_consultar_reclamos(self, turno: Turno):
+        if not _SOLO_NUMEROS.match(turno.texto):
+            await turno.enviar(self._msg("pedir_id_reclamo"))
+            return
+        id_reclamo = int(turno.texto)
+        respuesta, codigo = self.consulta_reclamo_service.ejecutar(id_reclamo)
+        if codigo != 200:
+            await turno.enviar(self._msg("reclamo_no_encontrado"))
+            return
+
+        reclamo = respuesta["reclamo"]
+        cliente = respuesta["cliente"]
+        fecha_reclamo = reclamo.get('FECHA_RECLAMO') or 'No disponible'
+        if fecha_reclamo != 'No disponible':
+            try:
+                fecha_reclamo = datetime.fromisoformat(fecha_reclamo.replace('Z', '+00:00')).strftime("%d/%m/%Y %H:%M")
+            except ValueError:
+                fecha_reclamo = "No disponible"
+        calle = cliente.get('direccion', 'No disponible')
+        barrio = cliente.get('barrio', 'No disponible')
+        if calle != 'No disponible' and barrio != 'No disponible':
+            direccion = f"calle {calle}, barrio {barrio}"
+        else:
+            direccion = calle if calle != 'No disponible' else barrio
+
+        await turno.enviar(self._msg(
+            "detalle_reclamo",
+            id=id_reclamo,
+            descripcion=reclamo.get('DESCRIPCION', 'No disponible'),
+            estado=reclamo.get('ESTADO', 'No disponible'),
+            fecha=fecha_reclamo,
+            nombre=cliente.get('nombre', 'No disponible'),
+            dni=cliente.get('dni', 'No disponible'),
+            direccion=direccion,
+        ))
+        turno.estado.set(fase="inicio")
+
+    async def _fase_confirmar_actualizacion(self, turno: Turno):
+        turno.estado.set(fase="ejecutar_accion", valor_actualizar=turno.texto)
+        return True
+
+    async def _fase_ejecutar_accion(self, turno: Turno):
+        estado = turno.estado
+        dni = estado.get("dni")
+        accion = estado.get("accion")
+        nombre = estado.get("nombre")
+
+        if accion == "reclamo":
+            respuesta = self._registrar_reclamo(dni, nombre, estado.get("descripcion", ""))
+        elif accion == "actualizar":
+            respuesta = self._actualizar_dato(dni, nombre, estado.get("campo_actualizar"), estado.get("valor_actualizar", ""))
+        else:
+            respuesta = self._msg("accion_desconocida")
+
+        await turno.enviar(respuesta)
+        await turno.enviar(self._msg("menu_final"))
+        estado.set(fase="inicio")
+        estado.borrar("descripcion", "valor_actualizar")
+
+    def _registrar_reclamo(self, dni: str, nombre: str, descripcion: str) -> str:
+        resultado, status = self.reclamo_service.ejecutar(dni, descripcion, origen="bot")
+        if status == 200 and resultado.get("duplicado"):
+            return self._msg_duplicado(nombre, {"id_reclamo": resultado["id_reclamo"], "estado": resultado["estado"]})
+        if status != 201:
+            return self._msg("reclamo_no_registrado")
+        return self._msg("reclamo_registrado", nombre=nombre, id=resultado["id_reclamo"], descripcion=descripcion)
+
+    def _msg_duplicado(self, nombre: str, duplicado: dict) -> str:
+        fecha = duplicado.get("fecha")
+        return self._msg(
+            "reclamo_duplicado", nombre=nombre, id=duplicado["id_reclamo"], estado=duplicado.get("estado") or "Pendiente",
+            fecha=fecha.strftime("%d/%m/%Y %H:%M") if isinstance(fecha, datetime) else "No disponible",
+        )
+
+    def _actualizar_dato(self, dni: str, nombre: str, campo: str, valor: str) -> str:
+        _, status = self.actualizar_service.ejecutar(dni, {campo: valor})
+        if status != 200:
+            return self._msg("actualizacion_fallida")
+
+        usuario_db2 = self.usuario_repository.obtener_por_dni(dni)
+        if usuario_db2:
+            return self._msg(
+                "actualizacion_exitosa", nombre=nombre, nombre_completo=usuario_db2.NOMBRE_COMPLETO,
+                calle=usuario_db2.CALLE, barrio=usuario_db2.BARRIO, celular=usuario_db2.CELULAR, email=usuario_db2.EMAIL,
+            )
+        usuario_db1 = self.usuario_repository.obtener_de_db1(dni)
+        if usuario_db1:
+            registro = usuario_db1[0]
+            return self._msg(
+                "actualizacion_exitosa", nombre=nombre, nombre_completo=f"{registro['Apellido']} {registro['Nombre']}",
+                calle=registro.get('Calle', 'No disponible'), barrio=registro.get('Barrio', 'No disponible'),
+                celular=registro.get('Telefono', 'No disponible'), email=registro.get('Email', 'No disponible'),
+            )
+        return self._msg("actualizacion_sin_datos")
+
+    # === Formato ===
+
+    def format_reclamos(self, dni=None, respuesta: dict = None):
+        """Arma la lista de reclamos; si ya se consultó en el turno, se pasa `respuesta` y no se vuelve a consultar."""
+        if respuesta is not None:
+            codigo = 200
+        else:
+            respuesta, codigo = self.consulta_estado_service.ejecutar(dni) if dni else (None, 404)
+        if codigo != 200:
+            return self._msg("reclamos_no_disponibles")
+        if "mensaje" in respuesta:
+            return respuesta["mensaje"]
+        reclamos = respuesta.get("reclamos", [])
+        if not reclamos:
+            return self._msg("sin_reclamos_recientes")
+        return "\n".join(
+            self._msg(
+                "linea_reclamo",
+                id=r['ID_RECLAMO'],
+                estado=r['ESTADO'],
+                descripcion=f"{r['DESCRIPCION'][:50]}{'...' if len(r['DESCRIPCION']) > 50 else ''}",
+            )
+            for r in reclamos
+        )
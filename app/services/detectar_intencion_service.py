@@ -1,6 +1,8 @@
 # application/detectar_intencion_chatgpt_usecase.py
 from app.services.chatgpt_service import ChatGPTService
+from app.utils.tracing import trazar_metodos
 
+@trazar_metodos
 class DetectarIntencionService:
     def __init__(self, chatgpt_service: ChatGPTService):
         self.chatgpt_service = chatgpt_service
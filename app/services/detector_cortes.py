@@ -0,0 +1,294 @@
+# app/services/detector_cortes.py
+"""
+Modo corte: absorbe las avalanchas de reclamos "no tengo luz" de un mismo barrio.
+
+Cada descripción que parece un reporte de corte se anota en el zset
+`cortes:barrio:{barrio}` con el suministro del cliente (así un mismo cliente cuenta
+una vez) y la hora como puntaje; se descartan los de más de CORTES_VENTANA_S. Cuando
+el barrio llega a CORTES_UMBRAL suministros, se abre un Incidente (una sola instancia
+lo abre, con SET NX sobre `cortes:activo:{barrio}`) al que se asocian los reclamos
+pendientes del barrio que ya habían entrado y también son reportes de corte.
+
+Mientras el incidente está activo, los reportes siguientes de ese barrio no pasan por
+la validación del LLM ni por un INSERT propio: se responde con el mensaje del corte y
+el reclamo se encola en `cortes:reclamos`. `volcar()` (tarea periódica de la app)
+los inserta por lotes, con un commit por incidente. Un volcado a la vez entre todas
+las instancias (`cortes:volcado:lock`): el lote se mueve con LMOVE a
+`cortes:reclamos:en_proceso` y cada reclamo sale de ahí recién cuando su INSERT se
+confirmó, se descartó o se reencoló. Lo que quede en proceso (instancia caída o
+redeploy a mitad de un volcado) se retoma en el volcado siguiente, antes de tomar
+más de la cola; un corte justo entre el commit y la confirmación puede repetir ese
+reclamo, pero no perderlo. Un reclamo que falla CORTES_VOLCADO_INTENTOS volcados
+pasa a `cortes:reclamos:fallidos` para revisarlo a mano (se reprocesa devolviéndolo
+a `cortes:reclamos`).
+"""
+import asyncio
+import json
+import logging
+import re
+import time
+import unicodedata
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.config.config import Config
+from app.repositories.sqlalchemy_incidente_repository import SQLAlchemyIncidenteRepository
+from app.repositories.sqlalchemy_usuario_repository import SQLAlchemyUsuarioRepository
+from app.services.conversacion_lock import LIBERAR_LEASE_LUA
+from app.utils.metrics import RECLAMOS_CORTE
+
+logger = logging.getLogger(__name__)
+
+CLAVE_COLA = "cortes:reclamos"
+CLAVE_FALLIDOS = "cortes:reclamos:fallidos"
+CLAVE_EN_PROCESO = "cortes:reclamos:en_proceso"
+CLAVE_VOLCADO_LOCK = "cortes:volcado:lock"
+# Holgado frente a lo que tarda un lote; si la instancia cae, vence solo
+_VOLCADO_LOCK_S = 300
+
+# "no tengo luz", "sin luz", "se cortó la luz", "no hay energía", "corte de luz", "está todo apagado"...
+_PATRON_CORTE = re.compile(
+    r"\b(?:sin|no\s+(?:tengo|tenemos|hay|llega|anda)|se\s+(?:corto|fue|cayo))\b.{0,30}"
+    r"\b(?:luz|energia|electricidad|corriente|servicio)\b"
+    r"|\bcorte\s+de\s+(?:luz|energia|servicio)\b"
+    r"|\b(?:todo|barrio|cuadra|zona)\s+(?:esta\s+)?apagad[oa]\b"
+)
+
+
+def _normalizar(texto: str) -> str:
+    sin_tildes = unicodedata.normalize("NFKD", texto or "").encode("ascii", "ignore").decode()
+    return " ".join(sin_tildes.lower().split())
+
+
+def clave_barrio(barrio: str) -> str:
+    return f"cortes:barrio:{_normalizar(barrio)}"
+
+
+def clave_activo(barrio: str) -> str:
+    return f"cortes:activo:{_normalizar(barrio)}"
+
+
+class DetectorCortes:
+    def __init__(self, redis_client, session_factory_db1=None, session_factory_db2=None, ventana_s: int = None,
+                 umbral: int = None, ttl_s: int = None):
+        if session_factory_db1 is None or session_factory_db2 is None:
+            from app.database.database import SessionLocal_db1, SessionLocal_db2
+            session_factory_db1 = session_factory_db1 or SessionLocal_db1
+            session_factory_db2 = session_factory_db2 or SessionLocal_db2
+        self.redis_client = redis_client
+        self.session_factory_db1 = session_factory_db1
+        self.session_factory_db2 = session_factory_db2
+        self.ventana_s = ventana_s or Config.CORTES_VENTANA_S
+        self.umbral = umbral or Config.CORTES_UMBRAL
+        self.ttl_s = ttl_s or Config.CORTES_TTL_S
+        self._tarea_volcado = None
+        self._liberar_lock = redis_client.register_script(LIBERAR_LEASE_LUA)
+
+    @staticmethod
+    def es_reporte_de_corte(descripcion: str) -> bool:
+        return bool(_PATRON_CORTE.search(_normalizar(descripcion)))
+
+    def registrar(self, barrio: str, suministro: str) -> Optional[dict]:
+        """
+        Anota el reporte y devuelve el incidente activo del barrio ({"id", "barrio",
+        "afectados"}), abriéndolo si con este reporte se llegó al umbral; None si el
+        barrio no está en corte.
+        """
+        if not barrio or not suministro:
+            return None
+        ahora = time.time()
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.zadd(clave_barrio(barrio), {suministro: ahora})
+        pipe.zremrangebyscore(clave_barrio(barrio), "-inf", ahora - self.ventana_s)
+        pipe.zcard(clave_barrio(barrio))
+        pipe.expire(clave_barrio(barrio), self.ventana_s)
+        pipe.get(clave_activo(barrio))
+        _, _, afectados, _, activo = pipe.execute()
+        if activo:
+            return {**json.loads(activo), "afectados": afectados}
+        if activo is None and afectados >= self.umbral:
+            return self._abrir(barrio, afectados)
+        # activo == "": otra instancia lo está abriendo; este reclamo sigue el camino normal
+        return None
+
+    def _abrir(self, barrio: str, afectados: int) -> Optional[dict]:
+        if not self.redis_client.set(clave_activo(barrio), "", nx=True, ex=self.ttl_s):
+            return None
+        try:
+            desde = datetime.now() - timedelta(seconds=self.ventana_s)
+            with self.session_factory_db2() as session:
+                incidente = SQLAlchemyIncidenteRepository(session).crear(barrio, desde, self.es_reporte_de_corte)
+                datos = {"id": incidente.ID_INCIDENTE, "barrio": barrio}
+        except Exception as e:
+            self.redis_client.delete(clave_activo(barrio))
+            logger.error("No se pudo abrir el incidente del barrio %s: %s", barrio, e)
+            return None
+        self.redis_client.set(clave_activo(barrio), json.dumps(datos, ensure_ascii=False), ex=self.ttl_s)
+        RECLAMOS_CORTE.inc(resultado="incidente_abierto")
+        logger.warning("⚡ Corte detectado en %s: %s suministros en %ss (incidente %s)",
+                       barrio, afectados, self.ventana_s, datos["id"])
+        return {**datos, "afectados": afectados}
+
+    def encolar(self, incidente: dict, dni: str, descripcion: str):
+        """Deja el reclamo para el próximo volcado y mantiene vivo el incidente."""
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.rpush(CLAVE_COLA, json.dumps({
+            "id_incidente": incidente["id"], "dni": dni, "descripcion": descripcion,
+            "fecha": datetime.now().isoformat(),
+        }, ensure_ascii=False))
+        pipe.expire(clave_activo(incidente["barrio"]), self.ttl_s)
+        pipe.execute()
+        RECLAMOS_CORTE.inc(resultado="absorbido")
+
+    def volcar(self, tamano_lote: int = None) -> int:
+        """
+        Inserta los reclamos encolados (hasta `tamano_lote`), agrupados por incidente.
+        Los clientes que todavía no están en DECSA_EXC se copian de PR_CAU, como en
+        RegistrarReclamoService. Devuelve cuántos reclamos se insertaron (0 si otra
+        instancia está volcando).
+        """
+        token = uuid.uuid4().hex
+        if not self.redis_client.set(CLAVE_VOLCADO_LOCK, token, nx=True, ex=_VOLCADO_LOCK_S):
+            return 0
+        try:
+            return self._volcar(tamano_lote or Config.CORTES_VOLCADO_LOTE)
+        finally:
+            self._liberar_lock(keys=[CLAVE_VOLCADO_LOCK], args=[token])
+
+    def _tomar_lote(self, tamano_lote: int) -> list:
+        """Lo que quedó en proceso de un volcado interrumpido o, si no hay, hasta `tamano_lote` de la cola."""
+        crudos = self.redis_client.lrange(CLAVE_EN_PROCESO, 0, -1)
+        if crudos:
+            logger.warning("Retomando %s reclamos de corte de un volcado interrumpido", len(crudos))
+            return crudos
+        pipe = self.redis_client.pipeline(transaction=True)
+        for _ in range(tamano_lote):
+            pipe.lmove(CLAVE_COLA, CLAVE_EN_PROCESO, "LEFT", "RIGHT")
+        return [crudo for crudo in pipe.execute() if crudo is not None]
+
+    def _volcar(self, tamano_lote: int) -> int:
+        crudos = self._tomar_lote(tamano_lote)
+        if not crudos:
+            return 0
+        # (texto en Redis, reclamo): el texto identifica el elemento a sacar de la lista en proceso
+        pares = [(crudo, json.loads(crudo)) for crudo in crudos]
+        por_incidente = defaultdict(list)
+        for par in pares:
+            por_incidente[par[1]["id_incidente"]].append(par)
+
+        insertados = 0
+        with self.session_factory_db1() as session_db1, self.session_factory_db2() as session:
+            repositorio = SQLAlchemyIncidenteRepository(session)
+            usuario_repository = SQLAlchemyUsuarioRepository(session_db1, session)
+            try:
+                ids_usuario = repositorio.clientes_por_dni([p["dni"] for _, p in pares])
+            except Exception as e:
+                logger.error("Error al resolver los clientes de %s reclamos de corte: %s", len(pares), e)
+                self._reencolar(pares)
+                raise
+            # Un cliente que no se puede copiar solo demora sus propios reclamos
+            sin_copiar = set()
+            for dni in {p["dni"] for _, p in pares} - ids_usuario.keys():
+                try:
+                    cliente = usuario_repository.copiar_cliente_a_db2(dni)
+                except Exception as e:
+                    session.rollback()
+                    logger.error("No se pudo copiar el cliente %s de un reclamo de corte: %s", dni, e)
+                    sin_copiar.add(dni)
+                    continue
+                if cliente is not None:
+                    ids_usuario[dni] = cliente.ID_USUARIO
+
+            for id_incidente, lote in por_incidente.items():
+                reintentar = [par for par in lote if par[1]["dni"] in sin_copiar]
+                validos = [par for par in lote if par[1]["dni"] in ids_usuario]
+                descartados = [par for par in lote if par[1]["dni"] not in ids_usuario and par[1]["dni"] not in sin_copiar]
+                for _, pendiente in descartados:
+                    logger.warning("Reclamo de corte descartado: DNI %s no está en PR_CAU", pendiente["dni"])
+                try:
+                    insertados += repositorio.sumar_reclamos(id_incidente, [{
+                        "ID_USUARIO": ids_usuario[pendiente["dni"]],
+                        "DESCRIPCION": pendiente["descripcion"][:500],
+                        "FECHA_RECLAMO": datetime.fromisoformat(pendiente["fecha"]),
+                    } for _, pendiente in validos])
+                except Exception as e:
+                    logger.error("Error al volcar %s reclamos del incidente %s: %s", len(validos), id_incidente, e)
+                    reintentar += validos
+                    validos = []
+                self._confirmar(validos + descartados)
+                if reintentar:
+                    self._reencolar(reintentar)
+        RECLAMOS_CORTE.inc(insertados, resultado="volcado")
+        logger.info("Volcados %s reclamos de corte en %s incidentes", insertados, len(por_incidente))
+        return insertados
+
+    def _confirmar(self, pares: list):
+        """Saca de la lista en proceso los reclamos ya insertados o descartados."""
+        if not pares:
+            return
+        pipe = self.redis_client.pipeline(transaction=True)
+        for crudo, _ in pares:
+            pipe.lrem(CLAVE_EN_PROCESO, 1, crudo)
+        pipe.execute()
+
+    def _reencolar(self, pares: list):
+        """
+        Devuelve a la cola los reclamos que no se pudieron insertar, para el próximo
+        volcado; los que ya agotaron CORTES_VOLCADO_INTENTOS van a la lista de fallidos.
+        """
+        reintentos, fallidos = [], []
+        for _, pendiente in pares:
+            pendiente = {**pendiente, "intentos": pendiente.get("intentos", 0) + 1}
+            (fallidos if pendiente["intentos"] >= Config.CORTES_VOLCADO_INTENTOS else reintentos).append(
+                json.dumps(pendiente, ensure_ascii=False))
+        pipe = self.redis_client.pipeline(transaction=True)
+        if reintentos:
+            pipe.rpush(CLAVE_COLA, *reintentos)
+            RECLAMOS_CORTE.inc(len(reintentos), resultado="error_volcado")
+        if fallidos:
+            pipe.rpush(CLAVE_FALLIDOS, *fallidos)
+        for crudo, _ in pares:
+            pipe.lrem(CLAVE_EN_PROCESO, 1, crudo)
+        pipe.execute()
+        if fallidos:
+            RECLAMOS_CORTE.inc(len(fallidos), resultado="fallido")
+            logger.error("❌ %s reclamos de corte pasaron a %s tras %s intentos",
+                         len(fallidos), CLAVE_FALLIDOS, Config.CORTES_VOLCADO_INTENTOS)
+
+    def cerrar(self, id_incidente: int, estado_reclamos: str = "Resuelto"):
+        """Cierra el incidente (y sus reclamos) y saca al barrio del modo corte. Devuelve (incidente, reclamos)."""
+        self.volcar()
+        with self.session_factory_db2() as session:
+            incidente, cerrados = SQLAlchemyIncidenteRepository(session).cerrar(id_incidente, estado_reclamos)
+            if incidente is None:
+                return None, 0
+            self.redis_client.delete(clave_activo(incidente.BARRIO), clave_barrio(incidente.BARRIO))
+            return incidente.to_dict(), cerrados
+
+    # === Volcado periódico (una tarea por proceso) ===
+
+    def iniciar_volcado(self, intervalo_s: float = None):
+        intervalo_s = intervalo_s or Config.CORTES_VOLCADO_S
+        self._tarea_volcado = asyncio.create_task(self._volcar_periodicamente(intervalo_s))
+
+    async def _volcar_periodicamente(self, intervalo_s: float):
+        while True:
+            await asyncio.sleep(intervalo_s)
+            try:
+                await asyncio.to_thread(self.volcar)
+            except Exception as e:
+                logger.error("Error al volcar reclamos de corte: %s", e)
+
+    async def detener_volcado(self):
+        """Cancela la tarea y vuelca lo que quedó en la cola."""
+        if self._tarea_volcado is not None:
+            self._tarea_volcado.cancel()
+            await asyncio.gather(self._tarea_volcado, return_exceptions=True)
+            self._tarea_volcado = None
+        try:
+            while await asyncio.to_thread(self.volcar):
+                pass
+        except Exception as e:
+            logger.error("Error al volcar reclamos de corte al detener: %s", e)
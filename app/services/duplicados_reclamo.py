@@ -0,0 +1,97 @@
+# app/services/duplicados_reclamo.py
+"""
+Detección local de reclamos casi duplicados de un mismo cliente.
+
+La descripción se normaliza (minúsculas, sin tildes ni signos) y se parte en
+shingles de RECLAMOS_DUPLICADO_SHINGLE caracteres. Su firma MinHash son los mínimos
+de PERMUTACIONES funciones de hash universales sobre esos shingles; la fracción de
+mínimos que coinciden entre dos firmas estima la similitud de Jaccard de los textos.
+Un reclamo abierto del cliente de los últimos RECLAMOS_DUPLICADO_DIAS (contados desde
+el inicio del día) con similitud >= RECLAMOS_DUPLICADO_UMBRAL se toma como el mismo
+reclamo reenviado (por otro canal o de nuevo): se confirma ese ID en lugar de
+validarlo con OpenAI e insertar otro.
+"""
+import hashlib
+import logging
+import random
+import re
+import unicodedata
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from app.config.config import Config
+
+logger = logging.getLogger(__name__)
+
+PERMUTACIONES = 64
+_PRIMO = (1 << 61) - 1
+# Coeficientes fijos: las firmas tienen que ser comparables entre procesos y reinicios
+_rng = random.Random(20240517)
+_COEFICIENTES = tuple((_rng.randrange(1, _PRIMO), _rng.randrange(0, _PRIMO)) for _ in range(PERMUTACIONES))
+_NO_ALFANUMERICO = re.compile(r"[^a-z0-9 ]+")
+
+
+def normalizar(texto: str) -> str:
+    sin_tildes = unicodedata.normalize("NFKD", texto or "").encode("ascii", "ignore").decode()
+    return " ".join(_NO_ALFANUMERICO.sub(" ", sin_tildes.lower()).split())
+
+
+def shingles(texto: str, tamano: int = None) -> set:
+    tamano = tamano or Config.RECLAMOS_DUPLICADO_SHINGLE
+    normalizado = normalizar(texto)
+    if len(normalizado) <= tamano:
+        return {normalizado} if normalizado else set()
+    return {normalizado[i:i + tamano] for i in range(len(normalizado) - tamano + 1)}
+
+
+@lru_cache(maxsize=4096)
+def firma_minhash(texto: str) -> Tuple[int, ...]:
+    """Firma MinHash de la descripción (vacía si no tiene texto útil)."""
+    valores = [
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big")
+        for s in shingles(texto)
+    ]
+    if not valores:
+        return ()
+    return tuple(min((a * v + b) % _PRIMO for v in valores) for a, b in _COEFICIENTES)
+
+
+def similitud(firma_a: Tuple[int, ...], firma_b: Tuple[int, ...]) -> float:
+    """Estimación de Jaccard: fracción de posiciones iguales entre dos firmas."""
+    if not firma_a or not firma_b:
+        return 0.0
+    return sum(1 for x, y in zip(firma_a, firma_b) if x == y) / len(firma_a)
+
+
+class DetectorDuplicados:
+    def __init__(self, reclamo_repository, usuario_repository, umbral: float = None, dias: int = None):
+        self.reclamo_repository = reclamo_repository
+        self.usuario_repository = usuario_repository
+        self.umbral = Config.RECLAMOS_DUPLICADO_UMBRAL if umbral is None else umbral
+        self.dias = dias or Config.RECLAMOS_DUPLICADO_DIAS
+
+    def buscar(self, dni: str, descripcion: str) -> Optional[dict]:
+        """
+        Reclamo abierto y reciente del cliente que repite `descripcion`, como
+        {"id_reclamo", "estado", "fecha", "descripcion", "similitud"}; None si no hay.
+        """
+        if self.umbral <= 0:
+            return None
+        cliente = self.usuario_repository.obtener_por_dni(dni)
+        if cliente is None:
+            return None
+        firma = firma_minhash(descripcion)
+        if not firma:
+            return None
+        # Desde el inicio del día: la misma clave durante el turno, así la lectura se memoriza
+        desde = datetime.combine(date.today() - timedelta(days=self.dias), time.min)
+        mejor = None
+        for id_reclamo, texto, estado, fecha in self.reclamo_repository.abiertos_recientes(cliente.ID_USUARIO, desde):
+            parecido = similitud(firma, firma_minhash(texto or ""))
+            if parecido >= self.umbral and (mejor is None or parecido > mejor["similitud"]):
+                mejor = {"id_reclamo": id_reclamo, "estado": estado, "fecha": fecha, "descripcion": texto,
+                         "similitud": round(parecido, 2)}
+        if mejor:
+            logger.info("Reclamo de DNI %s duplicado de %s (similitud %.2f)", dni, mejor["id_reclamo"], mejor["similitud"])
+        return mejor
@@ -0,0 +1,224 @@
+# app/services/estadisticas_reclamos_service.py
+"""
+Agregados de reclamos para los tableros del backoffice (GET /api/reclamos/stats).
+
+El cálculo completo (GROUP BY sobre Reclamos⋈Clientes) se guarda en Redis como
+snapshot por RECLAMOS_STATS_TTL segundos. Mientras tanto, cada alta o cambio de
+estado confirmado suma su diferencia en un hash de deltas (HINCRBY), que se aplica
+al leer: los conteos quedan al día sin recalcular. Los percentiles de antigüedad
+solo se renuevan con el snapshot.
+
+Los deltas salen de eventos de sesión de SQLAlchemy, así cubren la API y los bots
+sin tocar cada servicio. Los UPDATE masivos (PUT /api/reclamos/estados) no pasan
+por el flush: en ese caso se descarta el snapshot.
+"""
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.config.config import Config
+from app.models.entities import Cliente, Reclamo
+from app.repositories.sqlalchemy_reclamo_repository import ESTADOS_CERRADOS
+
+logger = logging.getLogger(__name__)
+
+CLAVE_SNAPSHOT = "reclamos:stats:v1"
+CLAVE_DELTAS = "reclamos:stats:v1:deltas"
+DIMENSIONES = ("estado", "barrio", "calle", "dia")
+PERCENTILES = (50, 90, 99)
+
+_redis_client = None
+
+
+def _percentiles(horas: list) -> dict:
+    if not horas:
+        return {}
+    horas = sorted(horas)
+    # Rango más cercano: sin interpolación, igual que lo leería alguien en la tabla
+    return {f"p{p}": round(horas[min(len(horas) - 1, max(0, -(-p * len(horas) // 100) - 1))], 1) for p in PERCENTILES}
+
+
+class EstadisticasReclamosService:
+    def __init__(self, reclamo_repository, redis_client=None):
+        self.reclamo_repository = reclamo_repository
+        self.redis_client = redis_client
+
+    def ejecutar(self):
+        try:
+            if self.redis_client is not None:
+                snapshot = self._leer_snapshot()
+                if snapshot is not None:
+                    return snapshot, 200
+            snapshot = self._calcular()
+            if self.redis_client is not None:
+                pipe = self.redis_client.pipeline(transaction=True)
+                pipe.setex(CLAVE_SNAPSHOT, Config.RECLAMOS_STATS_TTL, json.dumps(snapshot, ensure_ascii=False))
+                pipe.delete(CLAVE_DELTAS)
+                pipe.execute()
+            return snapshot, 200
+        except Exception as e:
+            logger.error("Error al calcular estadísticas de reclamos: %s", e)
+            return {"error": "Error al calcular las estadísticas", "detalle": str(e)}, 500
+
+    def _leer_snapshot(self):
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.get(CLAVE_SNAPSHOT)
+        pipe.hgetall(CLAVE_DELTAS)
+        crudo, deltas = pipe.execute()
+        if crudo is None:
+            return None
+        snapshot = json.loads(crudo)
+        if deltas:
+            _aplicar_deltas(snapshot, deltas)
+        return snapshot
+
+    def _calcular(self) -> dict:
+        ahora = datetime.now()
+        grupos = {dimension: defaultdict(lambda: {"total": 0, "abiertos": 0}) for dimension in DIMENSIONES}
+        edades = {dimension: defaultdict(list) for dimension in DIMENSIONES if dimension != "dia"}
+
+        for estado, barrio, calle, abierto, cantidad in self.reclamo_repository.contar_por_estado_barrio_calle():
+            for dimension, clave in (("estado", estado), ("barrio", barrio), ("calle", calle)):
+                grupos[dimension][clave or "Sin dato"]["total"] += cantidad
+                grupos[dimension][clave or "Sin dato"]["abiertos"] += cantidad * abierto
+
+        desde = (ahora - timedelta(days=Config.RECLAMOS_STATS_DIAS)).replace(hour=0, minute=0, second=0, microsecond=0)
+        for dia, abierto, cantidad in self.reclamo_repository.contar_por_dia(desde):
+            clave = dia.isoformat() if hasattr(dia, "isoformat") else str(dia)
+            grupos["dia"][clave]["total"] += cantidad
+            grupos["dia"][clave]["abiertos"] += cantidad * abierto
+
+        for estado, barrio, calle, fecha in self.reclamo_repository.fechas_abiertos():
+            if fecha is None:
+                continue
+            horas = (ahora - fecha).total_seconds() / 3600
+            for dimension, clave in (("estado", estado), ("barrio", barrio), ("calle", calle)):
+                edades[dimension][clave or "Sin dato"].append(horas)
+
+        snapshot = {
+            "generado": ahora.isoformat(timespec="seconds"),
+            "dias_desde": desde.date().isoformat(),
+            "total": sum(g["total"] for g in grupos["estado"].values()),
+            "abiertos": sum(g["abiertos"] for g in grupos["estado"].values()),
+        }
+        for dimension in DIMENSIONES:
+            filas = []
+            for clave, conteo in grupos[dimension].items():
+                fila = {"clave": clave, **conteo}
+                if dimension in edades:
+                    fila["antiguedad_abiertos_horas"] = _percentiles(edades[dimension].get(clave, []))
+                filas.append(fila)
+            orden = (lambda f: f["clave"]) if dimension == "dia" else (lambda f: -f["total"])
+            snapshot[f"por_{dimension}"] = sorted(filas, key=orden)
+        return snapshot
+
+
+def _aplicar_deltas(snapshot: dict, deltas: dict):
+    """Suma al snapshot los deltas "dimension|clave|metrica" → cantidad."""
+    indices = {d: {f["clave"]: f for f in snapshot[f"por_{d}"]} for d in DIMENSIONES}
+    for campo, valor in deltas.items():
+        dimension, clave, metrica = campo.split("|", 2)
+        if dimension == "dia" and clave < snapshot["dias_desde"]:
+            continue  # reclamo viejo que cambió de estado: su día quedó fuera de la ventana
+        cantidad = int(valor)
+        fila = indices[dimension].get(clave)
+        if fila is None:
+            fila = indices[dimension][clave] = {"clave": clave, "total": 0, "abiertos": 0}
+            snapshot[f"por_{dimension}"].append(fila)
+        fila[metrica] += cantidad
+        if dimension == "estado":
+            snapshot[metrica] += cantidad
+
+
+# === Deltas desde los eventos de sesión ===
+
+def _abierto(estado) -> int:
+    return 0 if estado in ESTADOS_CERRADOS else 1
+
+
+def _ubicacion(session: Session, reclamo: Reclamo):
+    cliente = reclamo.cliente
+    if cliente is None and reclamo.ID_USUARIO is not None:
+        with session.no_autoflush:
+            cliente = session.get(Cliente, reclamo.ID_USUARIO)
+    if cliente is None:
+        return "Sin dato", "Sin dato"
+    return cliente.BARRIO or "Sin dato", cliente.CALLE or "Sin dato"
+
+
+def _sumar(deltas: dict, estado, barrio: str, calle: str, dia, signo: int):
+    abierto = _abierto(estado)
+    claves = [("estado", estado or "Sin dato"), ("barrio", barrio), ("calle", calle)]
+    if dia is not None:
+        claves.append(("dia", dia.date().isoformat()))
+    for dimension, clave in claves:
+        deltas[f"{dimension}|{clave}|total"] += signo
+        if abierto:
+            deltas[f"{dimension}|{clave}|abiertos"] += signo
+
+
+def _antes_del_flush(session: Session, contexto, instancias):
+    if _redis_client is None:
+        return
+    deltas = session.info.setdefault("estadisticas_reclamos", defaultdict(int))
+    for objeto in session.new:
+        if isinstance(objeto, Reclamo):
+            barrio, calle = _ubicacion(session, objeto)
+            _sumar(deltas, objeto.ESTADO or "Pendiente", barrio, calle, objeto.FECHA_RECLAMO or datetime.now(), 1)
+    for objeto in session.dirty:
+        if not isinstance(objeto, Reclamo):
+            continue
+        historial = inspect(objeto).attrs.ESTADO.history
+        if not historial.added or not historial.deleted or historial.added[0] == historial.deleted[0]:
+            continue
+        barrio, calle = _ubicacion(session, objeto)
+        # El día de creación no cambia: solo se mueve el conteo entre estados (y abiertos)
+        _sumar(deltas, historial.deleted[0], barrio, calle, objeto.FECHA_RECLAMO, -1)
+        _sumar(deltas, historial.added[0], barrio, calle, objeto.FECHA_RECLAMO, 1)
+
+
+def _al_ejecutar(estado_orm):
+    if _redis_client is None or not (estado_orm.is_update or estado_orm.is_delete):
+        return
+    entidad = estado_orm.bind_mapper.class_ if estado_orm.bind_mapper is not None else None
+    if entidad is Reclamo:
+        estado_orm.session.info["estadisticas_reclamos_invalidar"] = True
+
+
+def _despues_del_commit(session: Session):
+    deltas = session.info.pop("estadisticas_reclamos", None)
+    invalidar = session.info.pop("estadisticas_reclamos_invalidar", False)
+    if _redis_client is None or not (deltas or invalidar):
+        return
+    try:
+        pipe = _redis_client.pipeline(transaction=False)
+        if invalidar:
+            pipe.delete(CLAVE_SNAPSHOT, CLAVE_DELTAS)
+        else:
+            for campo, cantidad in deltas.items():
+                if cantidad:
+                    pipe.hincrby(CLAVE_DELTAS, campo, cantidad)
+        pipe.execute()
+    except Exception as e:
+        logger.warning("⚠️ No se pudieron actualizar las estadísticas de reclamos en Redis: %s", e)
+
+
+def _despues_del_rollback(session: Session):
+    session.info.pop("estadisticas_reclamos", None)
+    session.info.pop("estadisticas_reclamos_invalidar", None)
+
+
+def configurar_estadisticas(redis_client):
+    """Activa los deltas incrementales; se llama una vez al iniciar la app."""
+    global _redis_client
+    primera_vez = _redis_client is None
+    _redis_client = redis_client
+    if primera_vez and redis_client is not None:
+        event.listen(Session, "before_flush", _antes_del_flush)
+        event.listen(Session, "do_orm_execute", _al_ejecutar)
+        event.listen(Session, "after_commit", _despues_del_commit)
+        event.listen(Session, "after_rollback", _despues_del_rollback)
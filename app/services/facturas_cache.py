@@ -0,0 +1,93 @@
+# app/services/facturas_cache.py
+import json
+import logging
+from datetime import datetime
+from typing import Optional
+
+from app.config.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def ciclo_facturacion(ahora: datetime = None):
+    """
+    Devuelve (ciclo, segundos_restantes): el ciclo vigente como "AAAAMM" del último
+    cierre (Config.FACTURAS_DIA_CIERRE) y cuánto falta para el próximo.
+    """
+    ahora = ahora or datetime.now()
+    cierre = ahora.replace(day=Config.FACTURAS_DIA_CIERRE, hour=0, minute=0, second=0, microsecond=0)
+    if ahora < cierre:
+        cierre = _sumar_meses(cierre, -1)
+    proximo = _sumar_meses(cierre, 1)
+    return cierre.strftime("%Y%m"), max(int((proximo - ahora).total_seconds()), 1)
+
+
+def _sumar_meses(fecha: datetime, meses: int) -> datetime:
+    indice = fecha.year * 12 + fecha.month - 1 + meses
+    return fecha.replace(year=indice // 12, month=indice % 12 + 1)
+
+
+class CacheFacturas:
+    """
+    Modelo de lectura de facturas en Redis, ya formateadas para los canales.
+
+    Las facturas de PR_CAU solo cambian al cerrar el ciclo de facturación, así que
+    las claves llevan el ciclo vigente y vencen al empezar el siguiente:
+    - facturas:{ciclo}:{dni}                   lista completa (más nueva primero)
+    - facturas:{ciclo}:{dni}:ultima            solo la última factura (lo que muestran los bots)
+    - facturas:{ciclo}:suministro:{codigo}     hash DNI → período, para invalidar por suministro
+
+    Un pago registrado a mitad de ciclo cambia el Estado de la factura: en ese caso
+    se invalida a mano por DNI o por suministro.
+    """
+
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+
+    @staticmethod
+    def _clave(ciclo: str, dni: str, ultima: bool = False) -> str:
+        return f"facturas:{ciclo}:{dni}:ultima" if ultima else f"facturas:{ciclo}:{dni}"
+
+    def leer(self, dni: str, latest_only: bool = False) -> Optional[list]:
+        ciclo, _ = ciclo_facturacion()
+        try:
+            crudo = self.redis_client.get(self._clave(ciclo, dni, latest_only))
+        except Exception as e:
+            logger.warning("⚠️ No se pudo leer el caché de facturas de %s: %s", dni, e)
+            return None
+        if crudo is None:
+            return None
+        if latest_only:
+            return [json.loads(crudo)] if crudo != "null" else []
+        return json.loads(crudo)
+
+    def guardar(self, dni: str, facturas: list):
+        ciclo, ttl = ciclo_facturacion()
+        ultima = facturas[0] if facturas else None
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.setex(self._clave(ciclo, dni), ttl, json.dumps(facturas, ensure_ascii=False))
+            pipe.setex(self._clave(ciclo, dni, ultima=True), ttl, json.dumps(ultima, ensure_ascii=False))
+            for codigo in {f["CodigoSuministro"] for f in facturas if f["CodigoSuministro"] != "No disponible"}:
+                clave_suministro = f"facturas:{ciclo}:suministro:{codigo}"
+                pipe.hset(clave_suministro, dni, ultima["Periodo"] if ultima else "")
+                pipe.expire(clave_suministro, ttl)
+            pipe.execute()
+            logger.debug("Facturas de %s guardadas en caché (ciclo %s, %s s)", dni, ciclo, ttl)
+        except Exception as e:
+            logger.warning("⚠️ No se pudo guardar el caché de facturas de %s: %s", dni, e)
+
+    def invalidar_dni(self, dni: str) -> int:
+        ciclo, _ = ciclo_facturacion()
+        return self.redis_client.delete(self._clave(ciclo, dni), self._clave(ciclo, dni, ultima=True))
+
+    def invalidar_suministro(self, codigo_suministro: str) -> list:
+        """Invalida las facturas de todos los DNI asociados al suministro; devuelve esos DNI."""
+        ciclo, _ = ciclo_facturacion()
+        clave_suministro = f"facturas:{ciclo}:suministro:{codigo_suministro}"
+        dnis = list(self.redis_client.hgetall(clave_suministro))
+        claves = [clave_suministro]
+        for dni in dnis:
+            claves += [self._clave(ciclo, dni), self._clave(ciclo, dni, ultima=True)]
+        self.redis_client.delete(*claves)
+        return dnis
@@ -0,0 +1,170 @@
+# app/services/filtro_dni.py
+"""
+Descarte de DNIs desconocidos antes de consultar SQL Server.
+
+Dos niveles, ambos en Redis:
+- Caché negativo: `dni:desconocido:{dni}` con vencimiento DNI_NEGATIVO_TTL, para
+  el mismo DNI mal tipeado que se reintenta.
+- Filtro de Bloom sobre PERSONAS.NUM_DNI y Clientes.DNI en `dni:bloom` (un bitmap,
+  se consulta con GETBIT) y sus parámetros en `dni:bloom:meta`. Lo reconstruye
+  app/jobs/reconstruir_filtro_dni.py y la sincronización de clientes le agrega los
+  DNIs nuevos. Un "sí" puede ser falso positivo y se confirma con la consulta de
+  siempre. Un "no" tampoco es definitivo: el filtro no ve a las personas dadas de
+  alta después de la última corrida ni los NUM_DNI corregidos, así que se confirma
+  solo contra PR_CAU (sin la consulta a DECSA_EXC) y, si tampoco está, pasa al
+  caché negativo. Si el filtro no existe o es más viejo que DNI_BLOOM_VIGENCIA_S
+  no se usa.
+"""
+import hashlib
+import logging
+import math
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable, List, Optional
+
+from app.config.config import Config
+from app.utils.metrics import FILTRO_DNI
+
+logger = logging.getLogger(__name__)
+
+CLAVE_BLOOM = "dni:bloom"
+CLAVE_META = "dni:bloom:meta"
+# Parámetros del filtro en memoria del proceso; se releen cada tanto por si hubo reconstrucción
+_META_REFRESCO_S = 60
+
+
+def normalizar_dni(valor) -> str:
+    # NUM_DNI puede venir como número desde PR_CAU
+    if isinstance(valor, (int, float, Decimal)):
+        return str(int(valor))
+    return str(valor or "").strip()
+
+
+def clave_desconocido(dni: str) -> str:
+    return f"dni:desconocido:{dni}"
+
+
+def dimensionar(cantidad: int, tasa_fp: float):
+    """(bits, funciones de hash) óptimos para `cantidad` elementos y la tasa de falsos positivos pedida."""
+    cantidad = max(cantidad, 1)
+    bits = math.ceil(-cantidad * math.log(tasa_fp) / (math.log(2) ** 2))
+    bits = (bits + 7) // 8 * 8
+    hashes = max(1, round(bits / cantidad * math.log(2)))
+    return bits, hashes
+
+
+def tasa_fp_teorica(cantidad: int, bits: int, hashes: int) -> float:
+    return (1 - math.exp(-hashes * cantidad / bits)) ** hashes
+
+
+def posiciones(dni: str, bits: int, hashes: int) -> List[int]:
+    # Doble hashing (Kirsch-Mitzenmacher): k posiciones a partir de dos hashes de 64 bits
+    resumen = hashlib.blake2b(dni.encode(), digest_size=16).digest()
+    h1 = int.from_bytes(resumen[:8], "big")
+    h2 = int.from_bytes(resumen[8:], "big") | 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+
+class BitmapBloom:
+    """Arma el bitmap en memoria con el mismo orden de bits que SETBIT/GETBIT (bit 0 = MSB del byte 0)."""
+
+    def __init__(self, bits: int, hashes: int):
+        self.bits = bits
+        self.hashes = hashes
+        self.datos = bytearray(bits // 8)
+        self.cantidad = 0
+
+    def agregar(self, dni: str):
+        for posicion in posiciones(dni, self.bits, self.hashes):
+            self.datos[posicion >> 3] |= 0x80 >> (posicion & 7)
+        self.cantidad += 1
+
+    def contiene(self, dni: str) -> bool:
+        return all(self.datos[p >> 3] & (0x80 >> (p & 7)) for p in posiciones(dni, self.bits, self.hashes))
+
+
+class FiltroDNI:
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self._meta = None
+        self._meta_leida = None
+
+    # === Caché negativo ===
+
+    def marcar_desconocido(self, dni: str):
+        try:
+            self.redis_client.setex(clave_desconocido(dni), Config.DNI_NEGATIVO_TTL, "1")
+        except Exception as e:
+            logger.warning("⚠️ No se pudo guardar el DNI desconocido %s en Redis: %s", dni, e)
+
+    # === Consulta ===
+
+    def clasificar(self, dni: str) -> str:
+        """
+        "desconocido" si está en el caché negativo (no se consulta nada), "solo_db1" si
+        el filtro de Bloom no lo tiene (se confirma en PR_CAU) o "consultar" ante
+        cualquier duda o error de Redis.
+        """
+        try:
+            meta = self._parametros()
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.exists(clave_desconocido(dni))
+            if meta:
+                for posicion in posiciones(dni, meta["bits"], meta["hashes"]):
+                    pipe.getbit(CLAVE_BLOOM, posicion)
+            desconocido, *bits = pipe.execute()
+        except Exception as e:
+            logger.warning("⚠️ No se pudo consultar el filtro de DNIs: %s", e)
+            return "consultar"
+        if desconocido:
+            FILTRO_DNI.inc(resultado="cache_negativo")
+            return "desconocido"
+        if bits and not all(bits):
+            FILTRO_DNI.inc(resultado="bloom")
+            return "solo_db1"
+        FILTRO_DNI.inc(resultado="consulta")
+        return "consultar"
+
+    def _parametros(self) -> Optional[dict]:
+        ahora = time.monotonic()
+        if self._meta_leida is None or ahora - self._meta_leida > _META_REFRESCO_S:
+            crudo = self.redis_client.hgetall(CLAVE_META)
+            self._meta = {
+                "bits": int(crudo["bits"]),
+                "hashes": int(crudo["hashes"]),
+                "generado": datetime.fromisoformat(crudo["generado"]),
+            } if crudo else None
+            self._meta_leida = ahora
+        if self._meta is None:
+            return None
+        if (datetime.now() - self._meta["generado"]).total_seconds() > Config.DNI_BLOOM_VIGENCIA_S:
+            return None
+        return self._meta
+
+    # === Mantenimiento del filtro ===
+
+    def publicar(self, bitmap: BitmapBloom, informe: dict):
+        """Reemplaza el filtro en Redis: el bitmap se sube entero con un SET, junto con sus parámetros."""
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.set(CLAVE_BLOOM, bytes(bitmap.datos))
+        pipe.delete(CLAVE_META)
+        pipe.hset(CLAVE_META, mapping={k: str(v) for k, v in informe.items()})
+        pipe.execute()
+        self._meta_leida = None
+
+    def agregar(self, dnis: Iterable[str]):
+        """Suma DNIs nuevos al filtro vigente (y los saca del caché negativo)."""
+        dnis = [dni for dni in map(normalizar_dni, dnis) if dni]
+        if not dnis:
+            return
+        meta = self._parametros()
+        pipe = self.redis_client.pipeline(transaction=False)
+        for dni in dnis:
+            pipe.delete(clave_desconocido(dni))
+            if meta:
+                for posicion in posiciones(dni, meta["bits"], meta["hashes"]):
+                    pipe.setbit(CLAVE_BLOOM, posicion, 1)
+        if meta:
+            pipe.hincrby(CLAVE_META, "agregados", len(dnis))
+        pipe.execute()
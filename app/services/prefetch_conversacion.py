@@ -0,0 +1,114 @@
+# app/services/prefetch_conversacion.py
+"""
+Precarga especulativa de los datos que pide el turno siguiente.
+
+Cuando el bot encuentra el DNI ya sabe qué va a necesitar si el usuario confirma:
+los últimos reclamos, la última factura o el valor actual del campo a actualizar.
+Mientras el usuario contesta "sí", esa lectura corre en segundo plano (en un hilo y
+con sesiones propias) y queda en Redis bajo `user:{id}:prefetch` por
+CONVERSACION_PREFETCH_TTL segundos. La fase confirmar_dni la toma de ahí; si no
+llegó a estar, consulta como siempre.
+"""
+import asyncio
+import json
+import logging
+from typing import Optional
+
+from app.config.config import Config
+from app.repositories.sqlalchemy_reclamo_repository import SQLAlchemyReclamoRepository
+from app.repositories.sqlalchemy_usuario_repository import SQLAlchemyUsuarioRepository
+from app.services.consultar_estado_reclamo_service import ConsultarEstadoReclamoService
+from app.services.consultar_facturas_service import ConsultarFacturasService
+from app.utils.memo_turno import memo_turno
+
+logger = logging.getLogger(__name__)
+
+ACCIONES_PRECARGABLES = ("consultar", "consultar_facturas", "actualizar")
+
+
+def clave_prefetch(user_id: str) -> str:
+    return f"user:{user_id}:prefetch"
+
+
+class PrefetchConversacion:
+    def __init__(self, redis_client, session_factory_db1=None, session_factory_db2=None, ttl: int = None):
+        if session_factory_db1 is None or session_factory_db2 is None:
+            from app.database.database import SessionLocal_db1, SessionLocal_db2
+            session_factory_db1 = session_factory_db1 or SessionLocal_db1
+            session_factory_db2 = session_factory_db2 or SessionLocal_db2
+        self.redis_client = redis_client
+        self.session_factory_db1 = session_factory_db1
+        self.session_factory_db2 = session_factory_db2
+        self.ttl = ttl or Config.CONVERSACION_PREFETCH_TTL
+        # Precargas en curso en este proceso, para esperarlas si el usuario contesta antes
+        self._en_curso = {}
+
+    def programar(self, user_id: str, accion: str, dni: str, campo: str = None):
+        """Lanza la precarga en segundo plano; no bloquea el turno."""
+        if accion not in ACCIONES_PRECARGABLES:
+            return
+        self.descartar(user_id)
+        tarea = asyncio.create_task(asyncio.to_thread(self._precargar, user_id, accion, dni, campo))
+        self._en_curso[user_id] = tarea
+        tarea.add_done_callback(lambda t: self._terminada(user_id, t))
+
+    def _terminada(self, user_id: str, tarea: asyncio.Task):
+        if self._en_curso.get(user_id) is tarea:
+            del self._en_curso[user_id]
+        if not tarea.cancelled() and tarea.exception() is not None:
+            logger.warning("Precarga fallida para %s: %s", user_id, tarea.exception())
+
+    async def tomar(self, user_id: str, accion: str, dni: str, campo: str = None):
+        """
+        Devuelve lo precargado para (accion, dni, campo) y lo borra, o None si no
+        hay. Si la precarga sigue corriendo en este proceso, la espera: ya va por
+        delante de una consulta nueva.
+        """
+        tarea = self._en_curso.get(user_id)
+        if tarea is not None:
+            try:
+                await asyncio.shield(tarea)
+            except Exception:
+                return None
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.get(clave_prefetch(user_id))
+        pipe.delete(clave_prefetch(user_id))
+        crudo, _ = pipe.execute()
+        if crudo is None:
+            return None
+        precarga = json.loads(crudo)
+        if (precarga.get("accion"), precarga.get("dni"), precarga.get("campo")) != (accion, dni, campo):
+            return None
+        logger.debug("Usando datos precargados (%s) para %s", accion, user_id)
+        return precarga["datos"]
+
+    def descartar(self, user_id: str):
+        tarea = self._en_curso.pop(user_id, None)
+        if tarea is not None:
+            tarea.cancel()  # si el hilo ya arrancó, termina solo y su resultado vence por TTL
+        self.redis_client.delete(clave_prefetch(user_id))
+
+    def _precargar(self, user_id: str, accion: str, dni: str, campo: Optional[str]):
+        session_db1 = self.session_factory_db1()
+        session_db2 = self.session_factory_db2()
+        try:
+            # Memo propio: la precarga sigue en segundo plano después del turno que la lanzó
+            with memo_turno():
+                usuario_repository = SQLAlchemyUsuarioRepository(session_db1, session_db2)
+                if accion == "consultar":
+                    servicio = ConsultarEstadoReclamoService(SQLAlchemyReclamoRepository(session_db2), usuario_repository)
+                    datos = list(servicio.ejecutar(dni))
+                elif accion == "consultar_facturas":
+                    # También deja calientes las claves facturas:* del ciclo
+                    datos = list(ConsultarFacturasService(usuario_repository, self.redis_client).ejecutar(dni, latest_only=True))
+                else:
+                    usuario_db2 = usuario_repository.obtener_por_dni(dni)
+                    datos = {"valor": getattr(usuario_db2, campo) if usuario_db2 and hasattr(usuario_db2, campo) else None}
+        finally:
+            session_db1.close()
+            session_db2.close()
+        if isinstance(datos, list) and datos[1] >= 500:
+            return  # un error no se guarda: el turno siguiente vuelve a consultar
+        precarga = {"accion": accion, "dni": dni, "campo": campo, "datos": datos}
+        self.redis_client.setex(clave_prefetch(user_id), self.ttl, json.dumps(precarga, ensure_ascii=False, default=str))
+        logger.debug("Precarga %s lista para %s", accion, user_id)
@@ -5,7 +5,7 @@ from app.services.consultar_estado_reclamo_service import ConsultarEstadoReclamo
 from app.services.actualizar_estado_reclamo_service import ActualizarEstadoReclamoService
 from app.services.cancelar_reclamo_service import CancelarReclamoService
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 class ReclamoService:
     def __init__(self, registrar_reclamo_service: RegistrarReclamoService, consultar_estado_service: ConsultarEstadoReclamoService, actualizar_estado_service: ActualizarEstadoReclamoService, cancelar_reclamo_service: CancelarReclamoService):
@@ -4,8 +4,9 @@ import redis
 import logging
 from typing import Optional, List
 from app.config.config import Config
+from app.utils.metrics import RedisInstrumentado
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 class RedisClient:
     def __init__(self):
@@ -14,9 +15,13 @@ class RedisClient:
 
     def _connect(self):
         try:
-            if Config.REDIS_URL:
+            if Config.USAR_BACKENDS_FAKE:
+                from app.fakes.redis_fake import crear_redis_fake
+                self.client = crear_redis_fake()
+                logger.info("⚠️ Usando Redis fake en memoria (USAR_BACKENDS_FAKE).")
+            elif Config.REDIS_URL:
                 self.client = redis.from_url(Config.REDIS_URL, decode_responses=True)
-                logging.info("✅ Conexión a Redis establecida usando REDIS_URL.")
+                logger.info("✅ Conexión a Redis establecida usando REDIS_URL.")
             else:
                 self.client = redis.StrictRedis(
                     host=Config.REDIS_HOST,
@@ -24,14 +29,16 @@ class RedisClient:
                     db=0,
                     decode_responses=True
                 )
-                logging.info("⚠️ REDIS_URL no encontrado, usando host y puerto manuales.")
+                logger.info("⚠️ REDIS_URL no encontrado, usando host y puerto manuales.")
             self.client.ping()
-            logging.info("✅ Cliente de Redis inicializado correctamente.")
+            # Cada comando queda medido en redis_command_duration_seconds
+            self.client = RedisInstrumentado(self.client)
+            logger.info("✅ Cliente de Redis inicializado correctamente.")
         except redis.ConnectionError as e:
-            logging.error(f"❌ Error de conexión con Redis: {str(e)}")
+            logger.error("❌ Error de conexión con Redis: %s", e)
             raise
         except Exception as e:
-            logging.error(f"❌ Error inesperado al conectar a Redis: {str(e)}")
+            logger.error("❌ Error inesperado al conectar a Redis: %s", e)
             raise
 
     def get_client(self) -> redis.Redis:
@@ -66,9 +73,12 @@ class RedisClient:
     def hdel(self, key: str, field: str):
         self.client.hdel(key, field)
 
-    def delete(self, key: str):
-        self.client.delete(key)
+    def delete(self, *keys: str):
+        self.client.delete(*keys)
+
+    def pipeline(self, transaction: bool = True):
+        return self.client.pipeline(transaction=transaction)
 
     def flushdb(self):
         self.client.flushdb()
-        logging.info("🧹 Redis limpio con flushdb.")
+        logger.info("🧹 Redis limpio con flushdb.")
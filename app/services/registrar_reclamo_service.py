@@ -4,18 +4,51 @@ from datetime import datetime
 from app.repositories.sqlalchemy_reclamo_repository import SQLAlchemyReclamoRepository
 from app.repositories.sqlalchemy_usuario_repository import SQLAlchemyUsuarioRepository
 from app.models.entities import Cliente, Reclamo
+from app.services.duplicados_reclamo import DetectorDuplicados
+from app.utils.metrics import RECLAMOS_DUPLICADOS
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 class RegistrarReclamoService:
     def __init__(self, reclamo_repository: SQLAlchemyReclamoRepository, usuario_repository: SQLAlchemyUsuarioRepository):
         self.reclamo_repository = reclamo_repository
         self.usuario_repository = usuario_repository
+        self.detector_duplicados = DetectorDuplicados(reclamo_repository, usuario_repository)
 
-    def ejecutar(self, dni: str, descripcion: str):
-        """Registra un reclamo para un cliente. Si no existe en DB2, lo copia desde DB1."""
+    def buscar_duplicado(self, dni: str, descripcion: str, origen: str = "bot"):
+        """Reclamo abierto del cliente que repite la descripción, o None (ver DetectorDuplicados)."""
+        try:
+            duplicado = self.detector_duplicados.buscar(dni, descripcion)
+        except Exception as e:
+            # Ante cualquier error se registra como reclamo nuevo
+            logger.warning("No se pudo buscar duplicados para DNI %s: %s", dni, e)
+            return None
+        if duplicado:
+            RECLAMOS_DUPLICADOS.inc(origen=origen)
+        return duplicado
+
+    def ejecutar(self, dni: str, descripcion: str, origen: str = "api"):
+        """
+        Registra un reclamo para un cliente. Si no existe en DB2, lo copia desde DB1.
+        Si repite un reclamo abierto reciente, devuelve ese (200, "duplicado": True) sin insertar.
+        """
         try:
             cliente = self.usuario_repository.obtener_por_dni(dni)
+            duplicado = self.buscar_duplicado(dni, descripcion, origen=origen) if cliente else None
+            if duplicado:
+                return {
+                    "mensaje": "El reclamo ya estaba registrado",
+                    "id_reclamo": duplicado["id_reclamo"],
+                    "estado": duplicado["estado"],
+                    "duplicado": True,
+                    "cliente": {
+                        "nombre": cliente.NOMBRE_COMPLETO,
+                        "dni": cliente.DNI,
+                        "codigo_suministro": cliente.CODIGO_SUMINISTRO,
+                        "direccion": cliente.CALLE,
+                        "barrio": cliente.BARRIO
+                    }
+                }, 200
             if not cliente:
                 cliente = self.usuario_repository.copiar_cliente_a_db2(dni)
                 if not cliente:
@@ -43,5 +76,5 @@ class RegistrarReclamoService:
                 }
             }, 201
         except Exception as e:
-            logging.error(f"Error al registrar reclamo para DNI {dni}: {str(e)}")
+            logger.error("Error al registrar reclamo para DNI %s: %s", dni, e)
             return {"error": f"Error al registrar reclamo: {str(e)}"}, 500
\ No newline at end of file
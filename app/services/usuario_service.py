@@ -3,7 +3,7 @@ import logging
 from app.models.entities import Cliente
 from app.repositories.sqlalchemy_usuario_repository import SQLAlchemyUsuarioRepository
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
 
 class UsuarioService:
     def __init__(self, usuario_repo: SQLAlchemyUsuarioRepository):
@@ -11,54 +11,54 @@ class UsuarioService:
 
     def obtener_usuario_por_dni(self, dni):
         """Obtiene un cliente por su DNI en DECSA_EXC (DB2). Si no existe, lo copia desde PR_CAU (DB1)."""
-        logging.info(f"Buscando cliente con DNI: {dni}")
+        logger.debug("Buscando cliente con DNI: %s", dni)
 
         cliente = self.usuario_repo.obtener_por_dni(dni)
 
         if not cliente:
-            logging.warning(f"Cliente con DNI {dni} no encontrado en DECSA_EXC. Buscando en PR_CAU...")
+            logger.warning("Cliente con DNI %s no encontrado en DECSA_EXC. Buscando en PR_CAU...", dni)
             cliente = self.copiar_cliente_a_db2(dni)
 
             if isinstance(cliente, tuple):
                 cliente = cliente[0] if cliente[1] == 201 else None
 
             if not cliente:
-                logging.error(f"Cliente con DNI {dni} no encontrado en ninguna base de datos.")
+                logger.error("Cliente con DNI %s no encontrado en ninguna base de datos.", dni)
                 return {"error": "Cliente no encontrado"}, 404
 
         return cliente.to_dict(), 200
 
     def copiar_cliente_a_db2(self, dni):
         """Copia un cliente desde PR_CAU a DECSA_EXC si no existe."""
-        logging.info(f"Intentando copiar cliente con DNI: {dni}")
+        logger.debug("Intentando copiar cliente con DNI: %s", dni)
 
         if self.usuario_repo.existe_en_db2(dni):
-            logging.warning(f"El cliente con DNI {dni} ya existe en DECSA_EXC")
+            logger.warning("El cliente con DNI %s ya existe en DECSA_EXC", dni)
             return {"error": "El cliente ya existe en DECSA_EXC"}, 409
 
         cliente_copiado = self.usuario_repo.copiar_cliente_a_db2(dni)
         if not cliente_copiado:
-            logging.error(f"Cliente con DNI {dni} no encontrado en PR_CAU")
+            logger.error("Cliente con DNI %s no encontrado en PR_CAU", dni)
             return {"error": "Cliente no encontrado en PR_CAU"}, 404
 
-        logging.info(f"Cliente con DNI {dni} copiado exitosamente a DECSA_EXC")
+        logger.info("Cliente con DNI %s copiado exitosamente a DECSA_EXC", dni)
         return cliente_copiado.to_dict(), 201
 
     def actualizar_cliente(self, dni, data):
         """Actualiza los datos de un cliente en DECSA_EXC. Si no existe, lo copia primero desde PR_CAU."""
-        logging.info(f"Intentando actualizar cliente con DNI: {dni}")
+        logger.debug("Intentando actualizar cliente con DNI: %s", dni)
 
         cliente = self.usuario_repo.obtener_por_dni(dni)
 
         if not cliente:
-            logging.warning(f"Cliente con DNI {dni} no encontrado en DECSA_EXC. Copiando desde PR_CAU...")
+            logger.warning("Cliente con DNI %s no encontrado en DECSA_EXC. Copiando desde PR_CAU...", dni)
             cliente = self.copiar_cliente_a_db2(dni)
 
             if isinstance(cliente, tuple):
                 cliente = cliente[0] if cliente[1] == 201 else None
 
             if not cliente:
-                logging.error(f"No se pudo copiar el cliente con DNI {dni} desde PR_CAU.")
+                logger.error("No se pudo copiar el cliente con DNI %s desde PR_CAU.", dni)
                 return {"error": "Cliente no encontrado"}, 404
 
         # Campos que se pueden actualizar desde la app o bot
@@ -68,5 +68,5 @@ class UsuarioService:
                 setattr(cliente, campo, data[campo])
 
         self.usuario_repo.actualizar_cliente(cliente)
-        logging.info(f"Cliente con DNI {dni} actualizado exitosamente")
+        logger.info("Cliente con DNI %s actualizado exitosamente", dni)
         return cliente.to_dict(), 200
\ No newline at end of file
@@ -1,6 +1,8 @@
 # app/services/validar_reclamo_chatgpt_usecase.py
 from app.services.chatgpt_validar_reclamo_service import ChatGPTValidarReclamoService
+from app.utils.tracing import trazar_metodos
 
+@trazar_metodos
 class ValidarReclamoService:
     def __init__(self, chatgpt_validar_service: ChatGPTValidarReclamoService):
         self.chatgpt_validar_service = chatgpt_validar_service
@@ -1,5 +1,6 @@
 # app/telegram_bot_chatgpt.py
 from app.config.config import Config
+from app.config.logging_config import configurar_logging
 from app.adapters.telegram_adapter_chatgpt import TelegramAdapterChatGPT
 from app.services.detectar_intencion_service import DetectarIntencionService
 from app.services.redis_client import RedisClient
@@ -7,7 +8,8 @@ import logging
 import threading
 import asyncio
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+configurar_logging()
+logger = logging.getLogger(__name__)
 
 
 def run_bot(bot):
@@ -31,7 +33,7 @@ def init_telegram_bot_chatgpt(
     """
     Inicializa el bot de Telegram con ChatGPT y lo integra con la aplicación FastAPI.
     """
-    logging.info("🚀 Iniciando bot de Telegram con ChatGPT...")
+    logger.info("🚀 Iniciando bot de Telegram con ChatGPT...")
 
     # Los casos de uso de reclamos y consultas se instanciarán dentro del adapter si son None
     registrar_reclamo_service = None
@@ -56,4 +58,4 @@ def init_telegram_bot_chatgpt(
     bot_thread.daemon = True  # Hacer que el hilo sea daemon para que se detenga al cerrar la app
     bot_thread.start()
 
-    logging.info("✅ Bot de Telegram con ChatGPT iniciado en un hilo separado.")
\ No newline at end of file
+    logger.info("✅ Bot de Telegram con ChatGPT iniciado en un hilo separado.")
\ No newline at end of file
@@ -0,0 +1,45 @@
+# app/utils/almacen_contenido.py
+import hashlib
+import os
+import tempfile
+
+
+class AlmacenContenido:
+    """
+    Almacén direccionado por contenido sobre un directorio local.
+
+    Cada objeto se guarda como <sha256[:2]>/<sha256>.<extension>, igual que una clave
+    en un bucket, así que el mismo contenido nunca se escribe dos veces y cambiar a un
+    object store real solo requiere otra implementación de `guardar`/`existe`/`leer`.
+    """
+
+    def __init__(self, directorio: str):
+        self.directorio = directorio
+        os.makedirs(directorio, exist_ok=True)
+
+    def clave(self, sha256: str, extension: str) -> str:
+        return f"{sha256[:2]}/{sha256}.{extension}"
+
+    def ruta(self, sha256: str, extension: str) -> str:
+        return os.path.join(self.directorio, self.clave(sha256, extension))
+
+    def existe(self, sha256: str, extension: str) -> bool:
+        return os.path.exists(self.ruta(sha256, extension))
+
+    def guardar(self, datos: bytes, extension: str) -> str:
+        """Guarda los bytes (si no estaban) y devuelve su sha256."""
+        sha256 = hashlib.sha256(datos).hexdigest()
+        destino = self.ruta(sha256, extension)
+        if os.path.exists(destino):
+            return sha256
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        # Escritura atómica: varios procesos pueden guardar el mismo objeto a la vez
+        fd, temporal = tempfile.mkstemp(dir=os.path.dirname(destino), suffix=".tmp")
+        with os.fdopen(fd, "wb") as archivo:
+            archivo.write(datos)
+        os.replace(temporal, destino)
+        return sha256
+
+    def leer(self, sha256: str, extension: str) -> bytes:
+        with open(self.ruta(sha256, extension), "rb") as archivo:
+            return archivo.read()
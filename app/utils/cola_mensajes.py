@@ -0,0 +1,85 @@
+# app/utils/cola_mensajes.py
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict
+
+from app.config.config import Config
+from app.utils import tracing
+
+logger = logging.getLogger(__name__)
+
+
+class ColaMensajes:
+    """
+    Cola en memoria para responder rápido a los webhooks de los canales.
+
+    La ruta solo valida y encola el payload; un grupo fijo de workers lo procesa
+    después. Así Telegram, WhatsApp y Chattigo reciben el 200 sin esperar a la IA
+    ni a la base, y no reintentan la entrega por timeout.
+    """
+
+    def __init__(self, nombre: str, workers: int = None, max_pendientes: int = None):
+        self.nombre = nombre
+        self.workers = workers or Config.COLA_MENSAJES_WORKERS
+        self.max_pendientes = max_pendientes or Config.COLA_MENSAJES_MAX
+        self._cola = None
+        self._tareas = []
+
+    def _iniciar(self):
+        # La cola se crea dentro del loop de la app (no al importar el módulo).
+        self._cola = asyncio.Queue(maxsize=self.max_pendientes)
+        self._tareas = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info("✅ Cola '%s' iniciada con %s workers.", self.nombre, self.workers)
+
+    def encolar(self, procesar: Callable[..., Awaitable], *args) -> bool:
+        """Encola un trabajo. Devuelve False si la cola está llena."""
+        if self._cola is None:
+            self._iniciar()
+        try:
+            # El span de la petición viaja con el trabajo para que el worker continúe la traza
+            self._cola.put_nowait((procesar, args, tracing.span_actual()))
+            return True
+        except asyncio.QueueFull:
+            logger.warning("⚠️ Cola '%s' llena (%s pendientes), se rechaza el mensaje.", self.nombre, self.max_pendientes)
+            return False
+
+    def pendientes(self) -> int:
+        return self._cola.qsize() if self._cola is not None else 0
+
+    async def _worker(self, numero: int):
+        while True:
+            procesar, args, span_padre = await self._cola.get()
+            try:
+                with tracing.adjuntar(span_padre):
+                    await procesar(*args)
+            except Exception as e:
+                logger.error("❌ Error en worker %s de la cola '%s': %s", numero, self.nombre, e)
+            finally:
+                self._cola.task_done()
+
+    async def detener(self):
+        """Espera a que se vacíe la cola y cancela los workers."""
+        if self._cola is None:
+            return
+        await self._cola.join()
+        for tarea in self._tareas:
+            tarea.cancel()
+        await asyncio.gather(*self._tareas, return_exceptions=True)
+        self._cola = None
+        self._tareas = []
+        logger.info("🛑 Cola '%s' detenida.", self.nombre)
+
+
+_colas: Dict[str, ColaMensajes] = {}
+
+
+def get_cola(nombre: str) -> ColaMensajes:
+    """Devuelve la cola del canal, creándola la primera vez."""
+    if nombre not in _colas:
+        _colas[nombre] = ColaMensajes(nombre)
+    return _colas[nombre]
+
+
+async def detener_colas():
+    for cola in _colas.values():
+        await cola.detener()
@@ -1,101 +1,173 @@
 # app/utils/factura_generator.py
-import os
+import io
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
-import time
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
 import logging
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+from app.config.config import Config
+
+logger = logging.getLogger(__name__)
 
-BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-STATIC_DIR = os.path.join(BASE_DIR, "static")
 FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"  # Ajusta si usas Windows o Mac
+ANCHO, ALTO = 600, 800
+MARGEN_X = 40
+INTERLINEA = 30
+RESOLUCION_PDF = 72.0  # 1 px = 1 punto: la página PDF mide lo mismo que la imagen
+
+# Filas de la factura: (etiqueta fija, función que arma el valor) o (título de sección, None).
+# Las etiquetas y títulos van en la plantilla; por factura solo se dibujan los valores.
+FILAS = (
+    ("Titular: ", lambda f, dni: f.get("Nombre")),
+    ("DNI: ", lambda f, dni: dni),
+    ("▌ DATOS DE FACTURACIÓN", None),
+    ("N° de cuenta: ", lambda f, dni: f.get("CodigoSuministro")),
+    ("N° Comprobante: ", lambda f, dni: f.get("NumeroComprobante")),
+    ("Fecha de Emisión: ", lambda f, dni: safe_fecha(f.get("FechaEmision"))),
+    ("Estado: ", lambda f, dni: _campo(f, "Estado", "EstadoFactura")),
+    ("Importe Total: $", lambda f, dni: safe_decimal(_campo(f, "Total", "TotalFactura"))),
+    ("Vencimiento: ", lambda f, dni: safe_fecha(_campo(f, "Vencimiento", "VencimientoFactura"))),
+    ("▌ UBICACIÓN", None),
+    ("Dirección: ", lambda f, dni: f"{f.get('Calle')}, {f.get('Barrio')}"),
+    ("Observación Postal: ", lambda f, dni: f.get("ObservacionPostal")),
+    ("▌ INFORMACIÓN DEL SUMINISTRO", None),
+    ("N° de Medidor: ", lambda f, dni: f.get("NumeroMedidor")),
+    ("Periodo: ", lambda f, dni: f.get("Periodo")),
+    ("Consumo: ", lambda f, dni: f"{safe_decimal(f.get('Consumo'))} kWh"),
+)
+Y_PRIMERA_FILA = 100
+
 
 def safe_decimal(valor):
     try:
-        return f"{Decimal(valor):.2f}"
-    except (InvalidOperation, TypeError):
+        return f"{Decimal(str(valor)):.2f}"
+    except (InvalidOperation, TypeError, ValueError):
         return "No disponible"
 
-def safe_fecha(fecha_str):
+
+def safe_fecha(fecha):
+    """Acepta datetime, texto ISO o una fecha ya formateada dd/mm/aaaa (salida de ConsultarFacturasService)."""
+    if isinstance(fecha, datetime):
+        return fecha.strftime("%d/%m/%Y")
     try:
-        return datetime.fromisoformat(fecha_str).strftime("%d/%m/%Y")
+        return datetime.fromisoformat(fecha).strftime("%d/%m/%Y")
     except (ValueError, TypeError):
-        return "No disponible"
+        try:
+            return datetime.strptime(fecha, "%d/%m/%Y").strftime("%d/%m/%Y")
+        except (ValueError, TypeError):
+            return "No disponible"
+
 
-def generate_factura_image(factura=None, dni=None):
+def _campo(factura: dict, clave: str, clave_db1: str):
+    # La factura puede venir ya formateada por ConsultarFacturasService o cruda desde PR_CAU
+    valor = factura.get(clave)
+    if valor is None:
+        valor = factura.get(clave_db1)
+        if clave_db1 == "EstadoFactura" and valor is not None:
+            valor = "Pagada" if valor == "P" else "Pendiente"
+    return valor
+
+
+@lru_cache(maxsize=1)
+def _fuentes():
     try:
-        factura = factura or {
-            'NumeroComprobante': 123456,
-            'Periodo': '04/2024',
-            'TotalFactura': '157.89',
-            'FechaEmision': '2024-04-01T00:00:00',
-            'VencimientoFactura': '2024-04-15T00:00:00',
-            'Nombre': 'AGUILAR CARMEN',
-            'CodigoSuministro': 1435,
-            'EstadoFactura': 'P',
-            'Calle': 'LAPRIDA',
-            'Barrio': 'CENTRO',
-            'ObservacionPostal': 'Suministro: 19041001 BARRIO: CENTRO',
-            'NumeroMedidor': '01084469',
-            'Consumo': '110.00'
-        }
-
-        dni = dni or '8067472'
-        timestamp = int(time.time())
-        image_filename = f"factura_{timestamp}.png"
-        image_path = os.path.join(STATIC_DIR, image_filename)
-
-        # Crear imagen base
-        width, height = 600, 800
-        image = Image.new("RGB", (width, height), "white")
-        draw = ImageDraw.Draw(image)
-
-        # Cargar fuente
-        try:
-            font_title = ImageFont.truetype(FONT_PATH, 24)
-            font = ImageFont.truetype(FONT_PATH, 18)
-        except IOError:
-            font_title = font = ImageFont.load_default()
-
-        y = 20
-        draw.text((width//2 - 180, y), "Factura de Servicios Eléctricos", fill="black", font=font_title)
-        y += 40
-        draw.text((width//2 - 130, y), "Distribuidora Eléctrica de Caucete S.A.", fill="black", font=font)
-        y += 40
-
-        def line(text):
-            nonlocal y
-            draw.text((40, y), text, fill="black", font=font)
-            y += 30
-
-        # Datos
-        line(f"Titular: {factura.get('Nombre')}")
-        line(f"DNI: {dni}")
-        line(f"▌ DATOS DE FACTURACIÓN")
-        line(f"N° de cuenta: {factura.get('CodigoSuministro')}")
-        line(f"N° Comprobante: {factura.get('NumeroComprobante')}")
-        line(f"Fecha de Emisión: {safe_fecha(factura.get('FechaEmision'))}")
-        line(f"Estado: {factura.get('EstadoFactura')}")
-        line(f"Importe Total: ${safe_decimal(factura.get('TotalFactura'))}")
-        line(f"Vencimiento: {safe_fecha(factura.get('VencimientoFactura'))}")
-        line(f"▌ UBICACIÓN")
-        line(f"Dirección: {factura.get('Calle')}, {factura.get('Barrio')}")
-        line(f"Observación Postal: {factura.get('ObservacionPostal')}")
-        line(f"▌ INFORMACIÓN DEL SUMINISTRO")
-        line(f"N° de Medidor: {factura.get('NumeroMedidor')}")
-        line(f"Periodo: {factura.get('Periodo')}")
-        line(f"Consumo: {safe_decimal(factura.get('Consumo'))} kWh")
-
-        # Footer
-        y += 40
-        draw.text((40, y), "Gracias por elegir DECSA. Si tienes consultas, contáctanos.", fill="gray", font=font)
-
-        image.save(image_path)
-        logging.info(f"Factura generada en {image_path}")
-        return image_path
+        return ImageFont.truetype(FONT_PATH, 24), ImageFont.truetype(FONT_PATH, 18)
+    except IOError:
+        logger.warning("No se encontró %s, se usa la fuente por defecto de Pillow", FONT_PATH)
+        fuente = ImageFont.load_default()
+        return fuente, fuente
+
+
+class RenderizadorFacturas:
+    """
+    Dibuja la imagen PNG de una factura en memoria.
+
+    Las fuentes, los títulos, las etiquetas y el pie se dibujan una sola vez en una
+    plantilla; cada factura copia la plantilla y agrega solo los valores. El PNG
+    resultante se guarda en un LRU por (NumeroComprobante, DNI), junto con una
+    huella de los datos para volver a dibujarlo si la factura cambió (p. ej. se pagó).
+    """
+
+    def __init__(self, max_cache: int = None):
+        self.max_cache = max_cache if max_cache is not None else Config.FACTURA_IMAGEN_CACHE_MAX
+        self.font_title, self.font = _fuentes()
+        self._x_valores = []
+        self.plantilla = self._dibujar_plantilla()
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
 
+    def _dibujar_plantilla(self) -> Image.Image:
+        plantilla = Image.new("RGB", (ANCHO, ALTO), "white")
+        draw = ImageDraw.Draw(plantilla)
+        draw.text((ANCHO // 2 - 180, 20), "Factura de Servicios Eléctricos", fill="black", font=self.font_title)
+        draw.text((ANCHO // 2 - 130, 60), "Distribuidora Eléctrica de Caucete S.A.", fill="black", font=self.font)
+
+        y = Y_PRIMERA_FILA
+        for etiqueta, _ in FILAS:
+            draw.text((MARGEN_X, y), etiqueta, fill="black", font=self.font)
+            self._x_valores.append(MARGEN_X + int(draw.textlength(etiqueta, font=self.font)))
+            y += INTERLINEA
+
+        draw.text((MARGEN_X, y + 40), "Gracias por elegir DECSA. Si tienes consultas, contáctanos.", fill="gray", font=self.font)
+        return plantilla
+
+    def render(self, factura: dict, dni: str) -> bytes:
+        clave = (str(factura.get("NumeroComprobante")), str(dni))
+        huella = hash(tuple(sorted((k, str(v)) for k, v in factura.items())))
+        with self._lock:
+            en_cache = self._cache.get(clave)
+            if en_cache is not None and en_cache[0] == huella:
+                self._cache.move_to_end(clave)
+                return en_cache[1]
+
+        png = self.dibujar(factura, dni)
+        with self._lock:
+            self._cache[clave] = (huella, png)
+            self._cache.move_to_end(clave)
+            while len(self._cache) > self.max_cache:
+                self._cache.popitem(last=False)
+        return png
+
+    def dibujar(self, factura: dict, dni: str, formato: str = "PNG") -> bytes:
+        """Dibuja la factura sin pasar por el caché. `formato` es "PNG" o "PDF"."""
+        imagen = self.plantilla.copy()
+        draw = ImageDraw.Draw(imagen)
+        y = Y_PRIMERA_FILA
+        for (_, valor), x in zip(FILAS, self._x_valores):
+            if valor is not None:
+                draw.text((x, y), str(valor(factura, dni)), fill="black", font=self.font)
+            y += INTERLINEA
+
+        buffer = io.BytesIO()
+        if formato == "PDF":
+            imagen.save(buffer, format="PDF", resolution=RESOLUCION_PDF)
+        else:
+            imagen.save(buffer, format="PNG")
+        logger.debug("Factura %s renderizada en %s (%d bytes)", factura.get("NumeroComprobante"), formato, buffer.tell())
+        return buffer.getvalue()
+
+
+_renderizador = None
+_renderizador_lock = threading.Lock()
+
+
+def get_renderizador() -> RenderizadorFacturas:
+    """Renderizador compartido; se crea al iniciar la app (init_factura_services) o en el primer uso."""
+    global _renderizador
+    if _renderizador is None:
+        with _renderizador_lock:
+            if _renderizador is None:
+                _renderizador = RenderizadorFacturas()
+    return _renderizador
+
+
+def generate_factura_image(factura: dict, dni: str) -> bytes:
+    """Devuelve el PNG de la factura como bytes, listo para servir o subir al canal."""
+    try:
+        return get_renderizador().render(factura, dni)
     except Exception as e:
-        logging.error(f"Error generando factura: {str(e)}")
+        logger.error("Error generando factura: %s", e)
         raise
@@ -0,0 +1,49 @@
+# app/utils/memo_turno.py
+"""
+Memo de resultados de repositorio por turno de conversación.
+
+Dentro de `with memo_turno():` la misma lectura (repositorio, método y argumentos)
+se resuelve una sola vez, aunque la pidan varios servicios: cliente por DNI,
+reclamos por usuario, filas de PR_CAU. Cada instancia de repositorio tiene sus
+propias entradas, así los objetos ORM de una sesión no se entregan en otra. Cualquier escritura llama a `invalidar_memo()` para que
+lo que se lea después refleje el cambio. Fuera de un turno no se memoriza nada.
+
+El memo vive en un ContextVar, así que también lo ven las llamadas que se hacen
+con asyncio.to_thread desde el turno.
+"""
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+_memo: ContextVar[Optional[dict]] = ContextVar("memo_turno", default=None)
+
+
+@contextmanager
+def memo_turno():
+    token = _memo.set({})
+    try:
+        yield
+    finally:
+        _memo.reset(token)
+
+
+def memorizar(funcion):
+    """Decorador de método de lectura de un repositorio."""
+    @functools.wraps(funcion)
+    def envoltura(self, *args, **kwargs):
+        memo = _memo.get()
+        if memo is None:
+            return funcion(self, *args, **kwargs)
+        # `self` en la clave (por identidad): el memo lo mantiene vivo durante el turno
+        clave = (self, funcion.__qualname__, args, tuple(sorted(kwargs.items())))
+        if clave not in memo:
+            memo[clave] = funcion(self, *args, **kwargs)
+        return memo[clave]
+    return envoltura
+
+
+def invalidar_memo():
+    memo = _memo.get()
+    if memo is not None:
+        memo.clear()
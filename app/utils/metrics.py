@@ -0,0 +1,422 @@
+# app/utils/metrics.py
+"""
+Métricas en formato de exposición de Prometheus, sin dependencias externas.
+
+Se exponen en GET /metrics (app/routes/metrics_routes.py). Familias:
+- http_request_duration_seconds: latencia por ruta (middleware en main.py).
+- openai_request_duration_seconds / openai_errors_total: llamadas a OpenAI por servicio.
+- llm_cache_requests_total: aciertos y fallos de los cachés de respuestas del LLM.
+- db_query_duration_seconds: sentencias SQL de DB1/DB2 por método de repositorio.
+- redis_command_duration_seconds: comandos Redis (incluye pipelines).
+- channel_send_duration_seconds / channel_send_errors_total: envíos salientes por canal.
+- db_pool_connections: uso del pool de conexiones de cada motor.
+- db_pool_checkout_wait_seconds / db_pool_events_total: espera para obtener una conexión del
+  pool y eventos del pool (conexión nueva, checkout en overflow, invalidación, timeout).
+- db_replica_reads_total: lecturas ruteadas a la réplica o al primario (app/database/replica.py).
+"""
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Tuple
+
+from app.utils import tracing
+
+BUCKETS_DEFECTO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _etiquetas_texto(nombres: Tuple[str, ...], valores: Tuple[str, ...], extra: str = "") -> str:
+    pares = [f'{n}="{_escapar(v)}"' for n, v in zip(nombres, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metrica:
+    tipo = ""
+
+    def __init__(self, nombre: str, descripcion: str, etiquetas: Tuple[str, ...] = ()):
+        self.nombre = nombre
+        self.descripcion = descripcion
+        self.etiquetas = tuple(etiquetas)
+        self._lock = threading.Lock()
+
+    def _clave(self, etiquetas: dict) -> Tuple[str, ...]:
+        return tuple(str(etiquetas.get(n, "")) for n in self.etiquetas)
+
+    def exponer(self):
+        yield f"# HELP {self.nombre} {self.descripcion}"
+        yield f"# TYPE {self.nombre} {self.tipo}"
+        yield from self._muestras()
+
+
+class Contador(_Metrica):
+    tipo = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._valores: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, cantidad: float = 1, **etiquetas):
+        clave = self._clave(etiquetas)
+        with self._lock:
+            self._valores[clave] = self._valores.get(clave, 0) + cantidad
+
+    def valor(self, **etiquetas) -> float:
+        return self._valores.get(self._clave(etiquetas), 0)
+
+    def _muestras(self):
+        for clave, valor in sorted(self._valores.items()):
+            yield f"{self.nombre}_total{_etiquetas_texto(self.etiquetas, clave)} {valor}"
+
+
+class Medidor(_Metrica):
+    """Gauge. Si se define `recolectar`, los valores se calculan al momento de exponer."""
+    tipo = "gauge"
+
+    def __init__(self, *args, recolectar: Callable[[], Dict[Tuple[str, ...], float]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._valores: Dict[Tuple[str, ...], float] = {}
+        self.recolectar = recolectar
+
+    def set(self, valor: float, **etiquetas):
+        with self._lock:
+            self._valores[self._clave(etiquetas)] = valor
+
+    def _muestras(self):
+        valores = dict(self._valores)
+        if self.recolectar:
+            valores.update(self.recolectar())
+        for clave, valor in sorted(valores.items()):
+            yield f"{self.nombre}{_etiquetas_texto(self.etiquetas, clave)} {valor}"
+
+
+class Histograma(_Metrica):
+    tipo = "histogram"
+
+    def __init__(self, *args, buckets: Tuple[float, ...] = BUCKETS_DEFECTO, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observar(self, valor: float, **etiquetas):
+        clave = self._clave(etiquetas)
+        indice = bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._series.get(clave)
+            if serie is None:
+                # [conteos por bucket (no acumulados)..., +Inf], suma
+                serie = self._series[clave] = [[0] * (len(self.buckets) + 1), 0.0]
+            serie[0][indice] += 1
+            serie[1] += valor
+
+    def cronometrar(self, errores: Contador = None, span: str = None, **etiquetas):
+        return _Cronometro(self, errores, etiquetas, span)
+
+    def _muestras(self):
+        for clave, (conteos, suma) in sorted(self._series.items()):
+            acumulado = 0
+            for limite, conteo in zip(self.buckets + (float("inf"),), conteos):
+                acumulado += conteo
+                le = 'le="+Inf"' if limite == float("inf") else f'le="{limite!r}"'
+                yield f"{self.nombre}_bucket{_etiquetas_texto(self.etiquetas, clave, le)} {acumulado}"
+            yield f"{self.nombre}_sum{_etiquetas_texto(self.etiquetas, clave)} {suma}"
+            yield f"{self.nombre}_count{_etiquetas_texto(self.etiquetas, clave)} {acumulado}"
+
+
+class _Cronometro:
+    """
+    Mide la duración de un bloque; sirve como context manager o decorador (sync o async).
+    Si se indica `span`, el bloque también queda registrado como span de la traza en curso.
+    """
+
+    def __init__(self, histograma: Histograma, errores: Contador, etiquetas: dict, span: str = None):
+        self.histograma = histograma
+        self.errores = errores
+        self.etiquetas = etiquetas
+        self.span = span
+
+    def __enter__(self):
+        self._span = tracing.span(self.span) if self.span else None
+        if self._span:
+            self._span.__enter__()
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo_exc, exc, tb):
+        self.histograma.observar(time.perf_counter() - self._inicio, **self.etiquetas)
+        if tipo_exc is not None and self.errores is not None:
+            self.errores.inc(**self.etiquetas)
+        if self._span:
+            self._span.__exit__(tipo_exc, exc, tb)
+        return False
+
+    def __call__(self, funcion):
+        if asyncio.iscoroutinefunction(funcion):
+            @functools.wraps(funcion)
+            async def envoltura_async(*args, **kwargs):
+                with _Cronometro(self.histograma, self.errores, self.etiquetas, self.span):
+                    return await funcion(*args, **kwargs)
+            return envoltura_async
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with _Cronometro(self.histograma, self.errores, self.etiquetas, self.span):
+                return funcion(*args, **kwargs)
+        return envoltura
+
+
+class Registro:
+    def __init__(self):
+        self._metricas: Dict[str, _Metrica] = {}
+
+    def registrar(self, metrica: _Metrica) -> _Metrica:
+        self._metricas[metrica.nombre] = metrica
+        return metrica
+
+    def exponer(self) -> str:
+        lineas = []
+        for metrica in self._metricas.values():
+            lineas.extend(metrica.exponer())
+        return "\n".join(lineas) + "\n"
+
+
+REGISTRO = Registro()
+
+HTTP_DURACION = REGISTRO.registrar(Histograma(
+    "http_request_duration_seconds", "Latencia de las peticiones HTTP por ruta.", ("metodo", "ruta", "estado")))
+OPENAI_DURACION = REGISTRO.registrar(Histograma(
+    "openai_request_duration_seconds", "Latencia de las llamadas a OpenAI por servicio.", ("servicio",)))
+OPENAI_ERRORES = REGISTRO.registrar(Contador(
+    "openai_errors", "Llamadas a OpenAI que terminaron en excepción.", ("servicio",)))
+CACHE_LLM = REGISTRO.registrar(Contador(
+    "llm_cache_requests", "Consultas a los cachés de respuestas del LLM.", ("servicio", "resultado")))
+DB_DURACION = REGISTRO.registrar(Histograma(
+    "db_query_duration_seconds", "Latencia de las sentencias SQL por base, método de repositorio y resultado (ok, error).",
+    ("db", "metodo", "resultado")))
+REDIS_DURACION = REGISTRO.registrar(Histograma(
+    "redis_command_duration_seconds", "Latencia de los comandos Redis.", ("comando",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)))
+ENVIO_DURACION = REGISTRO.registrar(Histograma(
+    "channel_send_duration_seconds", "Latencia de los envíos salientes por canal.", ("canal",)))
+ENVIO_ERRORES = REGISTRO.registrar(Contador(
+    "channel_send_errors", "Envíos salientes que fallaron por canal.", ("canal",)))
+CLIENTES_COPIADOS_EN_REQUEST = REGISTRO.registrar(Contador(
+    "clientes_copied_on_request", "Clientes copiados de PR_CAU a DECSA_EXC durante un request (sin sincronizar)."))
+DB_POOL_ESPERA = REGISTRO.registrar(Histograma(
+    "db_pool_checkout_wait_seconds", "Espera para obtener una conexión del pool por base.", ("db",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)))
+DB_POOL_EVENTOS = REGISTRO.registrar(Contador(
+    "db_pool_events", "Eventos del pool por base (conexion_nueva, overflow, invalidada, invalidada_suave, timeout).",
+    ("db", "evento")))
+DB_REPLICA_LECTURAS = REGISTRO.registrar(Contador(
+    "db_replica_reads", "Lecturas de solo lectura por base, destino (replica, primario) y motivo (sana, retraso, caida).",
+    ("db", "destino", "motivo")))
+RECLAMOS_CORTE = REGISTRO.registrar(Contador(
+    "outage_reclamos", "Reclamos de modo corte por resultado (incidente_abierto, absorbido, volcado, error_volcado, "
+    "fallido).",
+    ("resultado",)))
+RECLAMOS_DUPLICADOS = REGISTRO.registrar(Contador(
+    "reclamo_duplicates", "Reclamos reenviados que se resolvieron con el reclamo abierto existente (bot, api).",
+    ("origen",)))
+FILTRO_DNI = REGISTRO.registrar(Contador(
+    "dni_filter_lookups", "Búsquedas de DNI por resultado del filtro previo a SQL (cache_negativo, bloom, consulta).",
+    ("resultado",)))
+
+# === Helpers de instrumentación ===
+
+class MiddlewareMetricasHTTP:
+    """
+    Middleware ASGI que mide cada petición HTTP. La ruta se etiqueta con la plantilla
+    del endpoint (p. ej. /api/reclamos/{id_reclamo}) para no crear una serie por ID.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        estado = {"codigo": 500}
+
+        async def send_con_estado(mensaje):
+            if mensaje["type"] == "http.response.start":
+                estado["codigo"] = mensaje["status"]
+            await send(mensaje)
+
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_con_estado)
+        finally:
+            ruta = scope.get("route")
+            HTTP_DURACION.observar(
+                time.perf_counter() - inicio,
+                metodo=scope["method"],
+                ruta=getattr(ruta, "path", "sin_ruta"),
+                estado=estado["codigo"],
+            )
+
+
+def medir_openai(servicio: str):
+    return OPENAI_DURACION.cronometrar(OPENAI_ERRORES, span=f"openai.{servicio}", servicio=servicio)
+
+
+def registrar_cache_llm(servicio: str, acierto: bool):
+    CACHE_LLM.inc(servicio=servicio, resultado="hit" if acierto else "miss")
+
+
+def medir_envio(canal: str):
+    return ENVIO_DURACION.cronometrar(ENVIO_ERRORES, span=f"send_message.{canal}", canal=canal)
+
+
+# Método de repositorio en curso, para etiquetar las sentencias SQL que dispara.
+_metodo_repositorio: ContextVar[str] = ContextVar("metodo_repositorio", default="sin_repositorio")
+
+
+def instrumentar_repositorio(cls):
+    """
+    Decorador de clase: cada método público del repositorio queda registrado como
+    contexto de las sentencias SQL que ejecuta (etiqueta `metodo` de db_query_duration_seconds)
+    y abre un span con el mismo nombre.
+    """
+    for nombre, atributo in list(vars(cls).items()):
+        if nombre.startswith("_") or not inspect.isfunction(atributo):
+            continue
+        setattr(cls, nombre, _con_metodo(f"{cls.__name__}.{nombre}", atributo))
+    return cls
+
+
+def _con_metodo(etiqueta: str, funcion):
+    if inspect.isgeneratorfunction(funcion):
+        # Las consultas de un generador corren en cada next(), fuera de la llamada original
+        @functools.wraps(funcion)
+        def envoltura_generador(*args, **kwargs):
+            generador = funcion(*args, **kwargs)
+            while True:
+                token = _metodo_repositorio.set(etiqueta)
+                try:
+                    elemento = next(generador)
+                except StopIteration:
+                    return
+                finally:
+                    _metodo_repositorio.reset(token)
+                yield elemento
+        return envoltura_generador
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        token = _metodo_repositorio.set(etiqueta)
+        try:
+            with tracing.span(etiqueta):
+                return funcion(*args, **kwargs)
+        finally:
+            _metodo_repositorio.reset(token)
+    return envoltura
+
+
+def instrumentar_engine(engine, db: str):
+    """Mide cada sentencia SQL del motor y publica el uso de su pool."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _antes(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_inicio_sentencia", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _despues(conn, cursor, statement, parameters, context, executemany):
+        inicio = conn.info["_inicio_sentencia"].pop()
+        DB_DURACION.observar(time.perf_counter() - inicio, db=db, metodo=_metodo_repositorio.get(), resultado="ok")
+
+    @event.listens_for(engine, "handle_error")
+    def _error(contexto):
+        # Sin esto la sentencia fallida (o cortada por timeout) no se mide y su inicio queda en la conexión
+        conexion = contexto.connection
+        if contexto.cursor is None or conexion is None or not conexion.info.get("_inicio_sentencia"):
+            return
+        inicio = conexion.info["_inicio_sentencia"].pop()
+        DB_DURACION.observar(time.perf_counter() - inicio, db=db, metodo=_metodo_repositorio.get(), resultado="error")
+
+    @event.listens_for(engine, "connect")
+    def _conexion_nueva(dbapi_connection, connection_record):
+        DB_POOL_EVENTOS.inc(db=db, evento="conexion_nueva")
+
+    @event.listens_for(engine, "invalidate")
+    def _invalidada(dbapi_connection, connection_record, exception):
+        DB_POOL_EVENTOS.inc(db=db, evento="invalidada")
+
+    @event.listens_for(engine, "soft_invalidate")
+    def _invalidada_suave(dbapi_connection, connection_record, exception):
+        DB_POOL_EVENTOS.inc(db=db, evento="invalidada_suave")
+
+    # El QueuePoolMedido de app/database/database.py usa la etiqueta para la espera y el overflow
+    engine.pool.etiqueta_db = db
+    _POOLS[db] = engine
+
+
+_POOLS = {}
+
+
+def _recolectar_pools():
+    valores = {}
+    for db, engine in _POOLS.items():
+        # engine.dispose() reemplaza el pool: se lee siempre el actual
+        pool = engine.pool
+        # Solo QueuePool expone estos contadores; otros pools (SQLite fake) se omiten.
+        if not hasattr(pool, "checkedout"):
+            continue
+        valores[(db, "en_uso")] = pool.checkedout()
+        valores[(db, "libres")] = pool.checkedin()
+        valores[(db, "overflow")] = max(pool.overflow(), 0)
+        valores[(db, "tamano")] = pool.size()
+    return valores
+
+
+DB_POOL = REGISTRO.registrar(Medidor(
+    "db_pool_connections", "Conexiones del pool por base y estado.", ("db", "estado"), recolectar=_recolectar_pools))
+
+
+class RedisInstrumentado:
+    """Proxy del cliente redis-py que mide la latencia de cada comando y abre su span."""
+
+    def __init__(self, cliente):
+        self._cliente = cliente
+
+    def __getattr__(self, nombre):
+        atributo = getattr(self._cliente, nombre)
+        if nombre == "pipeline":
+            return lambda *args, **kwargs: _PipelineInstrumentado(atributo(*args, **kwargs))
+        if not callable(atributo) or nombre.startswith("_") or nombre in ("register_script", "connection_pool"):
+            return atributo
+
+        @functools.wraps(atributo)
+        def comando(*args, **kwargs):
+            with REDIS_DURACION.cronometrar(span=f"redis.{nombre}", comando=nombre):
+                return atributo(*args, **kwargs)
+        return comando
+
+
+class _PipelineInstrumentado:
+    def __init__(self, pipeline):
+        self._pipeline = pipeline
+
+    def __getattr__(self, nombre):
+        return getattr(self._pipeline, nombre)
+
+    def __enter__(self):
+        self._pipeline.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._pipeline.__exit__(*exc)
+
+    def execute(self, *args, **kwargs):
+        with REDIS_DURACION.cronometrar(span="redis.pipeline", comando="pipeline"):
+            return self._pipeline.execute(*args, **kwargs)
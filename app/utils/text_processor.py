@@ -1,26 +1,64 @@
 # app/utils/text_processor.py
 import re
 import logging
+from typing import Iterable, List
+
+logger = logging.getLogger(__name__)
+
+# === Reglas compiladas una sola vez al importar el módulo ===
+
+# Palabras que empiezan con k / z / x: se corrige toda la palabra según su letra inicial.
+_PALABRA_KZX = re.compile(r'\b[kzx]\w*')
+_TRADUCCION_INICIAL = {
+    'k': str.maketrans({'k': 'qu'}),
+    'z': str.maketrans({'z': 's'}),
+    'x': str.maketrans({'x': 's'}),
+}
+
+# Palabras clave del dominio, combinadas en una única alternancia (mismo orden que las reglas originales).
+_PALABRAS_CLAVE = re.compile(
+    r'(?P<quiero>\b(?:k|q)uier[oa]|kere\b)'
+    r'|(?P<actualizar>\b(?:ak|ac)tua(?:l|ll)?(?:l|ll)?iz(?:ar|er)|aktuali[zs]ar\b)'
+    r'|(?P<reclamo>\b(?:rek|rec|rel)al[mo]|reclamoo?\b)'
+    r'|(?P<consultar>\b(?:kom|con|kol)sul(?:tar|tar)|consul[dt]ar\b)'
+    r'|(?P<hacer>\b(?:ha|as)cer|aser\b)'
+    r'|(?P<direccion>\b(?:direk|dier|dir)ec(?:c|k)ion|direcsion\b)'
+    r'|(?P<estado>\b(?:est|es)tadoo?\b)'
+)
+
+_VOCAL_DUPLICADA = re.compile(r'\b(\w*?)([aeiou])\2(\w*)')
+_INVERSION_RE = re.compile(r'(\w)r(\w)e')
+
+
+def _corregir_inicial(match: re.Match) -> str:
+    palabra = match.group(0)
+    return palabra.translate(_TRADUCCION_INICIAL[palabra[0]])
+
+
+def _reemplazar_palabra_clave(match: re.Match) -> str:
+    return match.lastgroup
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 def preprocess_text(text):
     """
     Preprocesa el texto para corregir errores ortográficos comunes usando regex.
     """
-    logging.info(f"Preprocesando texto original: {text}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Preprocesando texto original: %s", text)
     text = text.lower()
-    text = re.sub(r'\bk\w*', lambda m: m.group(0).replace('k', 'qu') if 'k' in m.group(0) else m.group(0).replace('k', 'c'), text)
-    text = re.sub(r'\bz\w*', lambda m: m.group(0).replace('z', 's') if 'z' in m.group(0) else m.group(0), text)
-    text = re.sub(r'\bx\w*', lambda m: m.group(0).replace('x', 's') if 'x' in m.group(0) else m.group(0).replace('x', 'j'), text)
-    text = re.sub(r'\b(k|q)uier[oa]|kere\b', 'quiero', text)
-    text = re.sub(r'\b(ak|ac)tua(l|ll)?(l|ll)?iz(ar|er)|aktuali[zs]ar\b', 'actualizar', text)
-    text = re.sub(r'\b(rek|rec|rel)al[mo]|reclamoo?\b', 'reclamo', text)
-    text = re.sub(r'\b(kom|con|kol)sul(tar|tar)|consul[dt]ar\b', 'consultar', text)
-    text = re.sub(r'\b(ha|as)cer|aser\b', 'hacer', text)
-    text = re.sub(r'\b(direk|dier|dir)ec(c|k)ion|direcsion\b', 'direccion', text)
-    text = re.sub(r'\b(est|es)tadoo?\b', 'estado', text)
-    text = re.sub(r'(\w*?)([aeiou])\2(\w*)', r'\1\2\3', text)
-    text = re.sub(r'(\w)r(\w)e', r'\1er\2', text)
-    logging.info(f"Texto preprocesado: {text}")
-    return text
\ No newline at end of file
+    text = _PALABRA_KZX.sub(_corregir_inicial, text)
+    text = _PALABRAS_CLAVE.sub(_reemplazar_palabra_clave, text)
+    text = _VOCAL_DUPLICADA.sub(r'\1\2\3', text)
+    text = _INVERSION_RE.sub(r'\1er\2', text)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Texto preprocesado: %s", text)
+    return text
+
+
+def preprocess_batch(texts: Iterable[str]) -> List[str]:
+    """
+    Preprocesa una colección de textos (por ejemplo, historial para reprocesamiento offline).
+    """
+    resultado = [preprocess_text(texto) for texto in texts]
+    logger.info("Lote preprocesado: %d textos", len(resultado))
+    return resultado
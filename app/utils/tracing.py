@@ -0,0 +1,317 @@
+# app/utils/tracing.py
+"""
+Trazas livianas ruta → adaptador → servicio → repositorio, sin dependencias externas.
+
+El trace id viaja en un ContextVar, así que los spans anidados (aunque crucen
+asyncio.to_thread o la cola de webhooks) quedan colgados del span que los originó.
+La decisión de muestreo se toma una sola vez, en el span raíz (TRACING_MUESTREO).
+
+Exportadores (TRACING_EXPORTADOR):
+- "archivo": una línea JSON por span en TRACING_ARCHIVO.
+- "otlp": OTLP/HTTP en JSON hacia TRACING_OTLP_ENDPOINT (Jaeger, Tempo, OTel Collector).
+- vacío: trazas desactivadas; `span()` no hace nada.
+"""
+import asyncio
+import atexit
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+import requests
+
+from app.config.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    __slots__ = ("nombre", "trace_id", "span_id", "padre_id", "muestreado", "atributos", "inicio_ns", "fin_ns", "error")
+
+    def __init__(self, nombre: str, trace_id: str, padre_id: Optional[str], muestreado: bool, atributos: dict):
+        self.nombre = nombre
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.padre_id = padre_id
+        self.muestreado = muestreado
+        self.atributos = atributos
+        self.inicio_ns = time.time_ns()
+        self.fin_ns = None
+        self.error = None
+
+    def set(self, **atributos):
+        self.atributos.update(atributos)
+
+    def a_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "padre_id": self.padre_id,
+            "nombre": self.nombre,
+            "inicio_ns": self.inicio_ns,
+            "duracion_ms": round((self.fin_ns - self.inicio_ns) / 1e6, 3),
+            "atributos": self.atributos,
+            "error": self.error,
+        }
+
+
+_span_actual: ContextVar[Optional[Span]] = ContextVar("span_actual", default=None)
+
+
+def span_actual() -> Optional[Span]:
+    return _span_actual.get()
+
+
+def trace_id_actual() -> Optional[str]:
+    actual = _span_actual.get()
+    return actual.trace_id if actual else None
+
+
+@contextmanager
+def adjuntar(padre: Optional[Span]):
+    """Continúa una traza en otro contexto (p. ej. el worker de una cola)."""
+    token = _span_actual.set(padre)
+    try:
+        yield
+    finally:
+        _span_actual.reset(token)
+
+
+class _SpanActivo:
+    """Abre un span al entrar; sirve como context manager o decorador (sync o async)."""
+
+    def __init__(self, nombre: str, atributos: dict, traceparent: str = None):
+        self.nombre = nombre
+        self.atributos = atributos
+        self.traceparent = traceparent
+
+    def __enter__(self) -> Optional[Span]:
+        self._token = None
+        self._span = None
+        if _procesador is None:
+            return None
+        padre = _span_actual.get()
+        if padre is not None:
+            if not padre.muestreado:
+                return padre
+            self._span = Span(self.nombre, padre.trace_id, padre.span_id, True, dict(self.atributos))
+        else:
+            trace_id, padre_id, muestreado = _leer_traceparent(self.traceparent)
+            self._span = Span(self.nombre, trace_id, padre_id, muestreado, dict(self.atributos))
+        self._token = _span_actual.set(self._span)
+        return self._span
+
+    def __exit__(self, tipo_exc, exc, tb):
+        if self._span is None:
+            return False
+        _span_actual.reset(self._token)
+        if self._span.muestreado:
+            self._span.fin_ns = time.time_ns()
+            if exc is not None:
+                self._span.error = f"{tipo_exc.__name__}: {exc}"
+            _procesador.agregar(self._span)
+        return False
+
+    def __call__(self, funcion):
+        if asyncio.iscoroutinefunction(funcion):
+            @functools.wraps(funcion)
+            async def envoltura_async(*args, **kwargs):
+                with _SpanActivo(self.nombre, self.atributos):
+                    return await funcion(*args, **kwargs)
+            return envoltura_async
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with _SpanActivo(self.nombre, self.atributos):
+                return funcion(*args, **kwargs)
+        return envoltura
+
+
+def span(nombre: str, traceparent: str = None, **atributos) -> _SpanActivo:
+    """
+    Abre un span hijo del actual. Si no hay span activo se crea uno raíz y se decide
+    el muestreo; `traceparent` (cabecera W3C) permite continuar una traza externa.
+    """
+    return _SpanActivo(nombre, atributos, traceparent)
+
+
+def trazar_metodos(cls):
+    """Decorador de clase: un span por cada método público, llamado `Clase.metodo`."""
+    for nombre, atributo in list(vars(cls).items()):
+        if nombre.startswith("_") or not inspect.isfunction(atributo):
+            continue
+        setattr(cls, nombre, span(f"{cls.__name__}.{nombre}")(atributo))
+    return cls
+
+
+def _leer_traceparent(traceparent: Optional[str]):
+    # Formato W3C: 00-<trace_id 32 hex>-<span_id 16 hex>-<flags>
+    if traceparent:
+        partes = traceparent.split("-")
+        if len(partes) == 4 and len(partes[1]) == 32 and len(partes[2]) == 16:
+            return partes[1], partes[2], partes[3] == "01"
+    return os.urandom(16).hex(), None, random.random() < Config.TRACING_MUESTREO
+
+
+class MiddlewareTrazas:
+    """Middleware ASGI: abre el span raíz de cada petición HTTP y devuelve el trace id en X-Trace-Id."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or _procesador is None:
+            return await self.app(scope, receive, send)
+
+        cabeceras = dict(scope.get("headers") or [])
+        traceparent = cabeceras.get(b"traceparent", b"").decode("latin-1") or None
+
+        with span(f"HTTP {scope['method']}", traceparent=traceparent, ruta=scope["path"]) as raiz:
+            async def send_con_trace(mensaje):
+                if mensaje["type"] == "http.response.start":
+                    raiz.set(estado=mensaje["status"])
+                    mensaje.setdefault("headers", []).append((b"x-trace-id", raiz.trace_id.encode()))
+                await send(mensaje)
+
+            await self.app(scope, receive, send_con_trace)
+            ruta = scope.get("route")
+            if ruta is not None:
+                raiz.nombre = f"HTTP {scope['method']} {ruta.path}"
+
+
+# === Exportadores ===
+
+class ExportadorArchivo:
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+
+    def exportar(self, spans):
+        with open(self.ruta, "a", encoding="utf-8") as archivo:
+            for s in spans:
+                archivo.write(json.dumps(s.a_dict(), ensure_ascii=False, default=str) + "\n")
+
+
+class ExportadorOTLP:
+    def __init__(self, endpoint: str, servicio: str = "decsa-api"):
+        self.endpoint = endpoint
+        self.servicio = servicio
+        self.session = requests.Session()
+
+    def exportar(self, spans):
+        cuerpo = {"resourceSpans": [{
+            "resource": {"attributes": [_atributo_otlp("service.name", self.servicio)]},
+            "scopeSpans": [{"scope": {"name": "app.utils.tracing"}, "spans": [self._span_otlp(s) for s in spans]}],
+        }]}
+        respuesta = self.session.post(self.endpoint, json=cuerpo, timeout=5)
+        respuesta.raise_for_status()
+
+    @staticmethod
+    def _span_otlp(s: Span) -> dict:
+        otlp = {
+            "traceId": s.trace_id,
+            "spanId": s.span_id,
+            "name": s.nombre,
+            "kind": 1,
+            "startTimeUnixNano": str(s.inicio_ns),
+            "endTimeUnixNano": str(s.fin_ns),
+            "attributes": [_atributo_otlp(k, v) for k, v in s.atributos.items()],
+            "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+        }
+        if s.padre_id:
+            otlp["parentSpanId"] = s.padre_id
+        return otlp
+
+
+def _atributo_otlp(clave: str, valor) -> dict:
+    if isinstance(valor, bool):
+        return {"key": clave, "value": {"boolValue": valor}}
+    if isinstance(valor, int):
+        return {"key": clave, "value": {"intValue": str(valor)}}
+    if isinstance(valor, float):
+        return {"key": clave, "value": {"doubleValue": valor}}
+    return {"key": clave, "value": {"stringValue": str(valor)}}
+
+
+class ProcesadorLotes:
+    """
+    Junta los spans terminados y los exporta desde un hilo aparte, por lotes,
+    para que escribir el archivo o llamar al collector no sume latencia al request.
+    """
+
+    def __init__(self, exportador, max_lote: int = 256, intervalo_s: float = 2.0, max_pendientes: int = 10000):
+        self.exportador = exportador
+        self.max_lote = max_lote
+        self.intervalo_s = intervalo_s
+        self._cola = queue.Queue(maxsize=max_pendientes)
+        self._descartados = 0
+        self._hilo = threading.Thread(target=self._bucle, name="exportador-trazas", daemon=True)
+        self._hilo.start()
+
+    def agregar(self, s: Span):
+        try:
+            self._cola.put_nowait(s)
+        except queue.Full:
+            self._descartados += 1
+
+    def _bucle(self):
+        while True:
+            lote = []
+            limite = time.monotonic() + self.intervalo_s
+            while len(lote) < self.max_lote:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    break
+                try:
+                    s = self._cola.get(timeout=restante)
+                except queue.Empty:
+                    break
+                if s is None:
+                    self._exportar(lote)
+                    return
+                lote.append(s)
+            self._exportar(lote)
+
+    def _exportar(self, lote):
+        if not lote:
+            return
+        try:
+            self.exportador.exportar(lote)
+        except Exception as e:
+            logger.error("❌ Error al exportar %s spans: %s", len(lote), e)
+        if self._descartados:
+            logger.warning("⚠️ Se descartaron %s spans por cola de exportación llena.", self._descartados)
+            self._descartados = 0
+
+    def cerrar(self):
+        self._cola.put(None)
+        self._hilo.join(timeout=5)
+
+
+_procesador: Optional[ProcesadorLotes] = None
+
+
+def configurar_trazas(exportador=None):
+    """Activa las trazas según Config, o con el exportador indicado."""
+    global _procesador
+    if exportador is None:
+        if Config.TRACING_EXPORTADOR == "archivo":
+            exportador = ExportadorArchivo(Config.TRACING_ARCHIVO)
+        elif Config.TRACING_EXPORTADOR == "otlp":
+            exportador = ExportadorOTLP(Config.TRACING_OTLP_ENDPOINT)
+        elif Config.TRACING_EXPORTADOR:
+            raise ValueError(f"❌ TRACING_EXPORTADOR desconocido: {Config.TRACING_EXPORTADOR}")
+        else:
+            return
+    if _procesador is not None:
+        _procesador.cerrar()
+    _procesador = ProcesadorLotes(exportador)
+    atexit.register(_procesador.cerrar)
+    logger.info("✅ Trazas activas (%s, muestreo %.0f%%).", type(exportador).__name__, Config.TRACING_MUESTREO * 100)
@@ -1,11 +1,13 @@
 # app/whatsapp_bot_chatgpt.py
 from app.config.config import Config
+from app.config.logging_config import configurar_logging
 from app.adapters.whatsapp_adapter_chatgpt import WhatsAppAdapterChatGPT
 from app.services.detectar_intencion_service import DetectarIntencionService
 from app.services.redis_client import RedisClient
 import logging
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+configurar_logging()
+logger = logging.getLogger(__name__)
 
 def init_whatsapp_bot_chatgpt(
     app,
@@ -15,7 +17,7 @@ def init_whatsapp_bot_chatgpt(
     """
     Inicializa el bot de WhatsApp con ChatGPT y lo integra con la aplicación FastAPI.
     """
-    logging.info("🚀 Iniciando bot de WhatsApp con ChatGPT...")
+    logger.info("🚀 Iniciando bot de WhatsApp con ChatGPT...")
 
     # Los servicios de reclamos y consultas se instanciarán dentro del adapter si son None
     registrar_reclamo_service = None
@@ -36,5 +38,5 @@ def init_whatsapp_bot_chatgpt(
         app
     )
 
-    logging.info("✅ Bot de WhatsApp con ChatGPT inicializado.")
+    logger.info("✅ Bot de WhatsApp con ChatGPT inicializado.")
     return bot
\ No newline at end of file
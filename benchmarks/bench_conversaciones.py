@@ -0,0 +1,375 @@
+# benchmarks/bench_conversaciones.py
+"""
+Prueba de carga de punta a punta del flujo conversacional.
+
+Reproduce conversaciones guionadas de las cinco intenciones del bot (Reclamo,
+Actualizar, Consultar, ConsultarFacturas, Conversar) con los backends fake
+(USAR_BACKENDS_FAKE) y las envía por cada canal:
+
+  adaptador-telegram / adaptador-whatsapp / adaptador-chattigo
+      llaman directo al handle_message de cada adaptador;
+  webhook-whatsapp / webhook-chattigo
+      POST a las rutas de webhook (respuesta inmediata + cola), esperando a que
+      el turno termine de procesarse;
+  api-chatbot / api-frontend-chatbot
+      POST a /api/chatbot y /api/frontend-chatbot/chat (un turno por mensaje).
+
+Reporta turnos por segundo, p50/p95/p99 por turno y por fase del motor, y el
+promedio de comandos Redis, sentencias SQL y llamadas al LLM por turno. El
+resultado se guarda en JSON para comparar entre versiones.
+
+Con --verificar-sql recorre además los guiones de consulta de a un turno y
+compara las sentencias SQL de cada paso con PRESUPUESTO_SQL; si algún paso se
+pasa, el proceso termina con código 1 (sirve como chequeo en CI).
+
+Uso:
+    python -m benchmarks.bench_conversaciones [--canales adaptador-whatsapp,webhook-chattigo]
+        [--conversaciones 50] [--concurrencia 10] [--llm-ms 800] [--salida ruta.json]
+        [--verificar-sql]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+GUIONES = {
+    "Reclamo": ["hola, quiero hacer un reclamo", "{dni}", "si", "se cortó la luz en toda la cuadra"],
+    "Actualizar": ["quiero actualizar mis datos", "celular", "{dni}", "si", "2644123456"],
+    "Consultar": ["quiero consultar el estado de mi reclamo", "{dni}", "si", "1"],
+    "ConsultarFacturas": ["necesito ver mi factura", "{dni}", "si"],
+    "Conversar": ["hola, buen día", "gracias"],
+}
+# Máximo de sentencias SQL por paso del guion (None = sin control). El "si" de Consultar
+# busca el cliente y sus reclamos una sola vez por turno (memo_turno): 2 sentencias.
+PRESUPUESTO_SQL = {
+    "Consultar": [0, 1, 2, 1],
+    "ConsultarFacturas": [0, 1, 1],
+}
+CANALES_ADAPTADOR = ("adaptador-telegram", "adaptador-whatsapp", "adaptador-chattigo")
+CANALES_WEBHOOK = ("webhook-whatsapp", "webhook-chattigo")
+CANALES_API = ("api-chatbot", "api-frontend-chatbot")
+CANALES = CANALES_ADAPTADOR + CANALES_WEBHOOK + CANALES_API
+
+
+def _configurar_entorno(args):
+    # Debe ejecutarse antes de importar app.*: Config lee el entorno al importarse.
+    os.environ["USAR_BACKENDS_FAKE"] = "true"
+    os.environ["TELEGRAM_BOT_TOKEN"] = ""
+    os.environ["FAKE_CLIENTES"] = str(args.clientes)
+    os.environ["FAKE_SEMILLA"] = str(args.semilla)
+    os.environ["FAKE_LLM_MEDIANA_MS"] = str(args.llm_ms)
+    os.environ["FAKE_LLM_DISTRIBUCION"] = args.llm_distribucion
+
+
+def percentil(valores, p):
+    """Percentil por rango más cercano (valores en segundos, resultado en ms)."""
+    if not valores:
+        return None
+    ordenados = sorted(valores)
+    indice = max(0, math.ceil(p / 100 * len(ordenados)) - 1)
+    return round(ordenados[indice] * 1000, 2)
+
+
+def resumen_latencias(valores):
+    return {
+        "n": len(valores),
+        "p50_ms": percentil(valores, 50),
+        "p95_ms": percentil(valores, 95),
+        "p99_ms": percentil(valores, 99),
+        "max_ms": round(max(valores) * 1000, 2) if valores else None,
+    }
+
+
+class Contadores:
+    """Cuenta comandos Redis, sentencias SQL y llamadas al LLM durante una corrida."""
+
+    def __init__(self, redis_client, llm_services, engines):
+        self.redis_client = redis_client
+        self.llm_services = llm_services
+        self.sql = 0
+        from sqlalchemy import event
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._contar_sql)
+
+    def _contar_sql(self, *args, **kwargs):
+        self.sql += 1
+
+    def foto(self):
+        return {
+            "redis": getattr(self.redis_client, "comandos", 0),
+            "sql": self.sql,
+            "llm": sum(s.llamadas for s in self.llm_services),
+        }
+
+
+class Banco:
+    """Arma la app con backends fake y los adaptadores con envío capturado."""
+
+    def __init__(self):
+        from main import create_app
+        from app.database.database import engine_db1, engine_db2
+        from app.adapters.telegram_adapter_chatgpt import TelegramAdapterChatGPT
+        from app.adapters.whatsapp_adapter_chatgpt import WhatsAppAdapterChatGPT
+        from app.adapters.chattigo_adapter_chatgpt import ChattigoAdapterChatGPT
+        from app.routes import chatbot_routes, frontend_chatbot_routes
+        from app.routes.whatsapp_routes import router as whatsapp_router, set_whatsapp_adapter
+        from app.routes.chattigo_routes import router as chattigo_router, set_chattigo_adapter
+        from app.services.redis_client import RedisClient
+        from app.services.detectar_intencion_service import DetectarIntencionService
+        from app.services.validar_reclamo_chatgpt_usecase import ValidarReclamoService
+        from app.fakes.llm import FakeChatGPTService, FakeChatGPTValidarReclamoService, FakeChatGPTFrontendService
+
+        self.app = create_app()
+        self.redis_client = RedisClient().get_client()
+        self.chatgpt = FakeChatGPTService()
+        self.validador = FakeChatGPTValidarReclamoService()
+        detectar = DetectarIntencionService(self.chatgpt)
+        validar = ValidarReclamoService(self.validador)
+
+        # Las rutas /api/* usan los servicios que instaló create_app; se reemplazan
+        # por los de este banco para poder contar sus llamadas.
+        frontend = FakeChatGPTFrontendService()
+        chatbot_routes.set_detectar_intencion_usecase(detectar)
+        frontend_chatbot_routes.initialize_frontend_chatbot(self.redis_client, frontend)
+
+        self.fases = defaultdict(list)
+        self.enviados = defaultdict(int)
+        self.turno_listo = {}
+
+        self.telegram = TelegramAdapterChatGPT(
+            token="000000:BENCH", detectar_intencion_service=detectar,
+            validar_reclamo_service=validar, redis_client=self.redis_client,
+        )
+        self.whatsapp = WhatsAppAdapterChatGPT(
+            "bench-phone", "bench-token", detectar, validar, "bench-verify", redis_client=self.redis_client,
+        )
+        self.chattigo = ChattigoAdapterChatGPT(
+            username="bench", password="bench", detectar_intencion_service=detectar,
+            validar_reclamo_service=validar, redis_client=self.redis_client,
+        )
+        for adaptador in (self.telegram, self.whatsapp, self.chattigo):
+            adaptador.conversacion.observador_fase = self._registrar_fase
+
+        async def enviar_whatsapp(to, text):
+            self.enviados[to] += 1
+
+        async def enviar_chattigo(msisdn, did, message):
+            self.enviados[msisdn] += 1
+
+        self.whatsapp.send_message = enviar_whatsapp
+        self.chattigo.send_message = enviar_chattigo
+        self.whatsapp.procesar_payload = self._avisar_fin(self.whatsapp.procesar_payload, self._usuario_whatsapp)
+        self.chattigo.procesar_payload = self._avisar_fin(self.chattigo.procesar_payload, lambda d: d["msisdn"])
+
+        set_whatsapp_adapter(self.whatsapp)
+        set_chattigo_adapter(self.chattigo)
+        self.app.include_router(whatsapp_router, prefix="/whatsapp")
+        self.app.include_router(chattigo_router, prefix="/chattigo")
+
+        self.contadores = Contadores(
+            self.redis_client, [self.chatgpt, self.validador, frontend], [engine_db1, engine_db2],
+        )
+
+    def _registrar_fase(self, fase, segundos):
+        self.fases[fase].append(segundos)
+
+    @staticmethod
+    def _usuario_whatsapp(data):
+        return data["entry"][0]["changes"][0]["value"]["messages"][0]["from"]
+
+    def _avisar_fin(self, procesar, usuario_de):
+        async def envuelto(data):
+            try:
+                return await procesar(data)
+            finally:
+                evento = self.turno_listo.get(usuario_de(data))
+                if evento:
+                    evento.set()
+        return envuelto
+
+    # === Un turno por canal ===
+
+    async def turno(self, canal, cliente_http, usuario, texto):
+        if canal == "adaptador-telegram":
+            async def reply_text(texto_respuesta, parse_mode=None):
+                self.enviados[usuario] += 1
+            update = SimpleNamespace(
+                effective_user=SimpleNamespace(id=usuario),
+                message=SimpleNamespace(text=texto, reply_text=reply_text),
+            )
+            await self.telegram.handle_message(update, None)
+        elif canal == "adaptador-whatsapp":
+            await self.whatsapp.procesar_payload(self._payload_whatsapp(usuario, texto))
+        elif canal == "adaptador-chattigo":
+            await self.chattigo.procesar_payload(self._payload_chattigo(usuario, texto))
+        elif canal in CANALES_WEBHOOK:
+            evento = self.turno_listo[usuario] = asyncio.Event()
+            if canal == "webhook-whatsapp":
+                respuesta = await cliente_http.post("/whatsapp/webhook", json=self._payload_whatsapp(usuario, texto))
+            else:
+                respuesta = await cliente_http.post("/chattigo/", json=self._payload_chattigo(usuario, texto))
+            respuesta.raise_for_status()
+            await evento.wait()
+        elif canal == "api-chatbot":
+            (await cliente_http.post("/api/chatbot", json={"message": texto})).raise_for_status()
+        elif canal == "api-frontend-chatbot":
+            (await cliente_http.post("/api/frontend-chatbot/chat", json={"mensaje": texto, "historial": ""})).raise_for_status()
+
+    def _payload_whatsapp(self, usuario, texto):
+        mensaje = {"from": usuario, "type": "text", "timestamp": str(int(time.time()) + 60), "text": {"body": texto}}
+        return {"object": "whatsapp_business_account", "entry": [{"changes": [{"value": {"messages": [mensaje]}}]}]}
+
+    @staticmethod
+    def _payload_chattigo(usuario, texto):
+        return {"msisdn": usuario, "did": "bench", "name": "Bench", "channel": "WHATSAPP", "content": texto}
+
+
+async def correr_canal(banco, canal, conversaciones, concurrencia, clientes):
+    import httpx
+    from app.fakes.base_datos import dni_sembrado
+
+    banco.fases.clear()
+    latencias_turno = []
+    errores = 0
+    semaforo = asyncio.Semaphore(concurrencia)
+    intenciones = list(GUIONES)
+    antes = banco.contadores.foto()
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=banco.app), base_url="http://bench") as cliente_http:
+        async def conversacion(numero):
+            nonlocal errores
+            intencion = intenciones[numero % len(intenciones)]
+            usuario = f"549264{canal[:3]}{numero:06d}"
+            dni = dni_sembrado(numero % clientes)
+            async with semaforo:
+                for paso in GUIONES[intencion]:
+                    inicio = time.perf_counter()
+                    try:
+                        await banco.turno(canal, cliente_http, usuario, paso.format(dni=dni))
+                    except Exception as e:
+                        errores += 1
+                        logging.error(f"[{canal}] turno fallido ({intencion}): {e}")
+                    latencias_turno.append(time.perf_counter() - inicio)
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(conversacion(n) for n in range(conversaciones)))
+        duracion = time.perf_counter() - inicio
+
+    despues = banco.contadores.foto()
+    turnos = len(latencias_turno)
+    por_turno = {k: round((despues[k] - antes[k]) / turnos, 2) if turnos else 0 for k in antes}
+    return {
+        "conversaciones": conversaciones,
+        "turnos": turnos,
+        "errores": errores,
+        "duracion_s": round(duracion, 3),
+        "turnos_por_s": round(turnos / duracion, 2) if duracion else None,
+        "turno": resumen_latencias(latencias_turno),
+        "fases": {fase: resumen_latencias(valores) for fase, valores in sorted(banco.fases.items())},
+        "por_turno": por_turno,
+    }
+
+
+async def verificar_presupuesto_sql(banco, clientes):
+    """Corre cada guion de PRESUPUESTO_SQL sin concurrencia y mide las sentencias SQL de cada paso."""
+    from app.fakes.base_datos import dni_sembrado
+
+    excedidos = []
+    detalle = {}
+    for intencion, presupuesto in PRESUPUESTO_SQL.items():
+        # Un cliente ya copiado a DECSA_EXC (par) y uno que solo está en PR_CAU (impar)
+        for numero in (0, 1):
+            usuario = f"549264sql{numero:06d}{intencion[:4]}"
+            dni = dni_sembrado(numero % clientes)
+            medidos = []
+            for paso, maximo in zip(GUIONES[intencion], presupuesto):
+                antes = banco.contadores.sql
+                await banco.turno("adaptador-telegram", None, usuario, paso.format(dni=dni))
+                medidos.append(banco.contadores.sql - antes)
+                if maximo is not None and medidos[-1] > maximo:
+                    excedidos.append(f"{intencion} paso {len(medidos)} ({paso!r}, DNI {dni}): "
+                                     f"{medidos[-1]} sentencias, máximo {maximo}")
+            detalle[f"{intencion}/{dni}"] = medidos
+    return detalle, excedidos
+
+
+def _commit_actual():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--canales", default=",".join(CANALES), help="Lista separada por comas")
+    parser.add_argument("--conversaciones", type=int, default=50, help="Conversaciones por canal")
+    parser.add_argument("--concurrencia", type=int, default=10)
+    parser.add_argument("--clientes", type=int, default=200, help="Clientes sembrados en las bases fake")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--llm-ms", type=float, default=50, help="Mediana de latencia simulada del LLM")
+    parser.add_argument("--llm-distribucion", default="lognormal")
+    parser.add_argument("--salida", default=None, help="Archivo JSON (por defecto benchmarks/resultados/)")
+    parser.add_argument("--verificar-sql", action="store_true", help="Controla las sentencias SQL por turno (PRESUPUESTO_SQL)")
+    args = parser.parse_args()
+
+    canales = [c.strip() for c in args.canales.split(",") if c.strip()]
+    desconocidos = set(canales) - set(CANALES)
+    if desconocidos:
+        parser.error(f"Canales desconocidos: {', '.join(sorted(desconocidos))}")
+
+    _configurar_entorno(args)
+    logging.basicConfig(level=logging.WARNING)
+    banco = Banco()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    async def correr():
+        verificacion = await verificar_presupuesto_sql(banco, args.clientes) if args.verificar_sql else None
+        resultados = {canal: await correr_canal(banco, canal, args.conversaciones, args.concurrencia, args.clientes)
+                      for canal in canales}
+        return resultados, verificacion
+
+    resultados, verificacion = asyncio.run(correr())
+
+    informe = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_actual(),
+        "parametros": {k: v for k, v in vars(args).items() if k != "salida"},
+        "resultados": resultados,
+    }
+    if verificacion is not None:
+        informe["sql_por_paso"] = verificacion[0]
+    salida = args.salida or os.path.join(
+        os.path.dirname(__file__), "resultados", f"conversaciones-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump(informe, f, indent=2, ensure_ascii=False)
+
+    print(f"{'canal':22} {'turnos/s':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'redis':>6} {'sql':>6} {'llm':>5} {'err':>4}")
+    for canal, r in resultados.items():
+        t, pt = r["turno"], r["por_turno"]
+        print(f"{canal:22} {r['turnos_por_s']:>9} {t['p50_ms']:>8} {t['p95_ms']:>8} {t['p99_ms']:>8} "
+              f"{pt['redis']:>6} {pt['sql']:>6} {pt['llm']:>5} {r['errores']:>4}")
+    print(f"Resultados guardados en {salida}")
+
+    if verificacion is not None:
+        detalle, excedidos = verificacion
+        for guion, medidos in detalle.items():
+            print(f"SQL por paso {guion:32} {medidos}")
+        if excedidos:
+            print("Presupuesto de SQL excedido:\n  " + "\n  ".join(excedidos))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
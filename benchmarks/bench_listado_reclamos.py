@@ -0,0 +1,140 @@
+# benchmarks/bench_listado_reclamos.py
+"""
+Compara los dos caminos de lectura de los listados de reclamos sobre la base fake
+de DECSA_EXC (SQLite):
+
+  orm        listar_todos() / obtener_por_dni() + obtener_por_usuario() y to_dict()
+             por reclamo, como hacían GET /api/reclamos/ y /api/reclamos/todos/{dni};
+  proyeccion listar_dicts(): una consulta Reclamos⋈Clientes con solo las columnas
+             de la respuesta, armando los diccionarios desde las tuplas.
+
+Verifica que ambos devuelvan lo mismo y reporta filas por segundo y sentencias SQL
+por llamada. Cada repetición usa una sesión nueva, como un request.
+
+Uso:
+    python -m benchmarks.bench_listado_reclamos [--clientes 2000] [--reclamos-por-cliente 5]
+        [--repeticiones 20] [--salida ruta.json]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def _configurar_entorno(args):
+    # Debe ejecutarse antes de importar app.*: Config lee el entorno al importarse.
+    os.environ["USAR_BACKENDS_FAKE"] = "true"
+    os.environ["FAKE_FACTURAS_POR_CLIENTE"] = "0"
+
+
+def _sembrar_reclamos(engine, reclamos_por_cliente: int, semilla: int):
+    from sqlalchemy import func, select
+    from sqlalchemy.orm import Session
+    from app.models.entities import Cliente, Reclamo
+
+    rnd = random.Random(semilla)
+    with Session(engine) as session:
+        ids = session.execute(select(Cliente.ID_USUARIO)).scalars().all()
+        session.add_all(
+            Reclamo(
+                ID_USUARIO=id_usuario,
+                DESCRIPCION=f"Reclamo de prueba {n} del cliente {id_usuario}",
+                ESTADO=rnd.choice(("Pendiente", "En proceso", "Resuelto")),
+                FECHA_RECLAMO=datetime(2025, 1, 1) + timedelta(hours=rnd.randint(0, 2000)),
+            )
+            for id_usuario in ids for n in range(reclamos_por_cliente)
+        )
+        session.commit()
+        return session.execute(select(func.count()).select_from(Reclamo)).scalar_one()
+
+
+def _contar_sql(engine):
+    from sqlalchemy import event
+    contador = {"sentencias": 0}
+
+    def antes(*_):
+        contador["sentencias"] += 1
+    event.listen(engine, "before_cursor_execute", antes)
+    return contador, lambda: event.remove(engine, "before_cursor_execute", antes)
+
+
+def _medir(engine, funcion, repeticiones: int):
+    from sqlalchemy.orm import Session
+    contador, quitar = _contar_sql(engine)
+    tiempos, filas = [], None
+    try:
+        for _ in range(repeticiones):
+            with Session(engine) as session:
+                inicio = time.perf_counter()
+                filas = funcion(session)
+                tiempos.append(time.perf_counter() - inicio)
+    finally:
+        quitar()
+    tiempos.sort()
+    mediana = tiempos[len(tiempos) // 2]
+    return filas, {
+        "filas": len(filas),
+        "mediana_ms": round(mediana * 1000, 2),
+        "filas_por_segundo": round(len(filas) / mediana) if mediana else None,
+        "sql_por_llamada": round(contador["sentencias"] / repeticiones, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clientes", type=int, default=2000)
+    parser.add_argument("--reclamos-por-cliente", type=int, default=5)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--semilla", type=int, default=7)
+    parser.add_argument("--salida", default=None, help="Archivo JSON donde guardar el resultado")
+    args = parser.parse_args()
+    _configurar_entorno(args)
+
+    from app.fakes.base_datos import crear_engines_fake, dni_sembrado
+    from app.repositories.sqlalchemy_reclamo_repository import SQLAlchemyReclamoRepository
+    from app.repositories.sqlalchemy_usuario_repository import SQLAlchemyUsuarioRepository
+
+    _, engine_db2 = crear_engines_fake(args.clientes, args.semilla)
+    total = _sembrar_reclamos(engine_db2, args.reclamos_por_cliente, args.semilla)
+    dni = dni_sembrado(0)  # los clientes pares están en DECSA_EXC
+
+    def orm_todos(session):
+        return [r.to_dict() for r in SQLAlchemyReclamoRepository(session).listar_todos()]
+
+    def orm_dni(session):
+        cliente = SQLAlchemyUsuarioRepository(None, session).obtener_por_dni(dni)
+        return [r.to_dict() for r in SQLAlchemyReclamoRepository(session).obtener_por_usuario(cliente.ID_USUARIO)]
+
+    casos = {
+        "todos": (orm_todos, lambda session: SQLAlchemyReclamoRepository(session).listar_dicts()),
+        "por_dni": (orm_dni, lambda session: SQLAlchemyReclamoRepository(session).listar_dicts(dni=dni)),
+    }
+    resultado = {"fecha": datetime.now().isoformat(timespec="seconds"), "reclamos": total, "casos": {}}
+    for nombre, (orm, proyeccion) in casos.items():
+        filas_orm, medida_orm = _medir(engine_db2, orm, args.repeticiones)
+        filas_proyeccion, medida_proyeccion = _medir(engine_db2, proyeccion, args.repeticiones)
+        iguales = sorted(filas_orm, key=lambda r: r["ID_RECLAMO"]) == filas_proyeccion
+        resultado["casos"][nombre] = {
+            "orm": medida_orm,
+            "proyeccion": medida_proyeccion,
+            "mejora": round(medida_orm["mediana_ms"] / medida_proyeccion["mediana_ms"], 2) if medida_proyeccion["mediana_ms"] else None,
+            "mismo_resultado": iguales,
+        }
+        print(f"{nombre:8} orm {medida_orm['filas_por_segundo']:>9} filas/s ({medida_orm['sql_por_llamada']} SQL)  "
+              f"proyeccion {medida_proyeccion['filas_por_segundo']:>9} filas/s ({medida_proyeccion['sql_por_llamada']} SQL)  "
+              f"x{resultado['casos'][nombre]['mejora']}  {'OK' if iguales else 'DIFIEREN'}")
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultado, archivo, indent=2, ensure_ascii=False)
+    if not all(caso["mismo_resultado"] for caso in resultado["casos"].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
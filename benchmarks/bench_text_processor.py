@@ -0,0 +1,85 @@
+# benchmarks/bench_text_processor.py
+"""
+Micro-benchmark de app.utils.text_processor.
+
+Compara la implementación anterior (13 re.sub sin precompilar, con lambdas y
+logging INFO del texto completo) contra el motor actual de una sola pasada por
+regla, y verifica que ambas produzcan el mismo resultado sobre el corpus.
+
+Uso:
+    python -m benchmarks.bench_text_processor [--repeticiones 2000]
+"""
+import argparse
+import logging
+import re
+import sys
+import os
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.utils.text_processor import preprocess_text, preprocess_batch  # noqa: E402
+
+CORPUS = [
+    "hola kiero hacer un reklamo",
+    "kere aktualizar mi direcsion",
+    "quiero konsultar el estadoo de mi reclamoo",
+    "se me korto la luz hace 3 horas en el barrio zona norte",
+    "xq no tengo luz? aser algo ya",
+    "necesito ver mi factura del mes pasado",
+    "actualliziar celular",
+    "mi heladera se kemo por un pico de tension, quiero reklamar",
+    "consuldar estado reclamo 1234",
+    "buenas tardes, kisiera saber la direkcion de la oficina",
+    "zapallo xilofon kilo",
+    "estoy sin luz desde ayer a la noche, por favor manden a alguien",
+]
+
+
+def _preprocess_legacy(text):
+    logging.info(f"Preprocesando texto original: {text}")
+    text = text.lower()
+    text = re.sub(r'\bk\w*', lambda m: m.group(0).replace('k', 'qu') if 'k' in m.group(0) else m.group(0).replace('k', 'c'), text)
+    text = re.sub(r'\bz\w*', lambda m: m.group(0).replace('z', 's') if 'z' in m.group(0) else m.group(0), text)
+    text = re.sub(r'\bx\w*', lambda m: m.group(0).replace('x', 's') if 'x' in m.group(0) else m.group(0).replace('x', 'j'), text)
+    text = re.sub(r'\b(k|q)uier[oa]|kere\b', 'quiero', text)
+    text = re.sub(r'\b(ak|ac)tua(l|ll)?(l|ll)?iz(ar|er)|aktuali[zs]ar\b', 'actualizar', text)
+    text = re.sub(r'\b(rek|rec|rel)al[mo]|reclamoo?\b', 'reclamo', text)
+    text = re.sub(r'\b(kom|con|kol)sul(tar|tar)|consul[dt]ar\b', 'consultar', text)
+    text = re.sub(r'\b(ha|as)cer|aser\b', 'hacer', text)
+    text = re.sub(r'\b(direk|dier|dir)ec(c|k)ion|direcsion\b', 'direccion', text)
+    text = re.sub(r'\b(est|es)tadoo?\b', 'estado', text)
+    text = re.sub(r'(\w*?)([aeiou])\2(\w*)', r'\1\2\3', text)
+    text = re.sub(r'(\w)r(\w)e', r'\1er\2', text)
+    logging.info(f"Texto preprocesado: {text}")
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticiones", type=int, default=2000)
+    args = parser.parse_args()
+
+    # Configuración típica de producción: INFO hacia un handler que descarta la salida.
+    logging.basicConfig(level=logging.INFO, handlers=[logging.NullHandler()])
+
+    for texto in CORPUS:
+        esperado, obtenido = _preprocess_legacy(texto), preprocess_text(texto)
+        if esperado != obtenido:
+            print(f"DIFERENCIA: {texto!r}\n  anterior: {esperado!r}\n  actual:   {obtenido!r}")
+            sys.exit(1)
+
+    n = args.repeticiones
+    t_legacy = timeit.timeit(lambda: [_preprocess_legacy(t) for t in CORPUS], number=n)
+    t_actual = timeit.timeit(lambda: [preprocess_text(t) for t in CORPUS], number=n)
+    t_lote = timeit.timeit(lambda: preprocess_batch(CORPUS), number=n)
+
+    total = n * len(CORPUS)
+    print(f"Textos procesados por variante: {total}")
+    print(f"anterior:          {t_legacy * 1e6 / total:8.2f} µs/texto")
+    print(f"preprocess_text:   {t_actual * 1e6 / total:8.2f} µs/texto  (x{t_legacy / t_actual:.2f})")
+    print(f"preprocess_batch:  {t_lote * 1e6 / total:8.2f} µs/texto  (x{t_legacy / t_lote:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,25 @@
 from fastapi import FastAPI
 from app.config.config import Config
+from app.config.logging_config import configurar_logging
 from app.database.database import init_db
 from app.routes import initialize_routes
 from app.routes.frontend_chatbot_routes import router as frontend_chatbot_router, initialize_frontend_chatbot
 from app.services.chatgpt_service import ChatGPTService
 from app.services.chatgpt_validar_reclamo_service import ChatGPTValidarReclamoService
 from app.services.detectar_intencion_service import DetectarIntencionService
+from app.services.detector_cortes import DetectorCortes
 from app.services.validar_reclamo_chatgpt_usecase import ValidarReclamoService
 from app.services.redis_client import RedisClient
 from app.adapters.telegram_adapter_chatgpt import TelegramAdapterChatGPT
+from app.routes.telegram_routes import router as telegram_router, set_telegram_adapter
+from app.utils.cola_mensajes import detener_colas
+from app.utils.metrics import MiddlewareMetricasHTTP
+from app.utils.tracing import MiddlewareTrazas, configurar_trazas
+from app.routes.metrics_routes import router as metrics_router
 import logging
-import asyncio
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+configurar_logging()
+logger = logging.getLogger(__name__)
 
 
 def create_app() -> FastAPI:
@@ -22,20 +29,49 @@ def create_app() -> FastAPI:
         version="1.0.0"
     )
     app.config = Config
+    app.add_middleware(MiddlewareMetricasHTTP)
+    # Va por fuera de las métricas: el span raíz cubre toda la petición
+    configurar_trazas()
+    app.add_middleware(MiddlewareTrazas)
 
     # === Inicializar servicios base ===
     init_db()
     redis_client = RedisClient().get_client()
-    chatgpt_service = ChatGPTService(redis_client=redis_client)
+    if Config.USAR_BACKENDS_FAKE:
+        # Sin OpenAI: respuestas deterministas con latencia simulada
+        from app.fakes.llm import FakeChatGPTService, FakeChatGPTValidarReclamoService, FakeChatGPTFrontendService
+        logger.warning("⚠️ USAR_BACKENDS_FAKE activo: OpenAI, SQL Server y Redis están simulados.")
+        chatgpt_service = FakeChatGPTService(redis_client=redis_client)
+        chatgpt_validar_service = FakeChatGPTValidarReclamoService(redis_client=redis_client)
+        frontend_service = FakeChatGPTFrontendService(redis_client=redis_client)
+    else:
+        chatgpt_service = ChatGPTService(redis_client=redis_client)
+        chatgpt_validar_service = ChatGPTValidarReclamoService(redis_client=redis_client)
+        frontend_service = None
     detectar_intencion_service = DetectarIntencionService(chatgpt_service)
-    chatgpt_validar_service = ChatGPTValidarReclamoService(redis_client=redis_client)
     validar_reclamo_service = ValidarReclamoService(chatgpt_validar_service)
 
     # === Inicializar rutas principales y frontend chatbot ===
     initialize_routes(app, redis_client, detectar_intencion_service, validar_reclamo_service)
-    initialize_frontend_chatbot(redis_client)
+    initialize_frontend_chatbot(redis_client, frontend_service)
     app.include_router(frontend_chatbot_router, prefix="/api/frontend-chatbot", tags=["Frontend Chatbot"])
 
+    # Las colas de webhooks se vacían antes de apagar los bots (los shutdown corren en orden de registro)
+    @app.on_event("shutdown")
+    async def stop_colas():
+        await detener_colas()
+
+    # Reclamos absorbidos por un corte: se insertan por lotes y se vacían al apagar, después de las colas
+    detector_cortes = DetectorCortes(redis_client)
+
+    @app.on_event("startup")
+    async def iniciar_volcado_cortes():
+        detector_cortes.iniciar_volcado()
+
+    @app.on_event("shutdown")
+    async def detener_volcado_cortes():
+        await detector_cortes.detener_volcado()
+
     # === Inicializar bot de Telegram (correctamente con async) ===
     if Config.TELEGRAM_TOKEN:
         telegram_adapter = TelegramAdapterChatGPT(
@@ -45,13 +81,29 @@ def create_app() -> FastAPI:
             redis_client=redis_client
         )
 
+        if Config.TELEGRAM_MODE == "webhook":
+            set_telegram_adapter(telegram_adapter)
+            app.include_router(telegram_router, prefix="/telegram", tags=["Telegram"])
+
         @app.on_event("startup")
         async def start_telegram_bot():
-            logging.info("🔁 Iniciando bot de Telegram desde evento startup de FastAPI...")
-            asyncio.create_task(telegram_adapter.app.run_polling())
+            if Config.TELEGRAM_MODE == "webhook":
+                if not Config.TELEGRAM_WEBHOOK_URL or not Config.TELEGRAM_WEBHOOK_SECRET:
+                    raise ValueError("❌ TELEGRAM_MODE=webhook requiere TELEGRAM_WEBHOOK_URL y TELEGRAM_WEBHOOK_SECRET")
+                await telegram_adapter.iniciar_webhook(Config.TELEGRAM_WEBHOOK_URL, Config.TELEGRAM_WEBHOOK_SECRET)
+            else:
+                logger.info("🔁 Iniciando bot de Telegram en modo polling (usar con una sola instancia)...")
+                await telegram_adapter.iniciar_polling()
+
+        @app.on_event("shutdown")
+        async def stop_telegram_bot():
+            await telegram_adapter.detener()
 
     else:
-        logging.warning("🚫 TELEGRAM_TOKEN no definido. Bot de Telegram no será iniciado.")
+        logger.warning("🚫 TELEGRAM_TOKEN no definido. Bot de Telegram no será iniciado.")
+
+    # === Métricas para Prometheus ===
+    app.include_router(metrics_router)
 
     # === Endpoint de prueba ===
     @app.get("/test")
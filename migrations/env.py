@@ -0,0 +1,47 @@
+# migrations/env.py
+"""
+Entorno de Alembic para DECSA_EXC (DB2): Clientes, Reclamos, Usuarios, Rol y UsuarioRol.
+PR_CAU (DB1) es de solo lectura y no se migra desde acá.
+
+Bases que ya existían antes de las migraciones: `alembic stamp 0001` una vez y
+después `alembic upgrade head`.
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.config.config import Config
+from app.models.entities import Base
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def _url() -> str:
+    return context.get_x_argument(as_dictionary=True).get("url") or Config.SQLALCHEMY_BINDS["db2"]
+
+
+def run_migrations_offline():
+    """Genera el SQL sin conectarse (alembic upgrade head --sql), para que lo aplique un DBA."""
+    context.configure(url=_url(), target_metadata=target_metadata, literal_binds=True,
+                      dialect_opts={"paramstyle": "named"})
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    engine = create_engine(_url(), poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,90 @@
+"""Esquema inicial de DECSA_EXC, tal como estaba antes de las migraciones
+
+En bases existentes no se ejecuta: se marca con `alembic stamp 0001`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "Clientes",
+        sa.Column("ID_USUARIO", sa.Integer, primary_key=True),
+        sa.Column("DNI", sa.String(20), nullable=False, unique=True),
+        sa.Column("NOMBRE_COMPLETO", sa.String(150), nullable=False),
+        sa.Column("SEXO", sa.String(1)),
+        sa.Column("CELULAR", sa.String(20)),
+        sa.Column("EMAIL", sa.String(100)),
+        sa.Column("CODIGO_POSTAL", sa.String(10)),
+        sa.Column("FECHA_ALTA", sa.DateTime),
+        sa.Column("OBSERVACIONES", sa.String(500)),
+        sa.Column("CODIGO_SUMINISTRO", sa.String(50), nullable=False),
+        sa.Column("NUMERO_MEDIDOR", sa.String(50), nullable=False),
+        sa.Column("CALLE", sa.String(200)),
+        sa.Column("BARRIO", sa.String(200)),
+    )
+    op.create_table(
+        "Reclamos",
+        sa.Column("ID_RECLAMO", sa.Integer, primary_key=True),
+        sa.Column("ID_USUARIO", sa.Integer, sa.ForeignKey("Clientes.ID_USUARIO"), nullable=False),
+        sa.Column("DESCRIPCION", sa.String(500), nullable=False),
+        sa.Column("ESTADO", sa.String(20)),
+        sa.Column("FECHA_RECLAMO", sa.DateTime),
+        sa.Column("FECHA_CIERRE", sa.DateTime),
+    )
+    op.create_table(
+        "Rol",
+        sa.Column("IdRol", sa.Integer, primary_key=True),
+        sa.Column("Nombre", sa.String(50), nullable=False, unique=True),
+        sa.Column("Descripcion", sa.String(255)),
+        sa.Column("FechaCrea", sa.DateTime),
+        sa.Column("UsuarioCrea", sa.String(255), nullable=False),
+        sa.Column("Anulado", sa.Boolean, nullable=False),
+        sa.Column("FechaAnula", sa.DateTime),
+        sa.Column("UsuarioAnula", sa.String(255)),
+        sa.Column("FechaModifica", sa.DateTime),
+        sa.Column("UsuarioModifica", sa.String(255)),
+    )
+    op.create_table(
+        "Usuarios",
+        sa.Column("IdUsuario", sa.Integer, primary_key=True),
+        sa.Column("Usuario", sa.String(100), nullable=False, unique=True),
+        sa.Column("email", sa.String(100), nullable=False, unique=True),
+        sa.Column("Pass", sa.String(255), nullable=False),
+        sa.Column("FechaCrea", sa.DateTime),
+        sa.Column("OperadorCrea", sa.String(255), nullable=False),
+        sa.Column("Anulado", sa.Boolean, nullable=False),
+        sa.Column("FechaAnula", sa.DateTime),
+        sa.Column("UsuarioAnula", sa.String(255)),
+        sa.Column("FechaModifica", sa.DateTime),
+        sa.Column("UsuarioModifica", sa.String(255)),
+    )
+    op.create_table(
+        "UsuarioRol",
+        sa.Column("IdUsuario", sa.Integer, sa.ForeignKey("Usuarios.IdUsuario", ondelete="CASCADE"), primary_key=True),
+        sa.Column("IdRol", sa.Integer, sa.ForeignKey("Rol.IdRol", ondelete="CASCADE"), primary_key=True),
+        sa.Column("FechaCrea", sa.DateTime),
+        sa.Column("UsuarioCrea", sa.String(255), nullable=False),
+        sa.Column("Anulado", sa.Boolean, nullable=False),
+        sa.Column("UsuarioAnula", sa.String(255)),
+        sa.Column("FechaAnula", sa.DateTime),
+        sa.Column("UsuarioModifica", sa.String(255)),
+        sa.Column("FechaModifica", sa.DateTime),
+    )
+
+
+def downgrade():
+    op.drop_table("UsuarioRol")
+    op.drop_table("Usuarios")
+    op.drop_table("Rol")
+    op.drop_table("Reclamos")
+    op.drop_table("Clientes")
@@ -0,0 +1,60 @@
+"""Índices de Reclamos para las lecturas frecuentes
+
+- IX_Reclamos_ID_USUARIO: reclamos de un cliente (bots, /api/reclamos/todos/{dni}).
+- IX_Reclamos_ESTADO_FECHA: pendientes, cambios de estado por filtro y conteos por estado.
+- IX_Reclamos_FECHA_RECLAMO: histograma diario de /api/reclamos/stats.
+
+Clientes.DNI ya tiene su índice único. En SQL Server los índices se crean con
+ONLINE = ON cuando la edición lo permite (SERVERPROPERTY('EngineEdition'):
+Enterprise/Developer, Azure SQL o Managed Instance); `-x online=true|false` fuerza
+la opción (en modo --sql, sin conexión, por defecto no se usa). Para medir la diferencia:
+`python -m app.jobs.diagnostico_consultas` antes y después (ver su --comparar).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import context, op
+from sqlalchemy import text
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# EngineEdition con operaciones de índice ONLINE: 3 Enterprise/Developer, 5 Azure SQL, 8 Managed Instance
+EDICIONES_ONLINE = {3, 5, 8}
+
+INDICES = (
+    ("IX_Reclamos_ID_USUARIO", ["ID_USUARIO"], ["ESTADO", "FECHA_RECLAMO"]),
+    ("IX_Reclamos_ESTADO_FECHA", ["ESTADO", "FECHA_RECLAMO"], ["ID_USUARIO"]),
+    ("IX_Reclamos_FECHA_RECLAMO", ["FECHA_RECLAMO"], ["ESTADO"]),
+)
+
+
+def upgrade():
+    mssql = op.get_context().dialect.name == "mssql"
+    online = mssql and _online_disponible()
+    for nombre, columnas, incluidas in INDICES:
+        if online:
+            op.execute(
+                f"CREATE NONCLUSTERED INDEX [{nombre}] ON [Reclamos] ({', '.join(f'[{c}]' for c in columnas)}) "
+                f"INCLUDE ({', '.join(f'[{c}]' for c in incluidas)}) WITH (ONLINE = ON)"
+            )
+        else:
+            op.create_index(nombre, "Reclamos", columnas, mssql_include=incluidas)
+
+
+def _online_disponible() -> bool:
+    forzado = context.get_x_argument(as_dictionary=True).get("online")
+    if forzado is not None:
+        return forzado.lower() == "true"
+    if context.is_offline_mode():
+        return False
+    edicion = op.get_bind().execute(text("SELECT CAST(SERVERPROPERTY('EngineEdition') AS INT)")).scalar()
+    return edicion in EDICIONES_ONLINE
+
+
+def downgrade():
+    for nombre, _, _ in reversed(INDICES):
+        op.drop_index(nombre, table_name="Reclamos")
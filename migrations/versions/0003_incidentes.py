@@ -0,0 +1,39 @@
+"""Incidentes: cortes que agrupan los reclamos de un barrio
+
+- Tabla Incidentes (barrio, estado, inicio/cierre y cantidad de reclamos).
+- Reclamos.ID_INCIDENTE (nullable) con su índice, para cerrar todos los reclamos
+  de un corte de una vez.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "Incidentes",
+        sa.Column("ID_INCIDENTE", sa.Integer, primary_key=True),
+        sa.Column("BARRIO", sa.String(200), nullable=False),
+        sa.Column("ESTADO", sa.String(20)),
+        sa.Column("FECHA_INICIO", sa.DateTime),
+        sa.Column("FECHA_CIERRE", sa.DateTime),
+        sa.Column("CANTIDAD_RECLAMOS", sa.Integer, nullable=False, server_default="0"),
+    )
+    op.add_column("Reclamos", sa.Column("ID_INCIDENTE", sa.Integer, nullable=True))
+    op.create_foreign_key("FK_Reclamos_Incidentes", "Reclamos", "Incidentes", ["ID_INCIDENTE"], ["ID_INCIDENTE"])
+    op.create_index("IX_Reclamos_ID_INCIDENTE", "Reclamos", ["ID_INCIDENTE"])
+
+
+def downgrade():
+    op.drop_index("IX_Reclamos_ID_INCIDENTE", table_name="Reclamos")
+    op.drop_constraint("FK_Reclamos_Incidentes", "Reclamos", type_="foreignkey")
+    op.drop_column("Reclamos", "ID_INCIDENTE")
+    op.drop_table("Incidentes")
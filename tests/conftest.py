@@ -0,0 +1,9 @@
+# tests/conftest.py
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Config lee el entorno al importarse: los tests corren siempre con los backends fake
+os.environ.setdefault("USAR_BACKENDS_FAKE", "true")
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "")
@@ -0,0 +1,124 @@
+# tests/test_memo_turno.py
+"""
+Sentencias SQL por turno con el memo de repositorio (app/utils/memo_turno.py).
+
+El presupuesto es el mismo que controla `benchmarks/bench_conversaciones.py
+--verificar-sql` para el "sí" de Consultar: el cliente y sus reclamos se leen una
+sola vez en el turno, aunque los pidan varios servicios.
+"""
+import asyncio
+
+import pytest
+
+from app.utils.memo_turno import invalidar_memo, memo_turno, memorizar
+
+SQL_CONFIRMAR_DNI_CONSULTAR = 2
+
+
+class _Repositorio:
+    def __init__(self):
+        self.lecturas = 0
+
+    @memorizar
+    def leer(self, clave, opcion=None):
+        self.lecturas += 1
+        return object()
+
+
+def test_memoriza_dentro_del_turno():
+    repositorio = _Repositorio()
+    with memo_turno():
+        primero = repositorio.leer("a")
+        assert repositorio.leer("a") is primero
+        repositorio.leer("a", opcion=1)
+    assert repositorio.lecturas == 2
+
+
+def test_fuera_del_turno_no_memoriza():
+    repositorio = _Repositorio()
+    repositorio.leer("a")
+    repositorio.leer("a")
+    assert repositorio.lecturas == 2
+
+
+def test_cada_repositorio_tiene_sus_entradas():
+    # Repositorios con sesiones distintas no deben compartir objetos ORM
+    uno, otro = _Repositorio(), _Repositorio()
+    with memo_turno():
+        assert uno.leer("a") is not otro.leer("a")
+    assert (uno.lecturas, otro.lecturas) == (1, 1)
+
+
+def test_invalidar_vuelve_a_leer():
+    repositorio = _Repositorio()
+    with memo_turno():
+        repositorio.leer("a")
+        invalidar_memo()
+        repositorio.leer("a")
+    assert repositorio.lecturas == 2
+
+
+@pytest.fixture
+def motor_conversacion():
+    pytest.importorskip("sqlalchemy")
+    from sqlalchemy import event
+    from sqlalchemy.orm import sessionmaker
+
+    from app.fakes.base_datos import crear_engines_fake, dni_sembrado
+    from app.fakes.redis_fake import RedisEnMemoria
+    from app.repositories.sqlalchemy_reclamo_repository import SQLAlchemyReclamoRepository
+    from app.repositories.sqlalchemy_usuario_repository import SQLAlchemyUsuarioRepository
+    from app.services.actualizar_usuario_service import ActualizarUsuarioService
+    from app.services.consultar_estado_reclamo_service import ConsultarEstadoReclamoService
+    from app.services.consultar_facturas_service import ConsultarFacturasService
+    from app.services.consultar_reclamo_service import ConsultarReclamoService
+    from app.services.conversacion_service import ConversacionService
+    from app.services.registrar_reclamo_service import RegistrarReclamoService
+
+    engine_db1, engine_db2 = crear_engines_fake(clientes=4, semilla=7)
+    sentencias = []
+    for engine in (engine_db1, engine_db2):
+        event.listen(engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: sentencias.append(statement))
+    session_db1 = sessionmaker(bind=engine_db1)()
+    session_db2 = sessionmaker(bind=engine_db2)()
+    redis_client = RedisEnMemoria()
+    usuario_repository = SQLAlchemyUsuarioRepository(session_db1, session_db2)
+    reclamo_repository = SQLAlchemyReclamoRepository(session_db2)
+    # Sin prefetch ni búsqueda en paralelo: todo lo del "sí" se lee dentro del turno
+    conversacion = ConversacionService(
+        None, None,
+        RegistrarReclamoService(reclamo_repository, usuario_repository),
+        ActualizarUsuarioService(usuario_repository),
+        ConsultarEstadoReclamoService(reclamo_repository, usuario_repository),
+        ConsultarReclamoService(reclamo_repository),
+        ConsultarFacturasService(usuario_repository, redis_client),
+        redis_client,
+    )
+    yield conversacion, redis_client, sentencias, dni_sembrado
+    session_db1.close()
+    session_db2.close()
+    engine_db1.dispose()
+    engine_db2.dispose()
+
+
+# Cliente ya copiado a DECSA_EXC (par) y uno que solo está en PR_CAU (impar)
+@pytest.mark.parametrize("numero", [0, 1])
+def test_confirmar_dni_consultar_sentencias_sql(motor_conversacion, numero):
+    conversacion, redis_client, sentencias, dni_sembrado = motor_conversacion
+    usuario = f"test-memo-{numero}"
+    redis_client.hset(f"user:{usuario}:estado", mapping={
+        "fase": "confirmar_dni", "accion": "consultar", "dni": dni_sembrado(numero), "nombre": "Cliente Test",
+    })
+    respuestas = []
+
+    async def enviar(texto):
+        respuestas.append(texto)
+
+    sentencias.clear()
+    asyncio.run(conversacion.procesar(usuario, "si", enviar))
+
+    from app.services.conversacion_mensajes import MENSAJES_MARKDOWN
+    error = MENSAJES_MARKDOWN["error_general"].split("{")[0]
+    assert respuestas and not any(r.startswith(error) for r in respuestas), respuestas
+    assert len(sentencias) <= SQL_CONFIRMAR_DNI_CONSULTAR, "\n".join(sentencias)